@@ -3,7 +3,8 @@ from django.utils.html import format_html
 from django.utils import timezone
 from .models import (
     Brand, BrandOwner, BrandImage, BrandImageCategory, 
-    BrandTemplate, BrandEarnings, PartnerRequest, BrandBackground
+    BrandTemplate, BrandEarnings, PartnerRequest, BrandBackground,
+    BrandEarningsDaily, BrandEarningsMonthly
 )
 from products.models import BrandProduct
 
@@ -192,6 +193,21 @@ class BrandEarningsAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(BrandEarningsDaily, BrandEarningsMonthly)
+class EarningsRollupAdmin(admin.ModelAdmin):
+    list_display = ['brand', 'period', 'payment_status', 'count', 'amount', 'commission_amount']
+    list_filter = ['brand', 'payment_status']
+    date_hierarchy = 'period'
+    ordering = ['-period']
+
+    def has_add_permission(self, request):
+        # Rollups are maintained from BrandEarnings
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(PartnerRequest)
 class PartnerRequestAdmin(admin.ModelAdmin):
     list_display = ['business_name', 'contact_name', 'email', 'status', 'created_at']
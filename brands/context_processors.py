@@ -1,6 +1,6 @@
 from .models import Brand
 from products.models import ProductCategory, BrandProduct
-from products.data import products as PRODUCTS_DATA
+from products.data import get_products
 
 
 def brand_context(request):
@@ -24,9 +24,9 @@ def brand_context(request):
     # Get product categories from static data
     from django.utils.text import slugify
     categories = set()
-    for product in PRODUCTS_DATA:
-        if product.get('canOrder', True):
-            for category in product.get('categories', []):
+    for product in get_products():
+        if product.can_order:
+            for category in product.categories:
                 categories.add(category)
     
     # Convert to list of dictionaries with name and slug (for template compatibility)
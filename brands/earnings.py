@@ -0,0 +1,158 @@
+"""
+Earnings rollups
+
+BrandEarnings rows are folded into daily and monthly totals per brand and
+payment status as they are saved or deleted, so the earnings pages read a
+handful of rollup rows instead of aggregating every transaction.
+
+Bulk queryset.update()/delete() calls bypass the signals; run the
+rebuild_earnings_rollups command afterwards.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth
+from django.utils import timezone
+
+from .models import BrandEarnings, BrandEarningsDaily, BrandEarningsMonthly
+
+ROLLUP_FIELDS = ('brand_id', 'transaction_date', 'payment_status', 'amount', 'commission_amount')
+
+CENTS = Decimal('0.01')
+
+
+def _money(value):
+    """Round like the DecimalField does on save (the instance may hold more places)"""
+    return Decimal(str(value)).quantize(CENTS)
+
+
+def rollup_periods(transaction_date):
+    """Return the (day, month) rollup periods for a transaction date"""
+    if timezone.is_aware(transaction_date):
+        transaction_date = timezone.localtime(transaction_date)
+    day = transaction_date.date()
+    return day, day.replace(day=1)
+
+
+def _apply(brand_id, transaction_date, payment_status, count, amount, commission_amount):
+    """Add (or with negative values, remove) one contribution to both rollups"""
+    day, month = rollup_periods(transaction_date)
+
+    for model, period in ((BrandEarningsDaily, day), (BrandEarningsMonthly, month)):
+        lookup = {'brand_id': brand_id, 'period': period, 'payment_status': payment_status}
+        updated = model.objects.filter(**lookup).update(
+            count=F('count') + count,
+            amount=F('amount') + amount,
+            commission_amount=F('commission_amount') + commission_amount,
+        )
+        # Removals never create rows (the brand may be mid cascade-delete)
+        if updated or count < 0:
+            continue
+
+        try:
+            with transaction.atomic():
+                model.objects.create(
+                    count=count, amount=amount, commission_amount=commission_amount, **lookup
+                )
+        except IntegrityError:
+            # Another worker created the row first
+            model.objects.filter(**lookup).update(
+                count=F('count') + count,
+                amount=F('amount') + amount,
+                commission_amount=F('commission_amount') + commission_amount,
+            )
+
+
+def add_earning(values):
+    _apply(
+        values['brand_id'], values['transaction_date'], values['payment_status'],
+        1, _money(values['amount']), _money(values['commission_amount']),
+    )
+
+
+def remove_earning(values):
+    _apply(
+        values['brand_id'], values['transaction_date'], values['payment_status'],
+        -1, -_money(values['amount']), -_money(values['commission_amount']),
+    )
+
+
+def earning_values(earning):
+    """Snapshot of the fields that feed the rollups"""
+    return {field: getattr(earning, field) for field in ROLLUP_FIELDS}
+
+
+def rebuild_rollups(brand=None):
+    """Recompute both rollup tables from BrandEarnings, returning rows written"""
+    earnings = BrandEarnings.objects.all()
+    if brand is not None:
+        earnings = earnings.filter(brand=brand)
+
+    written = 0
+    with transaction.atomic():
+        for model, trunc in ((BrandEarningsDaily, TruncDay), (BrandEarningsMonthly, TruncMonth)):
+            existing = model.objects.all()
+            if brand is not None:
+                existing = existing.filter(brand=brand)
+            existing.delete()
+
+            rows = (
+                earnings.order_by()
+                .annotate(bucket=trunc('transaction_date'))
+                .values('brand_id', 'bucket', 'payment_status')
+                .annotate(
+                    total_count=Count('id'),
+                    total_amount=Sum('amount'),
+                    total_commission=Sum('commission_amount'),
+                )
+            )
+            rollups = [
+                model(
+                    brand_id=row['brand_id'],
+                    period=row['bucket'].date() if hasattr(row['bucket'], 'date') else row['bucket'],
+                    payment_status=row['payment_status'],
+                    count=row['total_count'],
+                    amount=row['total_amount'] or 0,
+                    commission_amount=row['total_commission'] or 0,
+                )
+                for row in rows
+            ]
+            model.objects.bulk_create(rollups, batch_size=1000)
+            written += len(rollups)
+
+    return written
+
+
+def earnings_summary(brands):
+    """All-time totals, equivalent to aggregating BrandEarnings directly"""
+    return BrandEarningsMonthly.objects.filter(brand__in=brands).aggregate(
+        total_amount=Sum('amount'),
+        total_commission=Sum('commission_amount'),
+        pending=Sum('commission_amount', filter=Q(payment_status='pending')),
+        paid=Sum('commission_amount', filter=Q(payment_status='paid')),
+    )
+
+
+def monthly_series(brands, months=12):
+    """Commission total and transaction count per month, oldest first"""
+    start = timezone.localdate().replace(day=1)
+    for _ in range(months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+
+    series = defaultdict(lambda: {'total': Decimal('0'), 'count': 0})
+    for period, total, count in (
+        BrandEarningsMonthly.objects.filter(brand__in=brands, period__gte=start)
+        .values_list('period', 'commission_amount', 'count')
+    ):
+        series[period]['total'] += total
+        series[period]['count'] += count
+
+    return [
+        {'month': period, 'total': values['total'], 'count': values['count']}
+        for period, values in sorted(series.items())
+        if values['count']
+    ]
+
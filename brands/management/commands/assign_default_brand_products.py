@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Count
 from brands.models import Brand
+from brands.pricing import invalidate_price_map
 from products.models import Product, BrandProduct
 
 
@@ -26,18 +28,26 @@ class Command(BaseCommand):
             id__in=assigned_product_ids
         ).filter(can_order=True)
 
-        # Assign unassigned products to default brand
-        for product in unassigned_products:
-            brand_product, created = BrandProduct.objects.get_or_create(
-                brand=default_brand,
-                product=product,
-                defaults={
-                    'is_available': True,
-                    # Default brand uses standard product pricing (no custom prices)
-                }
-            )
-            if created:
-                self.stdout.write(f'Assigned {product.name} to {default_brand.name}')
+        # Assign unassigned products to default brand, in one insert
+        already_assigned = set(
+            BrandProduct.objects.filter(brand=default_brand).values_list('product_id', flat=True)
+        )
+        new_products = [product for product in unassigned_products.only('pk', 'name')
+                        if product.pk not in already_assigned]
+        BrandProduct.objects.bulk_create(
+            [
+                # Default brand uses standard product pricing (no custom prices)
+                BrandProduct(brand=default_brand, product=product, is_available=True)
+                for product in new_products
+            ],
+            ignore_conflicts=True,
+        )
+        for product in new_products:
+            self.stdout.write(f'Assigned {product.name} to {default_brand.name}')
+
+        if new_products:
+            # bulk_create skips the signal that drops the brand's cached prices
+            invalidate_price_map(default_brand.pk)
 
         # Get final counts
         default_count = BrandProduct.objects.filter(brand=default_brand).count()
@@ -49,10 +59,13 @@ class Command(BaseCommand):
         self.stdout.write(f'\nFinal count for {default_brand.name}: {default_count} products')
         
         # Show what products each brand has
-        all_brands = Brand.objects.filter(is_active=True)
+        all_brands = Brand.objects.filter(is_active=True).annotate(product_count=Count('brandproduct'))
+        product_names = {}
+        for brand_id, name in BrandProduct.objects.filter(brand__in=all_brands).values_list('brand_id', 'product__name'):
+            product_names.setdefault(brand_id, []).append(name)
         for brand in all_brands:
-            count = BrandProduct.objects.filter(brand=brand).count()
-            products = [bp.product.name for bp in BrandProduct.objects.filter(brand=brand)[:3]]
+            count = brand.product_count
+            products = product_names.get(brand.pk, [])[:3]
             products_str = ', '.join(products)
             if count > 3:
                 products_str += f'... (+{count-3} more)'
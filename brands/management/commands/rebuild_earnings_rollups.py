@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from brands.earnings import rebuild_rollups
+from brands.models import Brand
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily and monthly earnings rollups from BrandEarnings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--brand', help='Only rebuild this brand (slug)')
+
+    def handle(self, *args, **options):
+        brand = None
+        if options['brand']:
+            try:
+                brand = Brand.objects.get(slug=options['brand'])
+            except Brand.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f"Brand '{options['brand']}' not found"))
+                return
+
+        self.stdout.write('Rebuilding earnings rollups...')
+        written = rebuild_rollups(brand=brand)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt earnings rollups ({written} rows)')
+        )
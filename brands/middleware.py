@@ -1,6 +1,8 @@
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 from django.http import Http404
 from .models import Brand
+from .ownership import load_brand_access
 
 
 class BrandMiddleware(MiddlewareMixin):
@@ -23,7 +25,8 @@ class BrandMiddleware(MiddlewareMixin):
         
         return None
     
-    def extract_subdomain(self, host):
+    @staticmethod
+    def extract_subdomain(host):
         """
         Extract subdomain from host
         Examples:
@@ -58,4 +61,16 @@ class BrandMiddleware(MiddlewareMixin):
                 response['X-Brand-Name'] = request.brand.name
                 response['X-Brand-Subdomain'] = request.subdomain or 'default'
         
-        return response
\ No newline at end of file
+        return response
+
+
+class BrandAccessMiddleware(MiddlewareMixin):
+    """
+    Attach the user's brand ownership as request.brand_access.
+    Resolved lazily, so pages that never look at it don't pay for it.
+    Must come after AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        request.brand_access = SimpleLazyObject(lambda: load_brand_access(request.user))
+        return None
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.11 on 2026-10-19 00:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0006_add_brand_background_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BrandEarningsDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='Start of the day or month')),
+                ('payment_status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('commission_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('brand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='brands.brand')),
+            ],
+            options={
+                'verbose_name': 'Brand Earnings (Daily)',
+                'verbose_name_plural': 'Brand Earnings (Daily)',
+                'ordering': ['brand', 'period'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('brand', 'period', 'payment_status'), name='earnings_daily_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BrandEarningsMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='Start of the day or month')),
+                ('payment_status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('commission_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('brand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='brands.brand')),
+            ],
+            options={
+                'verbose_name': 'Brand Earnings (Monthly)',
+                'verbose_name_plural': 'Brand Earnings (Monthly)',
+                'ordering': ['brand', 'period'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('brand', 'period', 'payment_status'), name='earnings_monthly_unique')],
+            },
+        ),
+    ]
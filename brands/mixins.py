@@ -1,6 +1,6 @@
 from django.db.models import Q
 from .models import Brand
-from products.models import BrandProduct
+from .pricing import load_price_map
 
 
 class BrandFilterMixin:
@@ -10,22 +10,23 @@ class BrandFilterMixin:
     
     def get_brand(self):
         """Get the current brand from request"""
-        return getattr(self.request, 'brand', Brand.get_by_subdomain())
+        return getattr(self.request, 'brand', None) or Brand.get_by_subdomain()
+    
+    def get_brand_prices(self):
+        """Cached availability/price map for the current brand (see brands.pricing)"""
+        if not hasattr(self, '_brand_prices'):
+            self._brand_prices = load_price_map(self.get_brand())
+        return self._brand_prices
     
     def get_brand_products_queryset(self):
         """Get products available for the current brand"""
         from products.models import Product
         
-        brand = self.get_brand()
-        
         # Get products that are available for this brand
-        brand_product_ids = BrandProduct.objects.filter(
-            brand=brand,
-            is_available=True
-        ).values_list('product_id', flat=True)
+        brand_product_ids = self.get_brand_prices().available_product_ids
         
         # If no brand-specific products exist, return empty queryset
-        if not brand_product_ids.exists():
+        if not brand_product_ids:
             return Product.objects.none()
         
         return Product.objects.filter(
@@ -51,13 +52,9 @@ class BrandProductFilterMixin(BrandFilterMixin):
         
         # If parent has queryset, filter it by brand
         if queryset is not None:
-            brand = self.get_brand()
-            brand_product_ids = BrandProduct.objects.filter(
-                brand=brand,
-                is_available=True
-            ).values_list('product_id', flat=True)
+            brand_product_ids = self.get_brand_prices().available_product_ids
             
-            if brand_product_ids.exists():
+            if brand_product_ids:
                 return queryset.filter(id__in=brand_product_ids)
             else:
                 # For any brand with no products, return empty queryset
@@ -67,25 +64,15 @@ class BrandProductFilterMixin(BrandFilterMixin):
         return self.get_brand_products_queryset()
     
     def get_brand_pricing(self, product, quantity=1):
-        """Get brand-specific pricing for a product"""
-        brand = self.get_brand()
-        
-        try:
-            brand_product = BrandProduct.objects.get(
-                brand=brand,
-                product=product,
-                is_available=True
-            )
-            return brand_product.get_price(quantity)
-        except BrandProduct.DoesNotExist:
-            # Fall back to default product pricing
-            return product.get_base_price()
+        """Get brand-specific pricing for a product (falls back to default pricing)"""
+        return self.get_brand_prices().price(product, quantity)
     
     def get_context_data(self, **kwargs):
         """Add brand-specific context"""
         context = super().get_context_data(**kwargs)
         
-        # Add brand pricing helper to context
+        # Add brand pricing helpers to context
         context['get_brand_pricing'] = self.get_brand_pricing
+        context['brand_prices'] = self.get_brand_prices()
         
         return context
\ No newline at end of file
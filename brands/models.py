@@ -1,7 +1,10 @@
-from django.db import models
+from collections import defaultdict
+from django.db import models, transaction
+from django.db.models import F
 from django.urls import reverse
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
+from core.counters import BufferedCounter
 import json
 
 User = get_user_model()
@@ -269,9 +272,25 @@ class BrandTemplate(models.Model):
         return f"{self.brand.name} - {self.name}"
     
     def increment_usage(self):
-        """Increment usage count"""
+        """Increment usage count (buffered, written back in batches)"""
         self.usage_count += 1
-        self.save(update_fields=['usage_count'])
+        template_usage.increment(self.pk)
+
+
+def flush_template_usage(counts):
+    """Apply buffered BrandTemplate usage increments with F() updates"""
+    by_amount = defaultdict(list)
+    for template_id, amount in counts.items():
+        by_amount[amount].append(template_id)
+
+    with transaction.atomic():
+        for amount, template_ids in by_amount.items():
+            BrandTemplate.objects.filter(pk__in=template_ids).update(
+                usage_count=F('usage_count') + amount
+            )
+
+
+template_usage = BufferedCounter('brands.template_usage', flush_template_usage)
 
 
 class BrandEarnings(models.Model):
@@ -305,6 +324,49 @@ class BrandEarnings(models.Model):
         super().save(*args, **kwargs)
 
 
+class EarningsRollup(models.Model):
+    """
+    Precomputed BrandEarnings totals per brand, period and payment status.
+    Maintained by signals (see brands.earnings) so earnings pages never
+    aggregate over individual transactions.
+    """
+    brand = models.ForeignKey(Brand, on_delete=models.CASCADE, related_name='+')
+    period = models.DateField(help_text="Start of the day or month")
+    payment_status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    commission_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+        ordering = ['brand', 'period']
+
+    def __str__(self):
+        return f"{self.brand} - {self.period} ({self.payment_status}): ${self.commission_amount}"
+
+
+class BrandEarningsDaily(EarningsRollup):
+    """Daily earnings rollup"""
+
+    class Meta(EarningsRollup.Meta):
+        verbose_name = "Brand Earnings (Daily)"
+        verbose_name_plural = "Brand Earnings (Daily)"
+        constraints = [
+            models.UniqueConstraint(fields=['brand', 'period', 'payment_status'], name='earnings_daily_unique'),
+        ]
+
+
+class BrandEarningsMonthly(EarningsRollup):
+    """Monthly earnings rollup"""
+
+    class Meta(EarningsRollup.Meta):
+        verbose_name = "Brand Earnings (Monthly)"
+        verbose_name_plural = "Brand Earnings (Monthly)"
+        constraints = [
+            models.UniqueConstraint(fields=['brand', 'period', 'payment_status'], name='earnings_monthly_unique'),
+        ]
+
+
 class PartnerRequest(models.Model):
     """Partner/Brand creation requests"""
     BUSINESS_TYPE_CHOICES = [
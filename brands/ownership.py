@@ -0,0 +1,94 @@
+"""
+Brand ownership resolver
+
+Loads the brands a user owns (with the primary flag and per-brand
+permissions) in one indexed query and exposes it as request.brand_access
+(see brands.middleware.BrandAccessMiddleware). It is an authorization
+check, so it is read fresh on every request rather than cached: a removed
+owner loses access on the next request in every worker.
+"""
+from django.http import Http404
+
+from .models import BrandOwner
+
+
+class BrandAccess:
+    """The brands a user owns, resolved once per request"""
+
+    def __init__(self, ownerships):
+        # BrandOwner rows with their brand loaded, in Brand ordering
+        self.ownerships = ownerships
+        self._by_brand_id = {owner.brand_id: owner for owner in ownerships}
+        self.brands = [owner.brand for owner in ownerships if owner.brand.is_active]
+
+    def __bool__(self):
+        return bool(self.ownerships)
+
+    @property
+    def brand_ids(self):
+        return [brand.id for brand in self.brands]
+
+    def get(self, brand_id=None, slug=None):
+        """Return an owned, active brand by id or slug (None if not owned)"""
+        for brand in self.brands:
+            if slug is not None and brand.slug == slug:
+                return brand
+            if brand_id is not None and str(brand.id) == str(brand_id):
+                return brand
+        return None
+
+    def get_or_404(self, brand_id=None, slug=None):
+        brand = self.get(brand_id=brand_id, slug=slug)
+        if brand is None:
+            raise Http404("Brand not found or access denied")
+        return brand
+
+    def owner_for(self, brand):
+        """The user's BrandOwner row for a brand"""
+        return self._by_brand_id.get(brand.id) if brand else None
+
+    def is_primary(self, brand):
+        owner = self.owner_for(brand)
+        return bool(owner and owner.is_primary)
+
+    def permissions_for(self, brand):
+        owner = self.owner_for(brand)
+        return owner.permissions if owner else {}
+
+    def current_brand(self, session):
+        """Brand selected in the session, else the primary brand, else the first"""
+        selected_brand_id = session.get('selected_brand_id')
+        if selected_brand_id:
+            brand = self.get(brand_id=selected_brand_id)
+            if brand:
+                return brand
+
+        for brand in self.brands:
+            if self.is_primary(brand):
+                return brand
+        return self.brands[0] if self.brands else None
+
+
+EMPTY_ACCESS = BrandAccess([])
+
+
+def load_brand_access(user):
+    """Return the user's BrandAccess"""
+    if not user.is_authenticated:
+        return EMPTY_ACCESS
+
+    ownerships = list(
+        BrandOwner.objects.filter(user_id=user.pk)
+        .select_related('brand')
+        .order_by('brand__name', 'brand_id')
+    )
+    return BrandAccess(ownerships)
+
+
+def get_brand_access(request):
+    """request.brand_access, resolving it if the middleware isn't installed"""
+    access = getattr(request, 'brand_access', None)
+    if access is None:
+        access = load_brand_access(request.user)
+        request.brand_access = access
+    return access
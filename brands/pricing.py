@@ -0,0 +1,122 @@
+"""
+Brand price maps
+
+All of a brand's BrandProduct rows are loaded in one query and compiled
+into {product_id: (is_available, tiers)}, where tiers is a sorted tuple of
+(min_quantity, unit_price), so pricing a page of products costs one query.
+With a shared cache (core.caches.is_shared) the map is also cached per
+brand between requests and dropped when any of the brand's BrandProduct
+rows change. A process-local cache would only be cleared in the worker
+that saved the row, so without one the map is loaded on every request.
+"""
+import hashlib
+from bisect import bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.caches import is_shared
+from products.models import BrandProduct
+from products.records import ProductRecord
+
+
+def _cache_key(brand_id):
+    return f'brands:prices:{brand_id}'
+
+
+def compile_tiers(prices):
+    """{"1": 12.5, "10": 11} -> ((1, 12.5), (10, 11.0)), ignoring bad entries"""
+    tiers = []
+    for quantity, price in (prices or {}).items():
+        try:
+            tiers.append((int(quantity), float(price)))
+        except (TypeError, ValueError):
+            continue
+    return tuple(sorted(tiers))
+
+
+def tier_price(tiers, quantity=1):
+    """Unit price of the largest tier not above quantity (None if none applies)"""
+    index = bisect_right(tiers, (quantity, float('inf')))
+    return tiers[index - 1][1] if index else None
+
+
+def base_price(product):
+    """Default unit price for a Product instance or a products.data record"""
+    if isinstance(product, ProductRecord):
+        return product.base_price
+    return product.get_base_price()
+
+
+class BrandPriceMap:
+    """Availability and custom price tiers for every product of one brand"""
+
+    def __init__(self, brand_id, entries, names=None):
+        self.brand_id = brand_id
+        self.entries = entries
+        # products.data records are matched to Product rows by name
+        self.names = names or {}
+        # Changes with the rows the map was compiled from (see products.catalog)
+        self.version = hashlib.sha256(
+            repr((sorted(self.entries.items()), sorted(self.names.items()))).encode()
+        ).hexdigest()[:16]
+
+    def __contains__(self, product):
+        return self._entry(product) is not None
+
+    def _entry(self, product):
+        """Entry for a Product, a products.data record or a Product id"""
+        if isinstance(product, ProductRecord):
+            return self.entries.get(self.names.get(product.name))
+        return self.entries.get(getattr(product, 'pk', product))
+
+    @property
+    def available_product_ids(self):
+        return [product_id for product_id, (available, _) in self.entries.items() if available]
+
+    def is_available(self, product):
+        entry = self._entry(product)
+        return bool(entry and entry[0])
+
+    def tiers(self, product):
+        """Custom tiers for a product (empty when the brand uses default pricing)"""
+        entry = self._entry(product)
+        return entry[1] if entry else ()
+
+    def price(self, product, quantity=1):
+        """
+        Unit price for a Product (or products.data record) at this quantity:
+        the tiers of an available BrandProduct (as BrandProduct.get_price()),
+        else the product's base price. Products the brand has made unavailable
+        get the base price, as the old get_brand_pricing() lookup (which only
+        matched available BrandProducts) did.
+        """
+        entry = self._entry(product)
+        if entry and entry[0]:
+            price = tier_price(entry[1], quantity)
+            if price is not None:
+                return price
+        return base_price(product)
+
+
+def load_price_map(brand):
+    """Return the brand's BrandPriceMap, from the shared cache when possible"""
+    shared = is_shared()
+    key = _cache_key(brand.pk)
+    price_map = cache.get(key) if shared else None
+    if price_map is None:
+        entries, names = {}, {}
+        for product_id, name, is_available, custom_prices in (
+            BrandProduct.objects.filter(brand_id=brand.pk)
+            .values_list('product_id', 'product__name', 'is_available', 'custom_prices')
+        ):
+            entries[product_id] = (is_available, compile_tiers(custom_prices))
+            names[name] = product_id
+        price_map = BrandPriceMap(brand.pk, entries, names)
+        if shared:
+            cache.set(key, price_map, getattr(settings, 'BRAND_PRICING_CACHE_TIMEOUT', 3600))
+    return price_map
+
+
+def invalidate_price_map(brand_id):
+    cache.delete(_cache_key(brand_id))
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from products.models import BrandProduct
+from .models import BrandEarnings, BrandImage, BrandTemplate
+from .pricing import invalidate_price_map
+from .stats import invalidate_brand_stats
+
+
+@receiver(pre_save, sender=BrandEarnings)
+def remember_earning_rollup(sender, instance, raw=False, **kwargs):
+    """Remember what the row contributed before this save"""
+    if raw or instance.pk is None:
+        instance._rollup_previous = None
+        return
+    from .earnings import ROLLUP_FIELDS
+    instance._rollup_previous = sender.objects.filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+
+
+@receiver(post_save, sender=BrandEarnings)
+def update_earning_rollups(sender, instance, raw=False, **kwargs):
+    """Move the row's contribution in the daily/monthly rollups"""
+    if raw:
+        return
+    from .earnings import add_earning, earning_values, remove_earning
+
+    previous = getattr(instance, '_rollup_previous', None)
+    current = earning_values(instance)
+    if previous == current:
+        return
+    if previous:
+        remove_earning(previous)
+    add_earning(current)
+    instance._rollup_previous = current
+
+
+@receiver(post_delete, sender=BrandEarnings)
+def remove_earning_rollups(sender, instance, **kwargs):
+    from .earnings import earning_values, remove_earning
+    remove_earning(earning_values(instance))
+
+
+@receiver(post_save, sender=BrandProduct)
+@receiver(post_delete, sender=BrandProduct)
+@receiver(post_save, sender=BrandTemplate)
+@receiver(post_delete, sender=BrandTemplate)
+@receiver(post_save, sender=BrandImage)
+@receiver(post_delete, sender=BrandImage)
+@receiver(post_save, sender=BrandEarnings)
+@receiver(post_delete, sender=BrandEarnings)
+def invalidate_dashboard_stats(sender, instance, **kwargs):
+    """Drop the brand's cached dashboard snapshot"""
+    invalidate_brand_stats(instance.brand_id)
+
+
+@receiver(post_save, sender=BrandProduct)
+@receiver(post_delete, sender=BrandProduct)
+def invalidate_brand_prices(sender, instance, **kwargs):
+    """Drop the brand's cached price map"""
+    invalidate_price_map(instance.brand_id)
@@ -0,0 +1,172 @@
+"""
+Brand dashboard statistics
+
+BrandStats computes every dashboard number for one or more brands in a
+single query (correlated subquery annotations on Brand) and caches the
+snapshot per brand for BRAND_STATS_CACHE_TIMEOUT seconds. The dashboard's
+snapshot also carries the brand's newest templates, joined into the same
+query. Signals drop a brand's snapshot when its products, templates,
+images or earnings change.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Count, DecimalField, F, FilteredRelation, IntegerField, OuterRef, Q, Subquery, Sum,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from products.models import BrandProduct
+from .models import Brand, BrandEarningsDaily, BrandImage, BrandTemplate
+
+RECENT_EARNINGS_DAYS = 30
+RECENT_TEMPLATES = 5
+
+# What the dashboard shows of each recent template
+RECENT_TEMPLATE_FIELDS = ('id', 'brand', 'name', 'thumbnail_url', 'is_public', 'usage_count', 'created_at')
+
+
+def _cache_key(brand_id):
+    return f'brands:stats:{brand_id}'
+
+
+def _brand_subquery(queryset, aggregate, output_field):
+    """Correlated per-brand aggregate, 0 when the brand has no rows"""
+    queryset = (
+        queryset.filter(brand=OuterRef('pk'))
+        .order_by()
+        .values('brand')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+    return Coalesce(Subquery(queryset, output_field=output_field), 0, output_field=output_field)
+
+
+class BrandStats:
+    """Snapshot of a brand's dashboard numbers"""
+
+    FIELDS = (
+        'total_products', 'active_products', 'total_templates', 'total_images',
+        'recent_earnings_total', 'recent_earnings_count',
+    )
+
+    def __init__(self, brand_id, recent_templates=None, **values):
+        self.brand_id = brand_id
+        for field in self.FIELDS:
+            setattr(self, field, values.get(field, 0))
+        # Only for_brand() snapshots carry them; None otherwise
+        self.recent_templates = recent_templates
+
+    @property
+    def inactive_products(self):
+        return self.total_products - self.active_products
+
+    @property
+    def recent_earnings(self):
+        """Same shape as the old 30-day aggregate ({'total', 'count'})"""
+        return {'total': self.recent_earnings_total, 'count': self.recent_earnings_count}
+
+    @staticmethod
+    def _annotations():
+        integer, money = IntegerField(), DecimalField(max_digits=14, decimal_places=2)
+        # Today and the days before it, RECENT_EARNINGS_DAYS calendar days in all
+        since = timezone.localdate() - timedelta(days=RECENT_EARNINGS_DAYS - 1)
+        recent_earnings = BrandEarningsDaily.objects.filter(period__gte=since)
+        return {
+            'total_products': _brand_subquery(BrandProduct.objects.all(), Count('pk'), integer),
+            'active_products': _brand_subquery(BrandProduct.objects.filter(is_available=True), Count('pk'), integer),
+            'total_templates': _brand_subquery(BrandTemplate.objects.all(), Count('pk'), integer),
+            'total_images': _brand_subquery(BrandImage.objects.all(), Count('pk'), integer),
+            'recent_earnings_total': _brand_subquery(recent_earnings, Sum('commission_amount'), money),
+            'recent_earnings_count': _brand_subquery(recent_earnings, Sum('count'), integer),
+        }
+
+    @classmethod
+    def compute(cls, brand_ids):
+        """Compute snapshots for the given brands in one query"""
+        rows = Brand.objects.filter(pk__in=brand_ids).order_by().annotate(
+            **cls._annotations()
+        ).values('pk', *cls.FIELDS)
+
+        return {
+            row['pk']: cls(row.pop('pk'), **row)
+            for row in rows
+        }
+
+    @classmethod
+    def compute_with_templates(cls, brand_id):
+        """
+        One brand's snapshot with its recent templates, in one query: the
+        brand row is LEFT JOINed to its newest RECENT_TEMPLATES templates,
+        one result row per template (a single row with NULLs when it has none)
+        """
+        newest = (
+            BrandTemplate.objects.filter(brand_id=brand_id)
+            .order_by('-created_at', '-pk')
+            .values('pk')[:RECENT_TEMPLATES]
+        )
+        fields = [field for field in BrandTemplate._meta.concrete_fields if field.name in RECENT_TEMPLATE_FIELDS]
+        queryset = (
+            Brand.objects.filter(pk=brand_id)
+            .annotate(recent=FilteredRelation('templates', condition=Q(templates__pk__in=Subquery(newest))))
+            .annotate(**cls._annotations())
+            .order_by(F('recent__created_at').desc(nulls_last=True), '-recent__pk')
+            .values(*cls.FIELDS, *(f'recent__{field.name}' for field in fields))
+        )
+        rows = list(queryset)
+        if not rows:
+            return None
+
+        templates = [
+            BrandTemplate.from_db(
+                queryset.db,
+                [field.attname for field in fields],
+                [row[f'recent__{field.name}'] for field in fields],
+            )
+            for row in rows
+            if row['recent__id'] is not None
+        ]
+        return cls(brand_id, recent_templates=templates, **{field: rows[0][field] for field in cls.FIELDS})
+
+    @classmethod
+    def for_brands(cls, brands):
+        """Snapshots for several brands, computing only the ones not cached"""
+        brand_ids = [brand.pk for brand in brands]
+        cached = cache.get_many([_cache_key(brand_id) for brand_id in brand_ids])
+        snapshots = {stats.brand_id: stats for stats in cached.values()}
+
+        missing = [brand_id for brand_id in brand_ids if brand_id not in snapshots]
+        if missing:
+            computed = cls.compute(missing)
+            snapshots.update(computed)
+            cache.set_many(
+                {_cache_key(brand_id): stats for brand_id, stats in computed.items()},
+                getattr(settings, 'BRAND_STATS_CACHE_TIMEOUT', 60),
+            )
+        return snapshots
+
+    @classmethod
+    def for_brand(cls, brand):
+        """Dashboard snapshot for one brand, recent templates included"""
+        key = _cache_key(brand.pk)
+        stats = cache.get(key)
+        # Snapshots cached by for_brands() have no templates
+        if stats is None or stats.recent_templates is None:
+            stats = cls.compute_with_templates(brand.pk) or cls(brand.pk, recent_templates=[])
+            cache.set(key, stats, getattr(settings, 'BRAND_STATS_CACHE_TIMEOUT', 60))
+        return stats
+
+    @classmethod
+    def totals(cls, brands):
+        """Summed snapshot over several brands (e.g. the catalog page)"""
+        total = cls(None)
+        for stats in cls.for_brands(brands).values():
+            for field in cls.FIELDS:
+                setattr(total, field, getattr(total, field) + getattr(stats, field))
+        return total
+
+
+def invalidate_brand_stats(brand_id):
+    cache.delete(_cache_key(brand_id))
@@ -1,3 +1,193 @@
-from django.test import TestCase
+import tempfile
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from products.models import BrandProduct, Product
+from .earnings import rollup_periods
+from .models import Brand, BrandEarnings, BrandEarningsDaily, BrandEarningsMonthly, BrandOwner, BrandTemplate
+from .ownership import load_brand_access
+from .pricing import load_price_map
+from .stats import RECENT_EARNINGS_DAYS, RECENT_TEMPLATES, BrandStats
+
+
+class EarningsRollupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name='Rollup Brand')
+
+    def earning(self, amount='100.00', days_ago=0, **kwargs):
+        return BrandEarnings.objects.create(
+            brand=self.brand, order_id=1, amount=Decimal(amount), commission_rate=Decimal('10.00'),
+            transaction_date=timezone.now() - timedelta(days=days_ago), **kwargs
+        )
+
+    def direct(self, monthly):
+        """What the rollup should hold, aggregated from the earnings themselves"""
+        totals = defaultdict(lambda: [0, Decimal('0'), Decimal('0')])
+        for earning in BrandEarnings.objects.filter(brand=self.brand):
+            day, month = rollup_periods(earning.transaction_date)
+            row = totals[(month if monthly else day, earning.payment_status)]
+            row[0] += 1
+            row[1] += earning.amount
+            row[2] += earning.commission_amount
+        return {key: tuple(row) for key, row in totals.items()}
+
+    def assertRollupsMatch(self):
+        for model, monthly in ((BrandEarningsDaily, False), (BrandEarningsMonthly, True)):
+            rollup = {
+                (row.period, row.payment_status): (row.count, row.amount, row.commission_amount)
+                for row in model.objects.filter(brand=self.brand)
+                if row.count
+            }
+            self.assertEqual(rollup, self.direct(monthly), model.__name__)
+
+    def test_create(self):
+        self.earning()
+        self.earning('50.00')
+        self.earning('25.00', days_ago=40)
+        self.assertRollupsMatch()
+
+    def test_update_amount(self):
+        earning = self.earning()
+        earning.amount = Decimal('80.00')
+        earning.commission_amount = Decimal('8.00')
+        earning.save()
+        self.assertRollupsMatch()
+
+    def test_status_flip(self):
+        earning = self.earning()
+        self.earning('30.00')
+        earning.payment_status = 'paid'
+        earning.save()
+        self.assertRollupsMatch()
+        earning.payment_status = 'pending'
+        earning.save()
+        self.assertRollupsMatch()
+
+    def test_date_change(self):
+        earning = self.earning()
+        earning.transaction_date -= timedelta(days=45)
+        earning.save()
+        self.assertRollupsMatch()
+
+    def test_delete(self):
+        earning = self.earning()
+        self.earning('60.00')
+        earning.delete()
+        self.assertRollupsMatch()
+
+    def test_recent_window_is_thirty_days(self):
+        self.earning(days_ago=RECENT_EARNINGS_DAYS - 1)
+        self.earning(days_ago=RECENT_EARNINGS_DAYS)
+        stats = BrandStats.compute([self.brand.pk])[self.brand.pk]
+        self.assertEqual(stats.recent_earnings_count, 1)
+
+
+class BrandAccessTests(TestCase):
+
+    def test_removed_owner_loses_access(self):
+        user = get_user_model().objects.create_user(username='owner', password='x', is_brand_owner=True)
+        brand = Brand.objects.create(name='Owned Brand')
+        owner = BrandOwner.objects.create(brand=brand, user=user, is_primary=True)
+        self.assertEqual(load_brand_access(user).get(brand_id=brand.pk), brand)
+
+        owner.delete()
+        self.assertFalse(load_brand_access(user))
+
+
+class BrandStatsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name='Stats Brand')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_dashboard_snapshot_is_one_query(self):
+        templates = [BrandTemplate.objects.create(brand=self.brand, name=f'Template {i}') for i in range(7)]
+        with self.assertNumQueries(1):
+            stats = BrandStats.for_brand(self.brand)
+        self.assertEqual(stats.total_templates, 7)
+        self.assertEqual([template.pk for template in stats.recent_templates],
+                         [template.pk for template in reversed(templates)][:RECENT_TEMPLATES])
+
+        with self.assertNumQueries(0):
+            BrandStats.for_brand(self.brand)
+
+    def test_nav_badges_come_from_the_snapshot(self):
+        user = get_user_model().objects.create_user(username='badges', password='x', is_brand_owner=True)
+        BrandOwner.objects.create(brand=self.brand, user=user, is_primary=True)
+        BrandTemplate.objects.create(brand=self.brand, name='Template')
+        self.client.force_login(user)
+
+        for url in (reverse('brands:dashboard'), reverse('brands:templates'), reverse('brands:settings')):
+            with self.subTest(url), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertContains(response, '<span class="nav-badge">1</span>', html=True)
+            # Only the snapshot query counts images, and only while it is cold
+            counted = [query['sql'] for query in queries if 'COUNT' in query['sql'] and 'brands_brandimage' in query['sql']]
+            self.assertLessEqual(len(counted), 1)
+            self.assertTrue(all('products_brandproduct' in sql for sql in counted))
+
+    def test_brand_without_templates(self):
+        with self.assertNumQueries(1):
+            stats = BrandStats.for_brand(self.brand)
+        self.assertEqual(stats.recent_templates, [])
+        self.assertEqual(stats.total_templates, 0)
+
+
+SHARED_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                            'LOCATION': str(Path(tempfile.gettempdir()) / 'm2django-test-cache')}}
+
+
+class PriceMapTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name='Price Brand')
+        cls.product = Product.objects.create(name='Shirt', model_link='shirt.glb', prices={'1': 20, '10': 18})
+        cls.brand_product = BrandProduct.objects.create(brand=cls.brand, product=cls.product,
+                                                        custom_prices={'1': 25, '10': 22})
+
+    def setUp(self):
+        cache.clear()
+
+    def test_prices(self):
+        price_map = load_price_map(self.brand)
+        self.assertEqual(price_map.price(self.product), 25.0)
+        self.assertEqual(price_map.price(self.product, 12), 22.0)
+        self.assertEqual(price_map.price(self.product, 12), self.brand_product.get_price(12))
+
+    def test_unavailable_product_uses_base_price(self):
+        BrandProduct.objects.filter(pk=self.brand_product.pk).update(is_available=False)
+        self.assertEqual(load_price_map(self.brand).price(self.product), 20.0)
+
+    def test_local_cache_is_not_used(self):
+        load_price_map(self.brand)
+        # A write another worker made: no signal reaches this process
+        BrandProduct.objects.filter(pk=self.brand_product.pk).update(custom_prices={'1': 30})
+        self.assertEqual(load_price_map(self.brand).price(self.product), 30.0)
+
+    @override_settings(CACHES=SHARED_CACHE)
+    def test_shared_cache_is_invalidated(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        load_price_map(self.brand)
+        with self.assertNumQueries(0):
+            load_price_map(self.brand)
+
+        self.brand_product.custom_prices = {'1': 30}
+        self.brand_product.save()
+        self.assertEqual(load_price_map(self.brand).price(self.product), 30.0)
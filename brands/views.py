@@ -4,17 +4,21 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.contrib import messages
 from django.http import JsonResponse, Http404
-from django.db.models import Sum, Count, Q
-from django.utils import timezone
-from datetime import datetime, timedelta
+from django.db.models import Count
+from datetime import datetime
+from django.utils.functional import SimpleLazyObject
 from django.utils.text import slugify
 
 from .models import (
-    Brand, BrandOwner, BrandTemplate, BrandImage, 
+    BrandTemplate, BrandImage, 
     BrandImageCategory, BrandEarnings, PartnerRequest
 )
 from .mixins import BrandFilterMixin
+from .earnings import earnings_summary, monthly_series
+from .ownership import get_brand_access
+from .stats import BrandStats
 from .forms import PartnerRequestForm
+from core.querycount import query_budget
 from products.models import BrandProduct
 from django.core.mail import send_mail
 from django.conf import settings
@@ -28,95 +32,61 @@ class BrandOwnerRequiredMixin(LoginRequiredMixin):
             return super().dispatch(request, *args, **kwargs)
         
         # Check if user owns any brands
-        if not BrandOwner.objects.filter(user=request.user).exists():
+        if not get_brand_access(request):
             messages.error(request, "You don't have access to any brand management areas.")
             return redirect('accounts:dashboard')
         
         return super().dispatch(request, *args, **kwargs)
     
     def get_user_brands(self):
-        """Get brands owned by current user"""
-        return Brand.objects.filter(
-            owners__user=self.request.user,
-            is_active=True
-        ).distinct()
+        """Get active brands owned by current user"""
+        return get_brand_access(self.request).brands
     
     def get_current_brand(self):
-        """Get current brand from session or default"""
-        user_brands = self.get_user_brands()
-        selected_brand_id = self.request.session.get('selected_brand_id')
-        current_brand = None
-        
-        if selected_brand_id:
-            current_brand = user_brands.filter(id=selected_brand_id).first()
-        
-        if not current_brand:
-            primary_brand = user_brands.filter(owners__is_primary=True, owners__user=self.request.user).first()
-            current_brand = primary_brand or user_brands.first()
-        
-        return current_brand
+        """Get current brand from session, primary brand or first brand"""
+        return get_brand_access(self.request).current_brand(self.request.session)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['user_brands'] = self.get_user_brands()
-        context['current_brand'] = self.get_current_brand()
+        context['current_brand'] = current_brand = self.get_current_brand()
+        # For the nav badges in base_brand.html; not every page renders them
+        context['stats'] = SimpleLazyObject(lambda: BrandStats.for_brand(current_brand)) if current_brand else None
         return context
 
 
+@query_budget(9)
 @login_required
 def brand_dashboard(request):
     """Brand owner dashboard"""
-    user_brands = Brand.objects.filter(
-        owners__user=request.user,
-        is_active=True
-    ).distinct()
+    access = get_brand_access(request)
+    user_brands = access.brands
     
-    if not user_brands.exists():
+    if not user_brands:
         messages.error(request, "You don't have access to any brand management areas.")
         return redirect('accounts:dashboard')
     
     # Get current brand from session, primary brand, or first brand
-    selected_brand_id = request.session.get('selected_brand_id')
-    current_brand = None
-    
-    if selected_brand_id:
-        current_brand = user_brands.filter(id=selected_brand_id).first()
-    
-    if not current_brand:
-        primary_brand = user_brands.filter(owners__is_primary=True, owners__user=request.user).first()
-        current_brand = primary_brand or user_brands.first()
-    
-    # Dashboard statistics
-    total_products = BrandProduct.objects.filter(brand=current_brand, is_available=True).count()
-    total_templates = BrandTemplate.objects.filter(brand=current_brand).count()
-    total_images = BrandImage.objects.filter(brand=current_brand).count()
-    
-    # Recent earnings (last 30 days)
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    recent_earnings = BrandEarnings.objects.filter(
-        brand=current_brand,
-        transaction_date__gte=thirty_days_ago
-    ).aggregate(
-        total=Sum('commission_amount'),
-        count=Count('id')
-    )
-    
-    # Recent templates
-    recent_templates = BrandTemplate.objects.filter(brand=current_brand).order_by('-created_at')[:5]
+    current_brand = access.current_brand(request.session)
+    
+    # Dashboard statistics (cached snapshot, one query when cold)
+    stats = BrandStats.for_brand(current_brand)
     
     context = {
         'current_brand': current_brand,
         'user_brands': user_brands,
-        'total_products': total_products,
-        'total_templates': total_templates,
-        'total_images': total_images,
-        'recent_earnings': recent_earnings,
-        'recent_templates': recent_templates,
+        'stats': stats,
+        'total_products': stats.active_products,
+        'total_templates': stats.total_templates,
+        'total_images': stats.total_images,
+        'recent_earnings': stats.recent_earnings,
+        'recent_templates': stats.recent_templates,
     }
     
     return render(request, 'brands/dashboard.html', context)
 
 
+@query_budget(13)
 class BrandTemplateListView(BrandOwnerRequiredMixin, ListView):
     """List brand templates"""
     model = BrandTemplate
@@ -140,7 +110,7 @@ class BrandTemplateListView(BrandOwnerRequiredMixin, ListView):
             template_data = request.POST.get('template_data', '')
             
             # Validate brand ownership
-            brand = get_object_or_404(brands, id=brand_id)
+            brand = get_brand_access(request).get_or_404(brand_id=brand_id)
             
             # Create template
             template = BrandTemplate.objects.create(
@@ -162,6 +132,7 @@ class BrandTemplateListView(BrandOwnerRequiredMixin, ListView):
         return redirect('brands:templates')
 
 
+@query_budget(14)
 class BrandImageListView(BrandOwnerRequiredMixin, ListView):
     """List brand images"""
     model = BrandImage
@@ -188,6 +159,7 @@ class BrandImageListView(BrandOwnerRequiredMixin, ListView):
         return context
 
 
+@query_budget(9)
 class BrandImageCategoryListView(BrandOwnerRequiredMixin, ListView):
     """Manage brand image categories"""
     model = BrandImageCategory
@@ -196,8 +168,17 @@ class BrandImageCategoryListView(BrandOwnerRequiredMixin, ListView):
     
     def get_queryset(self):
         brands = self.get_user_brands()
-        return BrandImageCategory.objects.filter(brand__in=brands).order_by('name')
+        return (
+            BrandImageCategory.objects.filter(brand__in=brands)
+            .select_related('brand')
+            .annotate(image_count=Count('images'))
+            .order_by('name')
+        )
     
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['total_images'] = sum(category.image_count for category in context['categories'])
+        return context
     
     def post(self, request, *args, **kwargs):
         """Handle category creation, editing, and deletion"""
@@ -210,7 +191,7 @@ class BrandImageCategoryListView(BrandOwnerRequiredMixin, ListView):
             description = request.POST.get('description', '')
             
             # Validate brand ownership
-            brand = get_object_or_404(brands, id=brand_id)
+            brand = get_brand_access(request).get_or_404(brand_id=brand_id)
             
             # Create category
             slug = slugify(name)
@@ -244,29 +225,25 @@ class BrandImageCategoryListView(BrandOwnerRequiredMixin, ListView):
         return redirect('brands:image_categories')
 
 
+@query_budget(15)
 @login_required
 def brand_settings(request, brand_slug=None):
     """Brand settings management"""
-    user_brands = Brand.objects.filter(
-        owners__user=request.user,
-        is_active=True
-    ).distinct()
+    access = get_brand_access(request)
+    user_brands = access.brands
     
-    if not user_brands.exists():
+    if not user_brands:
         messages.error(request, "You don't have access to any brand management areas.")
         return redirect('accounts:dashboard')
     
     # Get specific brand or default to first
     if brand_slug:
-        current_brand = get_object_or_404(user_brands, slug=brand_slug)
+        current_brand = access.get_or_404(slug=brand_slug)
     else:
-        current_brand = user_brands.first()
+        current_brand = user_brands[0]
     
     # Check if user has permission to edit this brand
-    brand_owner = BrandOwner.objects.filter(
-        user=request.user, 
-        brand=current_brand
-    ).first()
+    brand_owner = access.owner_for(current_brand)
     
     if not brand_owner:
         raise Http404("Brand not found or access denied")
@@ -292,11 +269,13 @@ def brand_settings(request, brand_slug=None):
         'current_brand': current_brand,
         'user_brands': user_brands,
         'brand_owner': brand_owner,
+        'stats': BrandStats.for_brand(current_brand),
     }
     
     return render(request, 'brands/settings.html', context)
 
 
+@query_budget(15)
 class BrandEarningsListView(BrandOwnerRequiredMixin, ListView):
     """Brand earnings and analytics"""
     model = BrandEarnings
@@ -306,34 +285,15 @@ class BrandEarningsListView(BrandOwnerRequiredMixin, ListView):
     
     def get_queryset(self):
         brands = self.get_user_brands()
-        return BrandEarnings.objects.filter(brand__in=brands).order_by('-transaction_date')
+        return BrandEarnings.objects.filter(brand__in=brands).select_related('brand').order_by('-transaction_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         brands = self.get_user_brands()
         
-        # Earnings summary
-        total_earnings = BrandEarnings.objects.filter(brand__in=brands).aggregate(
-            total_amount=Sum('amount'),
-            total_commission=Sum('commission_amount'),
-            pending=Sum('commission_amount', filter=Q(payment_status='pending')),
-            paid=Sum('commission_amount', filter=Q(payment_status='paid')),
-        )
-        
-        # Monthly breakdown (last 12 months) - SQLite compatible
-        from django.db.models import F
-        from django.db.models.functions import TruncMonth
-        
-        twelve_months_ago = timezone.now() - timedelta(days=365)
-        monthly_earnings = BrandEarnings.objects.filter(
-            brand__in=brands,
-            transaction_date__gte=twelve_months_ago
-        ).annotate(
-            month=TruncMonth('transaction_date')
-        ).values('month').annotate(
-            total=Sum('commission_amount'),
-            count=Count('id')
-        ).order_by('month')
+        # Earnings summary and monthly breakdown (last 12 months) from the rollups
+        total_earnings = earnings_summary(brands)
+        monthly_earnings = monthly_series(brands, months=12)
         
         context.update({
             'user_brands': brands,
@@ -348,10 +308,7 @@ class BrandEarningsListView(BrandOwnerRequiredMixin, ListView):
 @login_required
 def api_brand_templates(request):
     """API endpoint for brand templates"""
-    user_brands = Brand.objects.filter(
-        owners__user=request.user,
-        is_active=True
-    ).distinct()
+    user_brands = get_brand_access(request).brand_ids
     
     templates = BrandTemplate.objects.filter(
         brand__in=user_brands
@@ -380,10 +337,7 @@ def api_public_templates(request):
 @login_required
 def api_brand_backgrounds(request):
     """API endpoint for brand background images"""
-    user_brands = Brand.objects.filter(
-        owners__user=request.user,
-        is_active=True
-    ).distinct()
+    user_brands = get_brand_access(request).brand_ids
     
     # Get background images (assume there's a category for backgrounds)
     background_images = BrandImage.objects.filter(
@@ -396,6 +350,7 @@ def api_brand_backgrounds(request):
     })
 
 
+@query_budget(15)
 class BrandCatalogView(BrandOwnerRequiredMixin, ListView):
     """Brand catalog - manage which products are available for this brand"""
     model = BrandProduct
@@ -405,21 +360,20 @@ class BrandCatalogView(BrandOwnerRequiredMixin, ListView):
     
     def get_queryset(self):
         brands = self.get_user_brands()
-        return BrandProduct.objects.filter(brand__in=brands).order_by('-created_at')
+        return BrandProduct.objects.filter(brand__in=brands).select_related('product').prefetch_related('product__categories').order_by('-created_at')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         brands = self.get_user_brands()
         
         # Get product statistics
-        total_products = BrandProduct.objects.filter(brand__in=brands).count()
-        active_products = BrandProduct.objects.filter(brand__in=brands, is_available=True).count()
+        stats = BrandStats.totals(brands)
         
         context.update({
-            'total_products': total_products,
-            'active_products': active_products,
-            'inactive_products': total_products - active_products,
-            'estimated_revenue': active_products * 25,  # Estimate $25 per active product per month
+            'total_products': stats.total_products,
+            'active_products': stats.active_products,
+            'inactive_products': stats.inactive_products,
+            'estimated_revenue': stats.active_products * 25,  # Estimate $25 per active product per month
         })
         
         return context
@@ -444,12 +398,7 @@ class BrandCatalogView(BrandOwnerRequiredMixin, ListView):
 @login_required
 def switch_brand(request, brand_slug):
     """Switch to a different brand"""
-    user_brands = Brand.objects.filter(
-        owners__user=request.user,
-        is_active=True
-    ).distinct()
-    
-    brand = get_object_or_404(user_brands, slug=brand_slug)
+    brand = get_brand_access(request).get_or_404(slug=brand_slug)
     
     # Store the selected brand in session
     request.session['selected_brand_id'] = brand.id
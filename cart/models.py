@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from decimal import Decimal
+from core.db import write_transaction
 import json
 
 User = get_user_model()
@@ -257,11 +258,12 @@ class GuestCartManager:
         if not session_cart:
             return
         
-        # Get or create user's cart
-        cart, created = Cart.objects.get_or_create(user=user)
-        
-        # Merge session cart data
-        cart.merge_with_session_cart(session_cart)
+        with write_transaction():
+            # Get or create user's cart
+            cart, created = Cart.objects.get_or_create(user=user)
+            
+            # Merge session cart data
+            cart.merge_with_session_cart(session_cart)
         
         # Clear session cart
         GuestCartManager.clear_session_cart(request)
\ No newline at end of file
@@ -12,8 +12,11 @@ import json
 
 from .models import Cart, CartItem, GuestCartManager
 from products.models import Product
+from core.db import write_transaction
+from core.querycount import query_budget
 
 
+@query_budget(12)
 class CartView(View):
     def get(self, request):
         cart_items = []
@@ -34,12 +37,13 @@ class CartView(View):
             # Get user's cart
             try:
                 cart = Cart.objects.get(user=request.user)
-                cart_items_qs = cart.items.all()
+                cart_items_qs = list(cart.items.all())
+                products = Product.objects.in_bulk({item.product_id for item in cart_items_qs})
                 
                 # Convert to template-friendly format
                 for item in cart_items_qs:
                     try:
-                        product = Product.objects.get(id=item.product_id)
+                        product = products[item.product_id]
                         cart_items.append({
                             'id': item.id,
                             'design_id': item.design_id,
@@ -58,7 +62,7 @@ class CartView(View):
                             })
                         })
                         subtotal += item.total_price
-                    except Product.DoesNotExist:
+                    except KeyError:
                         continue
                         
             except Cart.DoesNotExist:
@@ -66,10 +70,11 @@ class CartView(View):
         else:
             # Get guest cart from session
             session_cart = GuestCartManager.get_cart_from_session(request)
+            products = Product.objects.in_bulk({item.get('product_id') for item in session_cart})
             
             for item in session_cart:
                 try:
-                    product = Product.objects.get(id=item.get('product_id'))
+                    product = products[item.get('product_id')]
                     
                     # Calculate price based on quantity
                     quantity = item.get('quantity', 1)
@@ -104,7 +109,7 @@ class CartView(View):
                         })
                     })
                     subtotal += total_price
-                except Product.DoesNotExist:
+                except KeyError:
                     continue
         
         shipping = Decimal('15.00')
@@ -160,17 +165,18 @@ class CartView(View):
             if request.user.is_authenticated:
                 # Update database cart item
                 if item_id.isdigit():
-                    cart_item = get_object_or_404(CartItem, id=item_id, cart__user=request.user)
-                    
-                    if not sizes:
-                        # Remove item if no sizes have quantity
-                        cart_item.delete()
-                    else:
-                        # Update sizes and recalculate
-                        cart_item.sizes = sizes
-                        cart_item.quantity = sum(sizes.values())
-                        cart_item.update_price()
-                        cart_item.save()
+                    with write_transaction():
+                        cart_item = get_object_or_404(CartItem, id=item_id, cart__user=request.user)
+                        
+                        if not sizes:
+                            # Remove item if no sizes have quantity
+                            cart_item.delete()
+                        else:
+                            # Update sizes and recalculate
+                            cart_item.sizes = sizes
+                            cart_item.quantity = sum(sizes.values())
+                            cart_item.update_price()
+                            cart_item.save()
             else:
                 # Update session cart
                 design_id = item_id.replace('guest_', '') if item_id.startswith('guest_') else item_id
@@ -260,25 +266,26 @@ def add_to_cart(request):
         
         if request.user.is_authenticated:
             # Add to database cart
-            cart, created = Cart.objects.get_or_create(user=request.user)
-            
-            # Check if design already in cart
-            cart_item, created = CartItem.objects.get_or_create(
-                cart=cart,
-                design_id=design_id,
-                defaults={
-                    'design_name': design_data['name'],
-                    'thumbnail': design_data['thumbnail'],
-                    'product_id': product.id,
-                    'sizes': {size: quantity},
-                    'quantity': quantity
-                }
-            )
-            
-            if not created:
-                # Update existing item
-                cart_item.add_size_quantity(size, quantity)
-                cart_item.save()
+            with write_transaction():
+                cart, created = Cart.objects.get_or_create(user=request.user)
+                
+                # Check if design already in cart
+                cart_item, created = CartItem.objects.get_or_create(
+                    cart=cart,
+                    design_id=design_id,
+                    defaults={
+                        'design_name': design_data['name'],
+                        'thumbnail': design_data['thumbnail'],
+                        'product_id': product.id,
+                        'sizes': {size: quantity},
+                        'quantity': quantity
+                    }
+                )
+                
+                if not created:
+                    # Update existing item
+                    cart_item.add_size_quantity(size, quantity)
+                    cart_item.save()
         else:
             # Add to session cart
             GuestCartManager.add_to_session_cart(
@@ -305,6 +312,7 @@ def add_to_cart(request):
             return redirect('products:list')
 
 
+@query_budget(11)
 def cart_sidebar(request):
     """API endpoint for cart sidebar content"""
     cart_items = []
@@ -313,11 +321,12 @@ def cart_sidebar(request):
     if request.user.is_authenticated:
         try:
             cart = Cart.objects.get(user=request.user)
-            cart_items_qs = cart.items.all()[:5]  # Limit to 5 items for sidebar
+            cart_items_qs = list(cart.items.all()[:5])  # Limit to 5 items for sidebar
+            products = Product.objects.only('id', 'name').in_bulk({item.product_id for item in cart_items_qs})
             
             for item in cart_items_qs:
                 try:
-                    product = Product.objects.get(id=item.product_id)
+                    product = products[item.product_id]
                     cart_items.append({
                         'design_name': item.design_name,
                         'product_name': product.name,
@@ -328,7 +337,7 @@ def cart_sidebar(request):
                         'sizes_display': item.sizes_display
                     })
                     cart_total += item.total_price
-                except Product.DoesNotExist:
+                except KeyError:
                     continue
                     
         except Cart.DoesNotExist:
@@ -336,10 +345,11 @@ def cart_sidebar(request):
     else:
         # Get from session
         session_cart = GuestCartManager.get_cart_from_session(request)[:5]
+        products = Product.objects.in_bulk({item.get('product_id') for item in session_cart})
         
         for item in session_cart:
             try:
-                product = Product.objects.get(id=item.get('product_id'))
+                product = products[item.get('product_id')]
                 quantity = item.get('quantity', 1)
                 
                 # Calculate price
@@ -376,7 +386,7 @@ def cart_sidebar(request):
                 })
                 cart_total += total_price
                 
-            except Product.DoesNotExist:
+            except KeyError:
                 continue
     
     shipping = Decimal('15.00')
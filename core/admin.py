@@ -1,3 +1,82 @@
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 
-# Register your models here.
+from .models import RequestProfile, SlowQuery
+from .profiling import profile_filename
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'method', 'path', 'view_name', 'brand', 'user',
+                    'duration_ms', 'sample_count', 'truncated', 'download_link']
+    list_filter = ['view_name', 'brand', 'truncated', 'created_at']
+    search_fields = ['path', 'view_name']
+    list_select_related = ['brand', 'user']
+    exclude = ['folded_stacks']
+    readonly_fields = ['created_at', 'method', 'path', 'view_name', 'status_code', 'brand', 'user',
+                       'duration_ms', 'sample_count', 'interval_ms', 'truncated',
+                       'download_link', 'top_frames_table']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path('<int:pk>/download/', self.admin_site.admin_view(self.download_view),
+                 name='core_requestprofile_download'),
+        ]
+        return urls + super().get_urls()
+
+    def download_view(self, request, pk):
+        """The folded stacks as a file for flamegraph.pl or speedscope"""
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(profile.folded_stacks, content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{profile_filename(profile)}"'
+        return response
+
+    def download_link(self, obj):
+        url = reverse('admin:core_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">Download</a>', url)
+    download_link.short_description = 'Flamegraph'
+
+    def top_frames_table(self, obj):
+        rows = format_html_join(
+            '', '<tr><td>{}</td><td>{}</td></tr>', obj.top_frames()
+        )
+        return format_html('<table><tr><th>Frame</th><th>Samples</th></tr>{}</table>', rows)
+    top_frames_table.short_description = 'Hottest frames'
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ['short_sql', 'view_name', 'brand', 'user_type', 'calls',
+                    'total_ms', 'avg_ms_display', 'max_ms', 'last_seen']
+    list_filter = ['user_type', 'brand', 'view_name']
+    search_fields = ['sql', 'view_name', 'fingerprint']
+    list_select_related = ['brand']
+    ordering = ['-total_ms']
+    readonly_fields = ['fingerprint', 'sql', 'view_name', 'brand', 'user_type', 'calls',
+                       'total_ms', 'max_ms', 'first_seen', 'last_seen']
+    exclude = ['bucket']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def short_sql(self, obj):
+        return obj.sql if len(obj.sql) <= 120 else obj.sql[:117] + '...'
+    short_sql.short_description = 'Query'
+
+    def avg_ms_display(self, obj):
+        return f"{obj.avg_ms:.1f}"
+    avg_ms_display.short_description = 'Avg ms'
@@ -1,6 +1,23 @@
+import atexit
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from .counters import flush_all
+        from .db import configure_sqlite
+        from .telemetry import install as install_telemetry
+
+        connection_created.connect(configure_sqlite, dispatch_uid='core.configure_sqlite')
+
+        if getattr(settings, 'TELEMETRY_ENABLED', False):
+            install_telemetry()
+
+        # Drain buffered counters when the worker shuts down cleanly
+        atexit.register(flush_all)
@@ -0,0 +1,18 @@
+"""
+Cache helpers
+
+Django's default cache is local memory: every worker process has its own.
+Entries a signal drops on writes are then only dropped in the worker that
+handled the write, so such data should only be cached across requests when
+the cache is shared (see REDIS_URL in settings).
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared(alias='default'):
+    """Whether every worker process sees the same cache"""
+    return not isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
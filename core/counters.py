@@ -0,0 +1,176 @@
+"""
+Buffered write-behind counters
+
+Hot counters (share page views, template usage) are accumulated in process
+memory and written back in batches instead of issuing one UPDATE per hit.
+Every counter is registered by name so the background flusher and the
+shutdown hook can drain all of them.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+_flusher_lock = threading.Lock()
+_flusher_pid = None
+
+
+class BufferedCounter:
+    """
+    Accumulate integer increments per key and hand them to a flush callback
+    in batches. The callback receives a {key: amount} dict and is expected to
+    apply the amounts with F() expressions inside a transaction so concurrent
+    workers never lose increments.
+
+    A flush_interval of 0 writes every increment immediately (useful in tests).
+    Without explicit values the COUNTER_FLUSH_INTERVAL and COUNTER_MAX_PENDING
+    settings are read on every increment, so override_settings applies to
+    counters created at import time.
+
+    Subclasses can buffer other values than integers by overriding combine()
+    and size() (see core.slowlog.SlowQueryBuffer).
+    """
+
+    def __init__(self, name, flush_callback, flush_interval=None, max_pending=None):
+        self.name = name
+        self.flush_callback = flush_callback
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Only one flush per counter at a time; increments keep buffering meanwhile
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        register(self)
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'COUNTER_FLUSH_INTERVAL', 10)
+
+    @property
+    def max_pending(self):
+        if self._max_pending is not None:
+            return self._max_pending
+        return getattr(settings, 'COUNTER_MAX_PENDING', 500)
+
+    def combine(self, pending, key, amount):
+        """Fold an increment into the pending batch"""
+        pending[key] = pending.get(key, 0) + amount
+
+    def size(self, amount):
+        """What a pending value counts for in pending() and flush() totals"""
+        return amount
+
+    def increment(self, key, amount=1):
+        """Buffer an increment, flushing if the buffer is full or stale"""
+        with self._lock:
+            self.combine(self._pending, key, amount)
+            due = (
+                len(self._pending) >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+        else:
+            ensure_flusher()
+
+    def pending(self, key=None):
+        """Return the unflushed amount for a key (or for all keys)"""
+        with self._lock:
+            if key is None:
+                return sum(self.size(amount) for amount in self._pending.values())
+            return self.size(self._pending[key]) if key in self._pending else 0
+
+    def flush(self):
+        """Write all buffered increments and return the total flushed"""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = {}
+                self._last_flush = time.monotonic()
+
+            if not batch:
+                return 0
+
+            try:
+                self.flush_callback(dict(batch))
+            except Exception:
+                # Put the increments back so they are retried on the next flush
+                with self._lock:
+                    for key, amount in batch.items():
+                        self.combine(self._pending, key, amount)
+                raise
+
+            return sum(self.size(amount) for amount in batch.values())
+
+
+def register(counter):
+    """Register a counter so flush_all() drains it"""
+    with _registry_lock:
+        _registry[counter.name] = counter
+
+
+def unregister(name):
+    with _registry_lock:
+        _registry.pop(name, None)
+
+
+def get_counter(name):
+    return _registry.get(name)
+
+
+def flush_all():
+    """Flush every registered counter, returning the total written"""
+    total = 0
+    with _registry_lock:
+        counters = list(_registry.values())
+    for counter in counters:
+        try:
+            total += counter.flush()
+        except Exception:
+            logger.exception("Failed to flush counter %s", counter.name)
+    return total
+
+
+def _run_flusher(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush_all()
+        finally:
+            # The flusher thread owns its own connections; don't leave them open
+            connections.close_all()
+
+
+def ensure_flusher():
+    """
+    Start the background flush thread for this process if it isn't running.
+    Tracked by pid so forked workers (e.g. gunicorn --preload) start their own.
+    """
+    global _flusher_pid
+
+    interval = getattr(settings, 'COUNTER_FLUSH_INTERVAL', 10)
+    if _flusher_pid == os.getpid() or interval <= 0:
+        return
+
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        thread = threading.Thread(
+            target=_run_flusher,
+            args=(interval,),
+            name='counter-flusher',
+            daemon=True,
+        )
+        thread.start()
+        _flusher_pid = os.getpid()
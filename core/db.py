@@ -0,0 +1,54 @@
+"""
+Database tuning helpers
+
+SQLite connections get the PRAGMAs from settings.SQLITE_PRAGMAS applied as
+soon as they are opened, and write paths can use write_transaction() to take
+the write lock up front instead of upgrading a read lock mid-transaction.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created handler: apply the configured SQLite PRAGMAs"""
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@contextmanager
+def write_transaction(using=None):
+    """
+    atomic() for write paths. On SQLite the outermost block starts with
+    BEGIN IMMEDIATE, so concurrent writers queue on busy_timeout instead of
+    failing with "database is locked" when a deferred read lock is upgraded.
+    Other backends (and nested blocks) behave exactly like atomic().
+    """
+    using = using or DEFAULT_DB_ALIAS
+    connection = connections[using]
+
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    # Connecting resets transaction_mode from OPTIONS, so connect first
+    connection.ensure_connection()
+    previous_mode = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using=using):
+            # BEGIN IMMEDIATE has been issued; restore for any later transactions
+            connection.transaction_mode = previous_mode
+            yield
+    finally:
+        connection.transaction_mode = previous_mode
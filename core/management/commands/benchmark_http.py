@@ -0,0 +1,385 @@
+"""
+End-to-end HTTP benchmark for the storefront, designer, cart and brand
+dashboard endpoints.
+
+Each endpoint gets two passes:
+
+- a profile pass through the test client: one warmed-up request with every
+  database query captured and allocations traced (tracemalloc)
+- a load pass over real HTTP: --concurrency client threads sending
+  --requests requests in total, for p50/p95/p99 latency and throughput
+
+By default the app is served in-process on an ephemeral port against the
+configured database (fill it with generate_load_data first). --generate
+builds a throwaway database with sync_catalog + generate_load_data instead,
+and --url points the load pass at an already running server.
+
+The JSON report (--output) can be compared with an earlier one
+(--compare); regressions over --threshold fail the command.
+"""
+import http.client
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from urllib.parse import urlencode, urlsplit
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.middleware.csrf import get_token
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings, setup_databases, teardown_databases
+from django.urls import reverse
+
+from brands.models import BrandOwner
+from cart.models import Cart
+from designer.models import Design
+
+User = get_user_model()
+
+
+@dataclass
+class Endpoint:
+    name: str  # URL name
+    method: str = 'GET'
+    auth: bool = False
+    data: dict = field(default_factory=dict)  # POST body, filled in by the benchmark
+
+    @property
+    def path(self):
+        return reverse(self.name)
+
+
+ENDPOINTS = (
+    Endpoint('core:home'),
+    Endpoint('products:list'),
+    Endpoint('designer:designer'),
+    Endpoint('designer:save_design', method='POST', auth=True),
+    Endpoint('designer:user_images_api', auth=True),
+    Endpoint('cart:view', auth=True),
+    Endpoint('cart:sidebar', auth=True),
+    Endpoint('brands:dashboard', auth=True),
+    Endpoint('brands:catalog', auth=True),
+    Endpoint('brands:earnings', auth=True),
+    Endpoint('brands:templates', auth=True),
+)
+
+# Metrics checked by --compare; higher is worse for all of them
+COMPARED_METRICS = ('p95_ms', 'p99_ms', 'queries', 'alloc_kb')
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list"""
+    if not samples:
+        return 0.0
+    return samples[max(math.ceil(pct / 100 * len(samples)) - 1, 0)]
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the main endpoints over HTTP and write a JSON report (latency, throughput, queries, allocations)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint in the load pass')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads')
+        parser.add_argument('--endpoints', nargs='*', help='Only these URL names (e.g. core:home cart:view)')
+        parser.add_argument('--url', help='Load-test an already running server at this base URL')
+        parser.add_argument('--generate', action='store_true',
+                            help='Run against a throwaway database filled by generate_load_data')
+        parser.add_argument('--scale', type=int, default=1,
+                            help='With --generate: multiply the generated data volume')
+        parser.add_argument('--output', help='Write the JSON report here')
+        parser.add_argument('--compare', help='Earlier JSON report to compare against')
+        parser.add_argument('--threshold', type=float, default=20.0,
+                            help='With --compare: percent increase that counts as a regression')
+
+    def handle(self, *args, **options):
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not options['endpoints'] or endpoint.name in options['endpoints']
+        ]
+        if not endpoints:
+            raise CommandError('No matching endpoints')
+
+        with ExitStack() as stack:
+            if options['generate']:
+                stack.enter_context(self.generated_database(options['scale']))
+            client = self.logged_in_client()
+            self.prepare(endpoints, client)
+
+            base_url = options['url']
+            if not base_url:
+                base_url = stack.enter_context(self.serve())
+
+            report = {'meta': self.meta(options, base_url), 'endpoints': {}}
+            for endpoint in endpoints:
+                result = self.profile(endpoint, client)
+                result.update(self.load(endpoint, base_url, client, options['requests'], options['concurrency']))
+                report['endpoints'][endpoint.name] = result
+                self.stdout.write(
+                    f"{endpoint.name:<26} {result['status']:>3}  p50 {result['p50_ms']:>7.1f}ms  "
+                    f"p95 {result['p95_ms']:>7.1f}ms  p99 {result['p99_ms']:>7.1f}ms  "
+                    f"{result['rps']:>7.1f} req/s  {result['queries']:>3} queries  "
+                    f"{result['alloc_kb']:>8.1f} KB  errors {result['errors']}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+        if options['compare']:
+            self.compare(report, options['compare'], options['threshold'])
+
+    # Setup
+
+    def generated_database(self, scale):
+        """Context manager: a throwaway, generated database for every alias"""
+        command = self
+
+        class GeneratedDatabase:
+            def __enter__(self):
+                # A file, not SQLite's shared in-memory database, so server
+                # threads get real concurrent connections
+                self.tmpdir = tempfile.TemporaryDirectory()
+                for alias in connections:
+                    if connections[alias].vendor == 'sqlite':
+                        connections[alias].settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(
+                            self.tmpdir.name, f'{alias}.sqlite3'
+                        )
+                self.old_config = setup_databases(verbosity=0, interactive=False, aliases=set(connections))
+                # Media (placeholders, imagekit thumbnails) stays local and temporary
+                local = 'django.core.files.storage.FileSystemStorage'
+                self.media = override_settings(
+                    MEDIA_ROOT=self.tmpdir.name,
+                    MEDIA_URL='/media/',
+                    STORAGES={**settings.STORAGES, 'default': {'BACKEND': local}},
+                    IMAGEKIT_DEFAULT_FILE_STORAGE=local,
+                    IMAGEKIT_SPEC_CACHEFILE_STORAGE=local,
+                )
+                self.media.enable()
+                command.stdout.write('Generating load data...')
+                call_command('sync_catalog', stdout=command.stdout)
+                call_command(
+                    'generate_load_data', brands=20 * scale, users=200 * scale, designs=5000 * scale,
+                    carts=100 * scale, earnings_per_brand=100, stdout=command.stdout,
+                )
+                return self
+
+            def __exit__(self, *exc_info):
+                self.media.disable()
+                teardown_databases(self.old_config, verbosity=0)
+                self.tmpdir.cleanup()
+
+        return GeneratedDatabase()
+
+    def logged_in_client(self):
+        """A test client logged in as a brand owner, preferably one with a cart"""
+        owners = BrandOwner.objects.filter(is_primary=True, brand__is_active=True).values_list('user_id', flat=True)
+        user_id = (
+            Cart.objects.filter(user_id__in=owners).values_list('user_id', flat=True).first()
+            or owners.first()
+        )
+        if user_id is None:
+            raise CommandError('No brand owner found; run generate_load_data (or use --generate)')
+
+        client = Client()
+        client.force_login(User.objects.get(pk=user_id))
+        client.user_id = user_id
+
+        # CSRF cookie + matching token for POSTs over real HTTP
+        request = RequestFactory().get('/')
+        client.csrf_token = get_token(request)
+        client.cookies[settings.CSRF_COOKIE_NAME] = request.META['CSRF_COOKIE']
+        return client
+
+    def prepare(self, endpoints, client):
+        """Fill in POST bodies: save_design updates one of the user's designs"""
+        for endpoint in endpoints:
+            if endpoint.name != 'designer:save_design':
+                continue
+            design = Design.objects.filter(user_id=client.user_id).first()
+            if design is None:
+                raise CommandError('The benchmark user has no designs to save')
+            endpoint.data = {
+                'design_id': design.pk, 'name': design.name, 'product': design.product,
+                'data': json.dumps(design.data), 'public': '1' if design.public else '0',
+            }
+
+    def serve(self):
+        """Context manager: serve the app in-process, yielding its base URL"""
+        command = self
+
+        class Server:
+            def __enter__(self):
+                self.httpd = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler, allow_reuse_address=False)
+                self.httpd.set_app(get_wsgi_application())
+                self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+                self.thread.start()
+                host, port = self.httpd.server_address
+                command.stdout.write(f'Serving on http://{host}:{port}/')
+                return f'http://{host}:{port}'
+
+            def __exit__(self, *exc_info):
+                self.httpd.shutdown()
+                self.httpd.server_close()
+                self.thread.join()
+
+        return Server()
+
+    def meta(self, options, base_url):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                cwd=settings.BASE_DIR, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = ''
+        return {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'base_url': base_url,
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'generated': options['generate'],
+        }
+
+    # Passes
+
+    def request(self, client, endpoint):
+        if endpoint.method == 'POST':
+            return client.post(endpoint.path, endpoint.data, HTTP_X_CSRFTOKEN=client.csrf_token)
+        return client.get(endpoint.path)
+
+    def profile(self, endpoint, client):
+        """Queries and allocations of one warmed-up request, in-process"""
+        client = client if endpoint.auth else Client()
+        self.request(client, endpoint)  # warm caches and lazy imports
+
+        with ExitStack() as stack:
+            captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            tracemalloc.start()
+            try:
+                response = self.request(client, endpoint)
+                allocated, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        return {
+            'method': endpoint.method,
+            'path': endpoint.path,
+            'status': response.status_code,
+            'bytes': len(response.content),
+            'queries': sum(len(capture) for capture in captures),
+            'alloc_kb': round(allocated / 1024, 1),
+            'alloc_peak_kb': round(peak / 1024, 1),
+        }
+
+    def load(self, endpoint, base_url, client, total, concurrency):
+        """Latency percentiles and throughput over real HTTP"""
+        parts = urlsplit(base_url)
+        headers = {}
+        body = None
+        if endpoint.auth:
+            headers['Cookie'] = '; '.join(f'{key}={morsel.value}' for key, morsel in client.cookies.items())
+        if endpoint.method == 'POST':
+            body = urlencode(endpoint.data)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            headers['X-CSRFToken'] = client.csrf_token
+        path = (parts.path.rstrip('/') or '') + endpoint.path
+
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+        remaining = [total]
+
+        def worker():
+            nonlocal errors
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+                started = time.perf_counter()
+                try:
+                    conn.request(endpoint.method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    failed = response.status >= 400
+                except OSError:
+                    failed = True
+                finally:
+                    conn.close()
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    errors += failed
+
+        threads = [threading.Thread(target=worker) for _ in range(max(concurrency, 1))]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'mean_ms': round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+            'rps': round(len(latencies) / wall, 1) if wall else 0.0,
+        }
+
+    # Comparison
+
+    def compare(self, report, baseline_path, threshold):
+        with open(baseline_path) as handle:
+            baseline = json.load(handle)
+
+        self.stdout.write(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+        regressions = []
+        for name, result in report['endpoints'].items():
+            previous = baseline['endpoints'].get(name)
+            if not previous:
+                continue
+            changes = []
+            for metric in COMPARED_METRICS:
+                old, new = previous.get(metric), result.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old * 100
+                changes.append(f'{metric} {change:+.0f}%')
+                if change > threshold:
+                    regressions.append(f'{name} {metric}: {old} -> {new} ({change:+.0f}%)')
+            self.stdout.write(f"  {name:<26} {'  '.join(changes)}")
+
+        if regressions:
+            raise CommandError('Regressions over {}%:\n  {}'.format(threshold, '\n  '.join(regressions)))
+        self.stdout.write(self.style.SUCCESS(f'No regressions over {threshold}%'))
@@ -0,0 +1,165 @@
+"""
+Compare SQLite reader/writer throughput with the default settings against
+the production PRAGMA profile, using one OS process per simulated worker.
+"""
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from products.data import get_products
+
+SCHEMA = [
+    'CREATE TABLE design (id INTEGER PRIMARY KEY, owner INTEGER NOT NULL, name TEXT, data TEXT, updated_at REAL)',
+    'CREATE INDEX design_owner ON design (owner, updated_at)',
+]
+
+READ_SQL = 'SELECT id, name, data FROM design WHERE owner = ? ORDER BY updated_at DESC LIMIT 9'
+WRITE_SQL = 'UPDATE design SET data = ?, updated_at = ? WHERE id = ?'
+
+
+def _design_payload():
+    """A Design.data-shaped JSON blob built from the first product's meshes"""
+    products = get_products()
+    mesh_settings = products[0].mesh_settings if products else ()
+    return json.dumps({
+        'layers': {
+            mesh: {'color': settings_.initial_color, 'bumpmap': 'Polyester', 'decals': []}
+            for mesh, settings_ in mesh_settings
+        }
+    })
+
+
+def _connect(path, pragmas):
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+    for name, value in pragmas.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def _reader(path, pragmas, duration, owners, results):
+    conn = _connect(path, pragmas)
+    rng = random.Random(os.getpid())
+    ops = errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        try:
+            conn.execute(READ_SQL, (rng.randrange(owners),)).fetchall()
+            ops += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    conn.close()
+    results.put(('read', ops, errors))
+
+
+def _writer(path, pragmas, begin, duration, rows, payload, results):
+    conn = _connect(path, pragmas)
+    rng = random.Random(os.getpid())
+    ops = errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        try:
+            conn.execute(begin)
+            conn.execute(WRITE_SQL, (payload, time.time(), rng.randrange(rows) + 1))
+            conn.execute('COMMIT')
+            ops += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+    conn.close()
+    results.put(('write', ops, errors))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark SQLite reader/writer throughput: default settings vs the production PRAGMA profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='Reader processes')
+        parser.add_argument('--writers', type=int, default=2, help='Writer processes')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+        parser.add_argument('--rows', type=int, default=20000, help='Designs in the scratch database')
+        parser.add_argument('--owners', type=int, default=2000, help='Distinct design owners')
+
+    def handle(self, *args, **options):
+        profiles = [
+            ('default', {}, 'BEGIN'),
+            ('production', settings.SQLITE_PRODUCTION_PRAGMAS, 'BEGIN IMMEDIATE'),
+        ]
+        payload = _design_payload()
+
+        self.stdout.write(
+            f"Benchmarking {options['readers']} readers / {options['writers']} writers "
+            f"for {options['duration']}s per profile ({options['rows']} designs)..."
+        )
+
+        report = {}
+        for name, pragmas, begin in profiles:
+            report[name] = self.run_profile(pragmas, begin, payload, options)
+            result = report[name]
+            self.stdout.write(
+                f"  {name:<11} reads/s: {result['reads_per_sec']:>10.0f}   "
+                f"writes/s: {result['writes_per_sec']:>8.0f}   "
+                f"lock errors: {result['errors']}"
+            )
+
+        default, production = report['default'], report['production']
+        for metric in ('reads_per_sec', 'writes_per_sec'):
+            if default[metric]:
+                gain = production[metric] / default[metric]
+                self.stdout.write(self.style.SUCCESS(f"{metric.replace('_', ' ')}: {gain:.2f}x"))
+
+    def run_profile(self, pragmas, begin, payload, options):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'bench.sqlite3')
+
+            conn = _connect(path, pragmas)
+            for statement in SCHEMA:
+                conn.execute(statement)
+            rng = random.Random(0)
+            conn.execute('BEGIN')
+            conn.executemany(
+                'INSERT INTO design (owner, name, data, updated_at) VALUES (?, ?, ?, ?)',
+                (
+                    (rng.randrange(options['owners']), f'Design {i}', payload, time.time())
+                    for i in range(options['rows'])
+                ),
+            )
+            conn.execute('COMMIT')
+            conn.close()
+
+            results = multiprocessing.Queue()
+            workers = [
+                multiprocessing.Process(
+                    target=_reader,
+                    args=(path, pragmas, options['duration'], options['owners'], results),
+                )
+                for _ in range(options['readers'])
+            ] + [
+                multiprocessing.Process(
+                    target=_writer,
+                    args=(path, pragmas, begin, options['duration'], options['rows'], payload, results),
+                )
+                for _ in range(options['writers'])
+            ]
+            for worker in workers:
+                worker.start()
+            totals = {'read': 0, 'write': 0, 'errors': 0}
+            for _ in workers:
+                kind, ops, errors = results.get()
+                totals[kind] += ops
+                totals['errors'] += errors
+            for worker in workers:
+                worker.join()
+
+        return {
+            'reads_per_sec': totals['read'] / options['duration'],
+            'writes_per_sec': totals['write'] / options['duration'],
+            'errors': totals['errors'],
+        }
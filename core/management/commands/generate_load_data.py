@@ -0,0 +1,420 @@
+"""
+Generate production-shaped data for load tests and query-plan checks.
+
+Everything is built offline: placeholder images are drawn with Pillow and
+written to MEDIA_ROOT/loadtest/ (never to remote storage), Design.data
+payloads follow each product's meshSettings, and every row is inserted
+with bulk_create in chunks. The same --seed always produces the same rows.
+
+Generated users and brands are namespaced (load-user-N, load-brand-N), so
+--clear removes exactly what a previous run created.
+"""
+import io
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from brands.earnings import rebuild_rollups
+from brands.models import Brand, BrandEarnings, BrandImage, BrandImageCategory, BrandOwner, BrandTemplate
+from cart.models import Cart, CartItem
+from designer.gallery import rebuild_listings
+from designer.models import Design, DesignImage
+from products.data import get_bumpmap_textures, get_fonts, get_products
+from products.models import BrandProduct, Product
+
+User = get_user_model()
+
+USER_PREFIX = 'load-user-'
+BRAND_PREFIX = 'load-brand-'
+PLACEHOLDER_DIR = 'loadtest'
+
+WORDS = (
+    'Summit', 'Harbor', 'Falcon', 'Granite', 'Cedar', 'Vertex', 'Tidal', 'Ember', 'Nova', 'Atlas',
+    'Ridge', 'Pioneer', 'Lumen', 'Drift', 'Coastal', 'Union', 'Aurora', 'Forge', 'Meadow', 'Orbit',
+)
+IMAGE_CATEGORIES = ('Logos', 'Mascots', 'Patterns', 'Sponsors')
+PAYMENT_STATUSES = ('paid', 'paid', 'paid', 'pending', 'cancelled')
+
+
+def _chunked(objects, size):
+    chunk = []
+    for obj in objects:
+        chunk.append(obj)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _color(rng):
+    return '#%06x' % rng.randrange(0x1000000)
+
+
+class Command(BaseCommand):
+    help = 'Generate large, deterministic synthetic data (brands, users, designs, images, carts, earnings)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--brands', type=int, default=100)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--designs', type=int, default=10000)
+        parser.add_argument('--public-ratio', type=float, default=0.2,
+                            help='Share of designs published to the gallery')
+        parser.add_argument('--images-per-brand', type=int, default=20)
+        parser.add_argument('--templates-per-brand', type=int, default=5)
+        parser.add_argument('--images-per-user', type=int, default=2)
+        parser.add_argument('--carts', type=int, default=500, help='Users with a cart')
+        parser.add_argument('--earnings-per-brand', type=int, default=200)
+        parser.add_argument('--placeholders', type=int, default=24,
+                            help='Distinct placeholder image files to draw and share between rows')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete previously generated load data first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.chunk_size = max(options['chunk_size'], 1)
+        self.now = timezone.now()
+
+        if options['clear']:
+            self.clear()
+        if Brand.objects.filter(slug__startswith=BRAND_PREFIX).exists() or \
+                User.objects.filter(username__startswith=USER_PREFIX).exists():
+            raise CommandError('Load data already exists; run with --clear to regenerate it')
+
+        self.products = [product for product in get_products() if product.can_order]
+        if not self.products:
+            raise CommandError('The product catalog has no orderable products')
+
+        started = time.monotonic()
+        self.placeholders = self.draw_placeholders(max(options['placeholders'], 1))
+
+        brand_ids = self.create_brands(options['brands'])
+        user_ids = self.create_users(options['users'])
+        self.create_owners(brand_ids, user_ids)
+        self.create_brand_products(brand_ids)
+        self.create_brand_images(brand_ids, options['images_per_brand'])
+        self.create_templates(brand_ids, options['templates_per_brand'])
+        self.create_design_images(user_ids, options['images_per_user'])
+        self.create_designs(brand_ids, user_ids, options['designs'], options['public_ratio'])
+        self.create_carts(user_ids, options['carts'])
+        self.create_earnings(brand_ids, options['earnings_per_brand'])
+
+        # Bulk inserts skip the signals that maintain these tables
+        self.stdout.write('Rebuilding earnings rollups and gallery listings...')
+        rebuild_rollups()
+        rebuild_listings()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated load data in {time.monotonic() - started:.1f}s (seed {options["seed"]})'
+        ))
+
+    def clear(self):
+        self.stdout.write('Clearing previous load data...')
+        with transaction.atomic():
+            Brand.objects.filter(slug__startswith=BRAND_PREFIX).delete()
+            User.objects.filter(username__startswith=USER_PREFIX).delete()
+        storage = self.storage()
+        if storage.exists(PLACEHOLDER_DIR):
+            for name in storage.listdir(PLACEHOLDER_DIR)[1]:
+                storage.delete(f'{PLACEHOLDER_DIR}/{name}')
+
+    def bulk_create(self, model, objects, label, keep=True):
+        """Insert in chunks, one transaction per chunk; returns the created objects if keep"""
+        created, total = [], 0
+        for chunk in _chunked(objects, self.chunk_size):
+            with transaction.atomic():
+                model.objects.bulk_create(chunk)
+            total += len(chunk)
+            if keep:
+                created.extend(chunk)
+        self.stdout.write(f'  {label}: {total}')
+        return created
+
+    def storage(self):
+        # Always local: load data must not be uploaded to remote media storage
+        return FileSystemStorage(location=settings.MEDIA_ROOT, base_url=settings.MEDIA_URL)
+
+    def draw_placeholders(self, count):
+        """Draw `count` small PNGs; returns (name, url, size, width, height)"""
+        from PIL import Image, ImageDraw
+
+        storage = self.storage()
+        placeholders = []
+        for index in range(count):
+            width, height = self.rng.choice(((512, 512), (800, 600), (600, 800), (1024, 512)))
+            image = Image.new('RGB', (width, height), _color(self.rng))
+            draw = ImageDraw.Draw(image)
+            for _ in range(6):
+                x, y = self.rng.randrange(width), self.rng.randrange(height)
+                draw.rectangle((x, y, x + width // 4, y + height // 4), fill=_color(self.rng))
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG')
+
+            name = f'{PLACEHOLDER_DIR}/placeholder-{index}.png'
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+            placeholders.append((name, storage.url(name), buffer.tell(), width, height))
+        self.stdout.write(f'  placeholder files: {count}')
+        return placeholders
+
+    def create_brands(self, count):
+        brands = (
+            Brand(
+                name=f'{self.rng.choice(WORDS)} {self.rng.choice(WORDS)} {index}',
+                slug=f'{BRAND_PREFIX}{index}',
+                subdomain=f'{BRAND_PREFIX}{index}',
+                headline='Custom team apparel',
+                description='Synthetic brand for load testing',
+                primary_color=_color(self.rng),
+                secondary_color=_color(self.rng),
+                contact_email=f'brand{index}@example.com',
+            )
+            for index in range(count)
+        )
+        self.bulk_create(Brand, brands, 'brands', keep=False)
+        # Re-read pks: not every backend returns them from bulk_create()
+        return list(Brand.objects.filter(slug__startswith=BRAND_PREFIX).order_by('pk').values_list('pk', flat=True))
+
+    def create_users(self, count):
+        # Hashing is deliberately slow; every load user shares one password
+        password = make_password('load-test')
+        users = (
+            User(
+                username=f'{USER_PREFIX}{index}',
+                email=f'{USER_PREFIX}{index}@example.com',
+                password=password,
+                first_name=self.rng.choice(WORDS),
+                last_name=self.rng.choice(WORDS),
+            )
+            for index in range(count)
+        )
+        self.bulk_create(User, users, 'users', keep=False)
+        return list(User.objects.filter(username__startswith=USER_PREFIX).order_by('pk').values_list('pk', flat=True))
+
+    def create_owners(self, brand_ids, user_ids):
+        if not user_ids:
+            return
+        owners = (
+            BrandOwner(brand_id=brand_id, user_id=user_ids[index % len(user_ids)], is_primary=True)
+            for index, brand_id in enumerate(brand_ids)
+        )
+        self.bulk_create(BrandOwner, owners, 'brand owners', keep=False)
+        User.objects.filter(pk__in=user_ids[:len(brand_ids)]).update(is_brand_owner=True)
+
+    def create_brand_products(self, brand_ids):
+        product_ids = list(Product.objects.filter(can_order=True).values_list('pk', flat=True))
+        if not product_ids:
+            self.stdout.write(self.style.WARNING('  brand products: skipped (run sync_catalog first)'))
+            return
+
+        def rows():
+            for brand_id in brand_ids:
+                for product_id in self.rng.sample(product_ids, self.rng.randint(1, len(product_ids))):
+                    custom_prices = {}
+                    if self.rng.random() < 0.3:
+                        unit = round(self.rng.uniform(18, 45), 2)
+                        custom_prices = {'1': unit, '12': round(unit * 0.9, 2), '48': round(unit * 0.8, 2)}
+                    yield BrandProduct(brand_id=brand_id, product_id=product_id,
+                                       is_available=self.rng.random() < 0.9, custom_prices=custom_prices)
+
+        self.bulk_create(BrandProduct, rows(), 'brand products', keep=False)
+
+    def create_brand_images(self, brand_ids, per_brand):
+        if not per_brand:
+            return
+        self.bulk_create(BrandImageCategory, (
+            BrandImageCategory(brand_id=brand_id, name=name, slug=name.lower())
+            for brand_id in brand_ids for name in IMAGE_CATEGORIES
+        ), 'image categories', keep=False)
+        categories_by_brand = {}
+        for category_id, brand_id in (
+            BrandImageCategory.objects.filter(brand_id__in=brand_ids).order_by('pk').values_list('pk', 'brand_id')
+        ):
+            categories_by_brand.setdefault(brand_id, []).append(category_id)
+
+        def rows():
+            for brand_id in brand_ids:
+                for index in range(per_brand):
+                    name, url, size, width, height = self.rng.choice(self.placeholders)
+                    yield BrandImage(
+                        brand_id=brand_id, category_id=self.rng.choice(categories_by_brand[brand_id]),
+                        name=f'Image {index}', image_url=url, thumbnail_url=url, alt_text=f'Image {index}',
+                        is_public=self.rng.random() < 0.5, file_size=size, width=width, height=height,
+                    )
+
+        self.bulk_create(BrandImage, rows(), 'brand images', keep=False)
+
+    def design_data(self, product):
+        """A Design.data payload shaped like the designer's captureDesignData()"""
+        bumpmaps = product.supported_bumpmaps or tuple(get_bumpmap_textures()) or ('Polyester',)
+        fonts = get_fonts() or ['Roboto']
+        layers = {}
+        for mesh_name, mesh in product.mesh_settings:
+            decals = []
+            if mesh.can_add_images:
+                for index in range(self.rng.choice((0, 0, 1, 1, 2, 3))):
+                    decal = {
+                        'id': f'{mesh_name}-{index}',
+                        'name': f'Decal {index}',
+                        'type': self.rng.choice(('text', 'image', 'image')),
+                        'position': {'x': round(self.rng.uniform(mesh.min_x, mesh.max_x), 4),
+                                     'y': round(self.rng.uniform(mesh.min_y, mesh.max_y), 4)},
+                        'size': {'width': round(self.rng.uniform(0.05, 0.3), 4),
+                                 'height': round(self.rng.uniform(0.05, 0.3), 4)},
+                        'rotation': self.rng.choice((0, 0, 0, 15, 45, 90)),
+                        'opacity': 1,
+                        'flipX': False,
+                        'flipY': False,
+                        'aspectLocked': True,
+                    }
+                    if decal['type'] == 'text':
+                        decal['textData'] = {
+                            'text': self.rng.choice(WORDS).upper(), 'font': self.rng.choice(fonts),
+                            'color': _color(self.rng), 'letterSpacing': 0, 'borderWidth': 0,
+                            'borderColor': '#000000',
+                        }
+                    else:
+                        decal['imageUrl'] = self.rng.choice(self.placeholders)[1]
+                    decals.append(decal)
+            layers[mesh_name] = {
+                'color': _color(self.rng) if mesh.can_change_color else mesh.initial_color,
+                'material': self.rng.choice(bumpmaps) if mesh.can_change_bumpmap else product.initial_bumpmap,
+                'decals': decals,
+            }
+        return {'layers': layers, 'currentLayer': product.initial_layer, 'productId': product.id}
+
+    def create_designs(self, brand_ids, user_ids, count, public_ratio):
+        if not count or not user_ids:
+            return
+        user_brands = {user_id: self.rng.choice(brand_ids) if brand_ids else None for user_id in user_ids}
+
+        def rows():
+            for index in range(count):
+                product = self.rng.choice(self.products)
+                user_id = self.rng.choice(user_ids)
+                thumbnail = self.rng.choice(self.placeholders)[0]
+                yield Design(
+                    user_id=user_id, brand_id=user_brands[user_id],
+                    name=f'{product.name} #{index}', product=product.id,
+                    data=self.design_data(product),
+                    thumbnail_front=thumbnail, thumbnail_back=thumbnail,
+                    public=self.rng.random() < public_ratio,
+                    created_at=self.now - timedelta(minutes=self.rng.randrange(365 * 24 * 60)),
+                )
+
+        # Design pks aren't needed later, so don't keep millions of objects around
+        self.bulk_create(Design, rows(), 'designs', keep=False)
+        # updated_at is auto_now, so bulk_create() gave every row the same one;
+        # the gallery score and my_designs order by it
+        Design.objects.filter(user__username__startswith=USER_PREFIX).update(updated_at=F('created_at'))
+
+    def create_design_images(self, user_ids, per_user):
+        if not per_user:
+            return
+
+        def rows():
+            for user_id in user_ids:
+                for index in range(per_user):
+                    name, _, size, width, height = self.rng.choice(self.placeholders)
+                    yield DesignImage(user_id=user_id, image=name, name=f'upload-{index}.png',
+                                      file_size=size, width=width, height=height, filetype='image/png')
+
+        self.bulk_create(DesignImage, rows(), 'design images', keep=False)
+
+    def create_templates(self, brand_ids, per_brand):
+        if not per_brand:
+            return
+
+        def rows():
+            for brand_id in brand_ids:
+                for index in range(per_brand):
+                    product = self.rng.choice(self.products)
+                    url = self.rng.choice(self.placeholders)[1]
+                    yield BrandTemplate(
+                        brand_id=brand_id, name=f'Template {index}', template_data=self.design_data(product),
+                        thumbnail_url=url, is_public=self.rng.random() < 0.3,
+                        is_featured=index == 0, usage_count=self.rng.randrange(500),
+                    )
+
+        self.bulk_create(BrandTemplate, rows(), 'brand templates', keep=False)
+
+    def create_carts(self, user_ids, count):
+        cart_users = self.rng.sample(user_ids, min(count, len(user_ids)))
+        if not cart_users:
+            return
+        self.bulk_create(Cart, (Cart(user_id=user_id) for user_id in cart_users), 'carts', keep=False)
+        carts = list(Cart.objects.filter(user_id__in=cart_users).order_by('pk').only('pk', 'user_id'))
+
+        # Reference real designs of each cart's owner where there are any
+        design_ids = {}
+        for design_id, user_id, product_id, name in (
+            Design.objects.filter(user_id__in=cart_users).order_by('pk')
+            .values_list('pk', 'user_id', 'product', 'name')
+        ):
+            design_ids.setdefault(user_id, []).append((design_id, product_id, name))
+        products_by_id = {product.id: product for product in self.products}
+        # Designs store the catalog id, cart items the Product pk; names link them
+        product_pks = dict(Product.objects.order_by('-pk').values_list('name', 'pk'))
+
+        def rows():
+            for cart in carts:
+                designs = design_ids.get(cart.user_id) or []
+                for design_id, catalog_id, name in self.rng.sample(designs, min(len(designs), self.rng.randint(1, 3))):
+                    product = products_by_id.get(catalog_id)
+                    product_id = product_pks.get(product.name) if product else None
+                    if product_id is None:
+                        continue
+                    sizes = {
+                        size: self.rng.randint(1, 12)
+                        for size in self.rng.sample(product.sizes, min(len(product.sizes), self.rng.randint(1, 4)))
+                    } or {'One Size': self.rng.randint(1, 12)}
+                    quantity = sum(sizes.values())
+                    yield CartItem(
+                        cart_id=cart.pk, design_id=str(design_id), design_name=name, product_id=product_id,
+                        sizes=sizes, quantity=quantity,
+                        # CartItem.save() would price from the Product table; use the catalog tiers
+                        price=Decimal(str(max(
+                            (price for tier, price in product.price_tiers if tier <= quantity),
+                            default=product.base_price,
+                        ))).quantize(Decimal('0.01')),
+                    )
+
+        self.bulk_create(CartItem, rows(), 'cart items', keep=False)
+
+    def create_earnings(self, brand_ids, per_brand):
+        if not per_brand:
+            return
+        order_id = 100000
+
+        def rows():
+            nonlocal order_id
+            for brand_id in brand_ids:
+                for _ in range(per_brand):
+                    order_id += 1
+                    amount = Decimal(str(round(self.rng.uniform(20, 2500), 2)))
+                    rate = Decimal(self.rng.choice(('10.00', '12.50', '15.00')))
+                    status = self.rng.choice(PAYMENT_STATUSES)
+                    transaction_date = self.now - timedelta(minutes=self.rng.randrange(730 * 24 * 60))
+                    yield BrandEarnings(
+                        brand_id=brand_id, order_id=order_id, amount=amount, commission_rate=rate,
+                        # save() computes this, but bulk_create() doesn't call it
+                        commission_amount=(amount * rate / 100).quantize(Decimal('0.01')),
+                        payment_status=status, transaction_date=transaction_date,
+                        payment_date=transaction_date + timedelta(days=7) if status == 'paid' else None,
+                    )
+
+        self.bulk_create(BrandEarnings, rows(), 'earnings', keep=False)
@@ -0,0 +1,24 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = 'Mint a signed X-Profile-Token for profiling requests as a staff user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Staff user the profiles are recorded for')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(**{User.USERNAME_FIELD: options['username']})
+        except User.DoesNotExist:
+            raise CommandError(f"No user {options['username']!r}")
+        if not user.is_staff:
+            raise CommandError(f"{user} is not staff")
+
+        token = make_token(user)
+        self.stdout.write(token)
+        self.stdout.write(self.style.SUCCESS(f'curl -H "X-Profile-Token: {token}" https://.../designer/'))
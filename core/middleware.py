@@ -0,0 +1,214 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.utils.deprecation import MiddlewareMixin
+
+from brands.middleware import BrandMiddleware
+
+from . import profiling, slowlog
+from .querycount import QueryRecorder, budget_for, check_request
+from .routers import end_request, start_request
+from .staticfiles import serve_static
+from .telemetry import RequestMetrics, emit, should_sample
+
+PIN_COOKIE_NAME = 'db_primary_pin'
+
+
+class StaticAssetMiddleware(MiddlewareMixin):
+    """
+    Serve collected static files (settings.STATIC_SERVE, see
+    core.staticfiles) before the rest of the stack runs, so asset requests
+    never touch the session, brand lookup or database.
+    """
+
+    def process_request(self, request):
+        if not getattr(settings, 'STATIC_SERVE', False) or request.method not in ('GET', 'HEAD'):
+            return None
+        prefix = settings.STATIC_URL
+        if not prefix.startswith('/') or not request.path.startswith(prefix):
+            return None
+        return serve_static(request, request.path[len(prefix):])
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Route read-only views (settings.REPLICA_READ_VIEWS) to the read replica.
+    A client that writes is pinned to the primary for REPLICA_PIN_SECONDS so
+    its own saves are visible on the next page even if the replica lags.
+    """
+
+    def process_request(self, request):
+        pinned = PIN_COOKIE_NAME in request.COOKIES
+        request.db_routing = start_request(pinned=pinned)
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = getattr(request, 'db_routing', None)
+        if state is None or request.method not in ('GET', 'HEAD'):
+            return None
+
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        if view_name in getattr(settings, 'REPLICA_READ_VIEWS', ()):
+            state.use_replica = True
+        return None
+
+    def process_response(self, request, response):
+        state = getattr(request, 'db_routing', None)
+        if state is None:
+            return response
+
+        if state.wrote and getattr(settings, 'DATABASE_REPLICA_ALIAS', None):
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True,
+                samesite='Lax',
+            )
+
+        end_request()
+        return response
+
+
+class QueryCountMiddleware(MiddlewareMixin):
+    """
+    Development/test aid (settings.QUERY_COUNT_ENABLED): count each
+    request's queries, log repeated query shapes (likely N+1 loops) with the
+    stack that issued them, and check the view's @query_budget.
+    """
+
+    def process_request(self, request):
+        if getattr(settings, 'QUERY_COUNT_ENABLED', False):
+            request.query_recorder = QueryRecorder().start()
+        return None
+
+    def process_response(self, request, response):
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is None:
+            return response
+        recorder.stop()
+
+        response['X-Query-Count'] = str(len(recorder))
+        match = request.resolver_match
+        label = match.view_name if match else request.path
+        check_request(recorder, label, budget_for(match.func) if match else None)
+        return response
+
+
+class SlowQueryMiddleware(MiddlewareMixin):
+    """
+    Log queries slower than SLOW_QUERY_THRESHOLD_MS with the view, brand and
+    user type, and aggregate them for the admin (settings.SLOW_QUERY_ENABLED,
+    see core.slowlog).
+    """
+
+    def process_request(self, request):
+        if getattr(settings, 'SLOW_QUERY_ENABLED', False):
+            request.slow_queries = slowlog.SlowQueryRecorder().start()
+        return None
+
+    def process_response(self, request, response):
+        recorder = getattr(request, 'slow_queries', None)
+        if recorder is None:
+            return response
+        recorder.stop()
+        if not recorder.queries:
+            return response
+
+        # Attribution is only worked out (and request.user loaded) when needed
+        match = request.resolver_match
+        brand = getattr(request, 'brand', None)
+        slowlog.record_request(
+            recorder,
+            view_name=match.view_name if match else '',
+            brand_id=getattr(brand, 'pk', None),
+            kind=slowlog.user_type(getattr(request, 'user', None)),
+        )
+        return response
+
+
+class TelemetryMiddleware(MiddlewareMixin):
+    """
+    Sampled performance telemetry (settings.TELEMETRY_ENABLED, see
+    core.telemetry). Sampled requests get a Server-Timing header when
+    TELEMETRY_SERVER_TIMING is on and always emit a JSON record tagged with
+    brand, view and auth state. Runs outermost, so the tenant is read from
+    the host here rather than from request.brand.
+    """
+
+    def process_request(self, request):
+        if not getattr(settings, 'TELEMETRY_ENABLED', False):
+            return None
+        try:
+            subdomain = BrandMiddleware.extract_subdomain(request.get_host())
+        except DisallowedHost:
+            return None
+        if should_sample(subdomain):
+            request.telemetry = RequestMetrics().start()
+        return None
+
+    def process_response(self, request, response):
+        metrics = getattr(request, 'telemetry', None)
+        if metrics is None:
+            return response
+        metrics.stop()
+
+        if getattr(settings, 'TELEMETRY_SERVER_TIMING', False):
+            response['Server-Timing'] = metrics.server_timing()
+
+        match = request.resolver_match
+        brand = getattr(request, 'brand', None)
+        record = {
+            'ts': time.time(),
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'brand': getattr(request, 'subdomain', None) or 'default',
+            'brand_id': brand.pk if brand is not None else None,
+            'auth': self.auth_state(request),
+        }
+        record.update(metrics.as_record())
+        emit(record)
+        return response
+
+    def auth_state(self, request):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return 'anonymous'
+        return 'staff' if user.is_staff else 'user'
+
+
+class ProfilingMiddleware:
+    """
+    Run staff-requested requests under the sampling profiler (settings.
+    PROFILING_ENABLED, see core.profiling). Samples around get_response, so
+    the profile covers the view, process_template_response and template
+    rendering, and the middleware below it still runs as usual. Must be the
+    last middleware to leave the rest of the stack out of the profile.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            return self.get_response(request)
+        user = profiling.requested_by(request)
+        if user is None or not profiling.try_acquire():
+            return self.get_response(request)
+
+        try:
+            sampler = profiling.StackSampler(threading.get_ident()).start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+            profile = profiling.save_profile(request, response, user, sampler)
+        finally:
+            profiling.release()
+
+        response['X-Profile-Id'] = str(profile.pk)
+        return response
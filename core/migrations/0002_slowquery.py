@@ -0,0 +1,36 @@
+# Generated by Django 5.1.11 on 2026-10-19 00:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0007_earnings_rollups'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(max_length=40, unique=True)),
+                ('fingerprint', models.CharField(db_index=True, max_length=40)),
+                ('sql', models.TextField(help_text='Normalized SQL, literals replaced by ?')),
+                ('view_name', models.CharField(blank=True, max_length=200)),
+                ('user_type', models.CharField(choices=[('anonymous', 'Anonymous'), ('user', 'User'), ('brand_owner', 'Brand owner'), ('staff', 'Staff')], max_length=20)),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField(db_index=True)),
+                ('brand', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='brands.brand')),
+            ],
+            options={
+                'verbose_name_plural': 'Slow queries',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
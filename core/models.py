@@ -1,3 +1,75 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class RequestProfile(models.Model):
+    """A sampled profile of one staff-requested page load (core.profiling)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    brand = models.ForeignKey('brands.Brand', on_delete=models.SET_NULL, null=True, blank=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view_name = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    sample_count = models.PositiveIntegerField()
+    interval_ms = models.FloatField()
+    truncated = models.BooleanField(default=False, help_text="Sampling stopped at PROFILING_MAX_SECONDS")
+    folded_stacks = models.TextField(help_text="Folded stacks for flamegraph.pl / speedscope")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    @classmethod
+    def prune(cls, keep):
+        """Delete all but the newest `keep` profiles"""
+        stale = cls.objects.order_by('-created_at', '-pk').values_list('pk', flat=True)[keep:]
+        cls.objects.filter(pk__in=list(stale)).delete()
+
+    def top_frames(self, limit=15):
+        """[(frame, samples)] for the leaf frames with the most samples"""
+        counts = {}
+        for line in self.folded_stacks.splitlines():
+            stack, _, count = line.rpartition(' ')
+            leaf = stack.rsplit(';', 1)[-1]
+            counts[leaf] = counts.get(leaf, 0) + int(count)
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+class SlowQuery(models.Model):
+    """
+    Rolling aggregate of slow queries (core.slowlog) for one SQL fingerprint,
+    view, brand and user type.
+    """
+    USER_TYPES = [
+        ('anonymous', 'Anonymous'),
+        ('user', 'User'),
+        ('brand_owner', 'Brand owner'),
+        ('staff', 'Staff'),
+    ]
+
+    bucket = models.CharField(max_length=40, unique=True)
+    fingerprint = models.CharField(max_length=40, db_index=True)
+    sql = models.TextField(help_text="Normalized SQL, literals replaced by ?")
+    view_name = models.CharField(max_length=200, blank=True)
+    brand = models.ForeignKey('brands.Brand', on_delete=models.CASCADE, null=True, blank=True)
+    user_type = models.CharField(max_length=20, choices=USER_TYPES)
+    calls = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-total_ms']
+        verbose_name_plural = 'Slow queries'
+
+    def __str__(self):
+        return f"{self.sql[:80]} ({self.calls}x)"
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0
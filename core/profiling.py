@@ -0,0 +1,183 @@
+"""
+On-demand sampling profiler for staff requests
+
+Off unless settings.PROFILING_ENABLED. A request is profiled when a staff
+user asks for it, either from a logged-in session with ?_profile=1 or with
+an X-Profile-Token header minted by `manage.py profile_token` (signed,
+expires after PROFILING_TOKEN_MAX_AGE seconds, so curl and load tools can
+use it without a session).
+
+core.middleware.ProfilingMiddleware runs the rest of the request (the
+view and the rendering of a lazy TemplateResponse) under a StackSampler.
+Context processors (brand_context, guest_data_context, ...) and template
+rendering therefore show up in the profile. The sampler is a background
+thread that reads the request thread's stack every PROFILING_INTERVAL_MS
+and counts identical stacks, so the result is in the folded "a;b;c count"
+format that flamegraph.pl and speedscope read. It is saved as a
+RequestProfile, which can be downloaded from the admin.
+
+Overhead is hard-capped:
+ - only one request per process is profiled at a time,
+ - sampling stops after PROFILING_MAX_SECONDS,
+ - the interval backs off whenever the time spent taking samples would
+   exceed PROFILING_MAX_OVERHEAD of the wall time.
+"""
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+
+TOKEN_HEADER = 'HTTP_X_PROFILE_TOKEN'
+QUERY_FLAG = '_profile'
+TOKEN_SALT = 'core.profiling'
+
+_profile_lock = threading.Lock()
+
+
+def make_token(user):
+    """A signed profiling token for a staff user"""
+    return signing.dumps({'user': user.pk}, salt=TOKEN_SALT)
+
+
+def token_user(token):
+    """The active staff user a token was minted for, or None"""
+    max_age = getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+    User = get_user_model()
+    return User.objects.filter(pk=payload.get('user'), is_staff=True, is_active=True).first()
+
+
+def requested_by(request):
+    """The staff user asking for this request to be profiled, or None"""
+    token = request.META.get(TOKEN_HEADER)
+    if token:
+        return token_user(token)
+    if request.GET.get(QUERY_FLAG) == '1':
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated and user.is_staff:
+            return user
+    return None
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    for root in (str(settings.BASE_DIR), 'site-packages', 'dist-packages', sysconfig.get_paths()['stdlib']):
+        index = filename.find(root)
+        if index != -1:
+            filename = filename[index + len(root):].lstrip('/')
+            break
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """Samples one thread's stack from a background thread"""
+
+    def __init__(self, thread_id, interval=None, max_seconds=None, max_overhead=None):
+        self.thread_id = thread_id
+        self.interval = (interval if interval is not None
+                         else getattr(settings, 'PROFILING_INTERVAL_MS', 5) / 1000)
+        self.max_seconds = (max_seconds if max_seconds is not None
+                            else getattr(settings, 'PROFILING_MAX_SECONDS', 30))
+        self.max_overhead = (max_overhead if max_overhead is not None
+                             else getattr(settings, 'PROFILING_MAX_OVERHEAD', 0.05))
+        # The interval in use; grows as sampling backs off
+        self.current_interval = self.interval
+        self.stacks = Counter()
+        self.truncated = False
+        self.sampling_time = 0.0
+        self.duration = 0.0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started
+        return self
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.current_interval):
+            elapsed = time.perf_counter() - self.started
+            if elapsed > self.max_seconds:
+                self.truncated = True
+                return
+            sample_started = time.perf_counter()
+            self._sample()
+            self.sampling_time += time.perf_counter() - sample_started
+            # Back off so sampling stays under max_overhead of the wall time
+            if self.sampling_time > self.max_overhead * elapsed:
+                self.current_interval = min(self.current_interval * 2, 1.0)
+
+    def folded(self):
+        """Stacks in the folded format read by flamegraph.pl and speedscope"""
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+
+
+def try_acquire():
+    """Claim the per-process profiling slot; False while another profile runs"""
+    return _profile_lock.acquire(blocking=False)
+
+
+def release():
+    _profile_lock.release()
+
+
+def save_profile(request, response, user, sampler):
+    from .models import RequestProfile
+
+    match = request.resolver_match
+    brand = getattr(request, 'brand', None)
+    profile = RequestProfile.objects.create(
+        user=user,
+        brand=brand if getattr(brand, 'pk', None) else None,
+        method=request.method,
+        path=request.get_full_path()[:500],
+        view_name=(match.view_name if match else '')[:200],
+        status_code=response.status_code,
+        duration_ms=round(sampler.duration * 1000, 2),
+        sample_count=sampler.sample_count,
+        interval_ms=round(sampler.current_interval * 1000, 2),
+        truncated=sampler.truncated,
+        folded_stacks=sampler.folded(),
+    )
+    RequestProfile.prune(getattr(settings, 'PROFILING_KEEP', 200))
+    return profile
+
+
+def profile_filename(profile):
+    return f'profile-{profile.pk}-{profile.created_at:%Y%m%d-%H%M%S}.folded'
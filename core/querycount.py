@@ -0,0 +1,167 @@
+"""
+Per-request query counting, N+1 detection and view query budgets
+
+QueryRecorder is a database execute_wrapper installed on every connection
+for the length of a request (core.middleware.QueryCountMiddleware). It
+records each query's shape (the SQL with its placeholders, IN lists
+collapsed) and where in the project it was issued. The same shape running
+QUERY_DUPLICATE_THRESHOLD or more times in one request is almost always a
+loop doing one query per row, and is logged with the stack that issued it.
+
+Views declare how many queries they may issue with @query_budget(n). A view
+that goes over budget is logged, or raises QueryBudgetExceeded when
+QUERY_BUDGET_STRICT is on (as in the test suite), so a view that starts
+issuing O(N) queries fails CI instead of shipping.
+"""
+import logging
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# "IN (%s, %s, %s)" -> "IN (...)" so batches of different sizes share a shape
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+# Stack frames from these paths are noise when locating the query
+_IGNORED_PATHS = ('site-packages', 'dist-packages', '/django/', __file__)
+
+_budgets = {}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view issued more queries than its declared budget"""
+
+
+def query_budget(max_queries):
+    """
+    Declare the most queries a view (function or class-based) may issue in
+    one request, middleware and template rendering included.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        _budgets[f'{view.__module__}.{view.__qualname__}'] = max_queries
+        return view
+    return decorator
+
+
+def registered_budgets():
+    """{dotted view path: budget} for every view declaring one"""
+    return dict(_budgets)
+
+
+def budget_for(view_func):
+    """The budget declared on a resolved view, or None"""
+    view = getattr(view_func, 'view_class', view_func)
+    return getattr(view, 'query_budget', None)
+
+
+def query_shape(sql):
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _project_stack(limit=8):
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if not any(part in frame.filename for part in _IGNORED_PATHS)
+    ]
+    return ''.join(traceback.format_list(frames[-limit:]))
+
+
+@dataclass
+class RecordedQuery:
+    alias: str
+    sql: str
+    shape: str
+    duration: float
+    stack: str
+
+
+class QueryRecorder:
+    """execute_wrapper recording every query on every database alias"""
+
+    def __init__(self, capture_stacks=True):
+        self.capture_stacks = capture_stacks
+        self.queries = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(RecordedQuery(
+                alias=context['connection'].alias,
+                sql=sql,
+                shape=query_shape(sql),
+                duration=time.perf_counter() - started,
+                stack=_project_stack() if self.capture_stacks else '',
+            ))
+
+    def __len__(self):
+        return len(self.queries)
+
+    def start(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def stop(self):
+        if self._stack is not None:
+            self._stack.close()
+            self._stack = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def duration(self):
+        return sum(query.duration for query in self.queries)
+
+    def duplicates(self, threshold=None):
+        """[(shape, count, first RecordedQuery)] for shapes repeated threshold+ times"""
+        if threshold is None:
+            threshold = getattr(settings, 'QUERY_DUPLICATE_THRESHOLD', 3)
+        counts = Counter(query.shape for query in self.queries)
+        first = {}
+        for query in self.queries:
+            first.setdefault(query.shape, query)
+        return [
+            (shape, count, first[shape])
+            for shape, count in counts.most_common()
+            if count >= threshold
+        ]
+
+
+def check_request(recorder, label, budget=None):
+    """
+    Log repeated query shapes and enforce the budget for one request.
+    Returns the problems found (empty when the request is clean).
+    """
+    problems = []
+    for shape, count, query in recorder.duplicates():
+        problems.append(f'{label}: {count}x {shape}')
+        logger.warning(
+            "Possible N+1 in %s: %d queries with the same shape\n  %s\nFirst issued at:\n%s",
+            label, count, shape, query.stack,
+        )
+
+    if budget is not None and len(recorder) > budget:
+        message = f'{label} issued {len(recorder)} queries (budget {budget})'
+        problems.append(message)
+        repeated = ''.join(f'\n  {count}x {shape}' for shape, count, _ in recorder.duplicates(2))
+        message += repeated
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+    return problems
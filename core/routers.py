@@ -0,0 +1,69 @@
+"""
+Primary/replica database routing
+
+Writes always go to the primary ('default'). Reads go to the replica only
+while a request for a read-only view is being served (see
+core.middleware.ReplicaRoutingMiddleware), and fall back to the primary once
+the request has written anything, inside transactions, or while the client
+is pinned to the primary after a recent write of its own.
+"""
+import contextvars
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class RoutingState:
+    """Per-request routing flags"""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.use_replica = False
+        self.wrote = False
+
+
+_routing_state = contextvars.ContextVar('db_routing_state', default=None)
+
+
+def start_request(pinned=False):
+    """Begin routing for a request"""
+    state = RoutingState(pinned=pinned)
+    _routing_state.set(state)
+    return state
+
+
+def end_request():
+    _routing_state.set(None)
+
+
+def get_routing_state():
+    return _routing_state.get()
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replica = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+        state = _routing_state.get()
+        if not replica or state is None:
+            return None
+
+        if (
+            state.use_replica
+            and not state.pinned
+            and not state.wrote
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            # Read-your-writes: everything after this in the request uses the primary
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so objects from either may relate
+        return True
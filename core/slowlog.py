@@ -0,0 +1,166 @@
+"""
+Slow-query log with view, brand and user attribution
+
+core.middleware.SlowQueryMiddleware records every query slower than
+SLOW_QUERY_THRESHOLD_MS during a request (a SlowQueryRecorder on all
+connections). When the response goes out, each slow query is logged with
+its SQL fingerprint, the view, the brand and the kind of user. The query is
+also added to a per-process buffer keyed by
+(fingerprint, view, brand, user type).
+
+The buffer is registered with core.counters, so the counter flusher thread
+(and the shutdown hook) writes it back in batches as SlowQuery rows. Each
+row holds calls, total and max time. Rows not seen for SLOW_QUERY_WINDOW_HOURS
+are pruned on flush, so the admin's top-N by total time is a rolling
+picture of where database time goes. That is what index decisions are
+based on.
+"""
+import hashlib
+import logging
+import re
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import counters
+from .querycount import QueryRecorder, RecordedQuery, query_shape
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """SQL with parameters and literals replaced by ?, so equivalent queries match"""
+    sql = query_shape(sql).replace('%s', '?')
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+def user_type(user):
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    if user.is_staff:
+        return 'staff'
+    if getattr(user, 'is_brand_owner', False):
+        return 'brand_owner'
+    return 'user'
+
+
+class SlowQueryRecorder(QueryRecorder):
+    """QueryRecorder that keeps only queries at or above the threshold"""
+
+    def __init__(self, threshold_ms=None):
+        super().__init__(capture_stacks=False)
+        if threshold_ms is None:
+            threshold_ms = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100)
+        self.threshold = threshold_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            if duration >= self.threshold:
+                self.queries.append(RecordedQuery(
+                    alias=context['connection'].alias,
+                    sql=sql,
+                    shape=normalize_sql(sql),
+                    duration=duration,
+                    stack='',
+                ))
+
+
+class SlowQueryBuffer(counters.BufferedCounter):
+    """
+    Per-process aggregate of slow queries: a write-behind counter whose
+    values are {'sql', 'calls', 'total_ms', 'max_ms'} instead of integers.
+    """
+
+    def __init__(self):
+        super().__init__('slow_queries', write_batch)
+
+    def combine(self, pending, key, amount):
+        entry = pending.get(key)
+        if entry is None:
+            pending[key] = dict(amount)
+            return
+        entry['calls'] += amount['calls']
+        entry['total_ms'] += amount['total_ms']
+        entry['max_ms'] = max(entry['max_ms'], amount['max_ms'])
+
+    def size(self, amount):
+        return amount['calls']
+
+    def add(self, sql, view_name, brand_id, kind, duration_ms):
+        key = (fingerprint(sql), view_name, brand_id, kind)
+        self.increment(key, {'sql': sql, 'calls': 1, 'total_ms': duration_ms, 'max_ms': duration_ms})
+
+
+def bucket_key(digest, view_name, brand_id, kind):
+    return hashlib.sha1(f'{digest}|{view_name}|{brand_id}|{kind}'.encode()).hexdigest()
+
+
+def write_batch(batch):
+    """Fold a {(fingerprint, view, brand_id, user type): totals} batch into SlowQuery rows"""
+    from .models import SlowQuery
+
+    now = timezone.now()
+    with transaction.atomic():
+        SlowQuery.objects.bulk_create(
+            [
+                SlowQuery(
+                    bucket=bucket_key(*key), fingerprint=key[0], view_name=key[1][:200],
+                    brand_id=key[2], user_type=key[3], sql=entry['sql'],
+                    first_seen=now, last_seen=now,
+                )
+                for key, entry in batch.items()
+            ],
+            ignore_conflicts=True,
+        )
+        # One UPDATE per bucket, with F() so concurrent workers don't lose calls
+        for key, entry in batch.items():
+            SlowQuery.objects.filter(bucket=bucket_key(*key)).update(
+                calls=F('calls') + entry['calls'],
+                total_ms=F('total_ms') + entry['total_ms'],
+                max_ms=Greatest(F('max_ms'), entry['max_ms']),
+                last_seen=now,
+            )
+
+        window = getattr(settings, 'SLOW_QUERY_WINDOW_HOURS', 168)
+        SlowQuery.objects.filter(last_seen__lt=now - timedelta(hours=window)).delete()
+
+
+buffer = SlowQueryBuffer()
+
+
+def record_request(recorder, view_name, brand_id, kind):
+    """Log and buffer the slow queries of one finished request"""
+    for query in recorder.queries:
+        duration_ms = query.duration * 1000
+        logger.warning(
+            "Slow query (%.1f ms) [%s] view=%s brand=%s user=%s: %s",
+            duration_ms, fingerprint(query.shape)[:12], view_name, brand_id, kind, query.shape,
+        )
+        buffer.add(query.shape, view_name, brand_id, kind, duration_ms)
+
+
+def top_queries(limit=None):
+    from .models import SlowQuery
+
+    if limit is None:
+        limit = getattr(settings, 'SLOW_QUERY_TOP_N', 10)
+    return SlowQuery.objects.select_related('brand').order_by('-total_ms')[:limit]
@@ -18,6 +18,12 @@ let raycaster, mouse;
 let textCanvas = null;
 let fadeCanvas = null;
 
+// Font of new text decals
+const DEFAULT_TEXT_FONT = "Roboto";
+
+// Web font loads by family, so each family is fetched once
+const fontLoads = new Map();
+
 // State management with Alpine stores
 document.addEventListener("alpine:init", () => {
   // Main designer store - central state management
@@ -266,10 +272,11 @@ document.addEventListener("alpine:init", () => {
       }
 
       // Load and apply the bumpmap texture
-      debugLog(`Loading bumpmap for layer ${layer.name}:`, bumpmap.link);
+      const url = this.bumpmapUrl(bumpmap);
+      debugLog(`Loading bumpmap for layer ${layer.name}:`, url);
 
       textureLoader.load(
-        bumpmap.link,
+        url,
         (texture) => {
           // Configure texture
           texture.wrapS = THREE.RepeatWrapping;
@@ -305,11 +312,24 @@ document.addEventListener("alpine:init", () => {
         },
         undefined,
         (error) => {
-          debugError("Error loading bumpmap texture:", bumpmap.link, error);
+          debugError("Error loading bumpmap texture:", url, error);
         }
       );
     },
 
+    // Pick the bumpmap file to load: the largest prebuilt WebP level that
+    // fits the screen density and the GPU, or the original PNG if the
+    // variants haven't been built (manage.py build_texture_variants)
+    bumpmapUrl(bumpmap) {
+      const levels = bumpmap.variants?.webp;
+      if (!levels?.length) return bumpmap.link;
+
+      const target = (window.devicePixelRatio || 1) > 1 ? 2048 : 1024;
+      const limit = Math.min(target, renderer?.capabilities?.maxTextureSize || target);
+      const level = levels.find((l) => Math.max(l.width, l.height) <= limit);
+      return (level || levels[levels.length - 1]).url;
+    },
+
     // Generate unique ID for decals
     generateId() {
       return (
@@ -381,7 +401,7 @@ document.addEventListener("alpine:init", () => {
 
       // Default text values
       const text = "Sample Text";
-      const font = "Roboto";
+      const font = DEFAULT_TEXT_FONT;
       const color = "#000000";
       const letterSpacing = 0;
       const borderWidth = 0;
@@ -898,7 +918,21 @@ document.addEventListener("alpine:init", () => {
         decal.textData[property] = value;
       }
       
-      // Recreate the text texture with new properties
+      this.redrawTextDecal(decal);
+
+      // A newly picked font is drawn again once its file is in
+      if (property === 'font') {
+        const layerId = this.currentLayer;
+        this.loadFont(value).then(() => {
+          if (decal.font === value) this.redrawTextDecal(decal, layerId);
+        });
+      }
+      
+      debugLog(`Updated text decal ${property}:`, value);
+    },
+
+    // Recreate a text decal's texture from its properties
+    redrawTextDecal(decal, layerId = null) {
       const newTexture = this.createTextTexture(
         decal.text,
         decal.font,
@@ -914,9 +948,7 @@ document.addEventListener("alpine:init", () => {
       }
       
       decal.texture = newTexture;
-      this.renderLayer();
-      
-      debugLog(`Updated text decal ${property}:`, value);
+      this.renderLayer(layerId);
     },
 
     updateFadeProperty(property, value) {
@@ -1593,9 +1625,11 @@ document.addEventListener("alpine:init", () => {
     },
 
     loadEnvironmentMap() {
-      debugLog("Starting environment map load from /static/neutral.hdr");
+      // The page preloads this exact URL (hashed when the static pipeline is on)
+      const environmentMapUrl = window.phpData?.environmentMap || "/static/neutral.hdr";
+      debugLog("Starting environment map load from", environmentMapUrl);
       rgbeLoader.load(
-        "/static/neutral.hdr",
+        environmentMapUrl,
         (texture) => {
           debugLog("Environment map texture loaded, processing...", texture);
           texture.mapping = THREE.EquirectangularReflectionMapping;
@@ -1617,7 +1651,7 @@ document.addEventListener("alpine:init", () => {
         },
         (error) => {
           debugError("Error loading environment map:", error);
-          debugError("Environment map path: /static/neutral.hdr");
+          debugError("Environment map path:", environmentMapUrl);
           // Continue without environment map
         }
       );
@@ -1650,12 +1684,14 @@ document.addEventListener("alpine:init", () => {
         return;
       }
 
-      debugLog("Starting model load from:", this.product.modelLink);
+      // The optimize_models output when it has been built, else the original
+      const modelUrl = this.product.optimizedModel?.url || this.product.modelLink;
+      debugLog("Starting model load from:", modelUrl);
 
       try {
         const gltf = await new Promise((resolve, reject) => {
           gltfLoader.load(
-            this.product.modelLink,
+            modelUrl,
             (loadedGltf) => {
               debugLog("GLTF loaded successfully:", loadedGltf);
               resolve(loadedGltf);
@@ -1803,41 +1839,43 @@ document.addEventListener("alpine:init", () => {
       debugLog("Rendered all layers with canAddImages");
     },
 
-    async loadFonts() {
-      try {
-        if (!window.phpData?.fonts) {
-          debugLog("No fonts to load");
-          this.setLoadingState("fonts", true);
-          return;
+    // Families used by text decals: the saved design's and the default
+    fontsInUse() {
+      const fonts = new Set([DEFAULT_TEXT_FONT]);
+      const collect = (value) => {
+        if (Array.isArray(value)) {
+          value.forEach(collect);
+        } else if (value && typeof value === "object") {
+          if (value.type === "text" && typeof value.font === "string") fonts.add(value.font);
+          Object.values(value).forEach(collect);
         }
+      };
+      collect(window.phpData?.designData?.design_data);
+      Object.values(this.layers).forEach((layer) => collect(layer.decals || []));
+      return [...fonts];
+    },
+
+    // Canvas text doesn't wait for web fonts, so load a family before drawing with it
+    loadFont(font) {
+      if (!fontLoads.has(font)) {
+        const load = Promise.all(
+          [400, 700].map((weight) => document.fonts.load(`${weight} 16px "${font}"`))
+        ).catch(() => {
+          debugWarn(`Failed to load font ${font}`);
+        });
+        fontLoads.set(font, load);
+      }
+      return fontLoads.get(font);
+    },
 
-        debugLog("🔤 Loading fonts:", window.phpData.fonts);
-
-        // Wait for document fonts to be ready first
-        await document.fonts.ready;
-        debugLog("✅ Document fonts ready");
-
-        // Load each font family with multiple weights and sizes for caching
-        const fontPromises = [];
-        for (const font of window.phpData.fonts) {
-          const sizes = [16, 24, 48, 72, 96, 144, 200];
-          const weights = [400, 700];
-          
-          for (const size of sizes) {
-            for (const weight of weights) {
-              fontPromises.push(
-                document.fonts.load(`${weight} ${size}px "${font}"`).catch(() => {
-                  debugWarn(`Failed to load ${font} ${weight} ${size}px`);
-                })
-              );
-            }
-          }
-        }
+    async loadFonts() {
+      try {
+        // Only the fonts the design uses; the rest load when picked
+        const fonts = this.fontsInUse().filter((font) => (window.phpData?.fonts || []).includes(font));
+        debugLog("🔤 Loading fonts in use:", fonts);
+        await Promise.all(fonts.map((font) => this.loadFont(font)));
+        debugLog(`✅ Fonts loaded: ${fonts.length} of ${(window.phpData?.fonts || []).length} families`);
 
-        // Wait for all font variants to load
-        await Promise.all(fontPromises);
-        debugLog(`✅ All fonts loaded successfully: ${window.phpData.fonts.length} families`);
-        
         this.setLoadingState("fonts", true);
       } catch (error) {
         debugError("Font loading failed:", error);
@@ -2330,6 +2368,8 @@ document.addEventListener("alpine:init", () => {
     async loadImages() {
       this.isLoading = true;
       try {
+        // One request for the whole list: the category counts and search
+        // work on all of it. Every open fetches again, so new uploads show up.
         const response = await fetch("/designer/images/");
         const data = await response.json();
         this.images = data.images || [];
@@ -0,0 +1,185 @@
+"""
+Content-hashed, precompressed static assets
+
+CompressedManifestStaticFilesStorage is the STATIC_PIPELINE storage. On
+collectstatic it writes content-hashed copies of every file (designer.css ->
+designer.3f2a9c1b7e4d.css, with the references inside CSS rewritten) plus a
+manifest that {% static %} resolves names through. It then writes .gz and,
+when the Brotli package is installed, .br variants of every compressible
+file next to both the hashed and the plain copy. Compression is done once
+per deploy, at the highest levels, instead of per response.
+
+serve_static() serves STATIC_ROOT for core.middleware.StaticAssetMiddleware.
+It picks the smallest variant the client accepts (br, then gzip, then the
+file itself) and marks hashed files public and immutable for a year. A
+changed file gets a new name, so repeat visits never re-download or
+revalidate unchanged JS/CSS. Unhashed paths (the catalog's
+/static/models/... links) are served with Last-Modified and a short
+max-age instead.
+"""
+import gzip
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz variants are written
+    brotli = None
+
+ONE_YEAR = 60 * 60 * 24 * 365
+
+# Formats that are already compressed; recompressing them gains nothing
+SKIP_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico', '.woff', '.woff2',
+    '.ktx2', '.basis', '.zip', '.gz', '.br', '.mp4', '.webm',
+}
+
+# Keep a variant only if it saves at least this much
+MIN_SAVING = 0.05
+
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+for content_type, extension in [
+    ('model/gltf-binary', '.glb'),
+    ('model/gltf+json', '.gltf'),
+    ('image/vnd.radiance', '.hdr'),
+    ('image/ktx2', '.ktx2'),
+    ('image/webp', '.webp'),
+    ('font/woff2', '.woff2'),
+]:
+    mimetypes.add_type(content_type, extension)
+
+
+def _without_sourcemaps(patterns):
+    # The vendored bootstrap bundles point at .map files we don't ship, which
+    # would make post-processing fail
+    return tuple(
+        (extension, tuple(
+            pattern for pattern in extension_patterns
+            if 'sourceMappingURL' not in (pattern if isinstance(pattern, str) else pattern[0])
+        ))
+        for extension, extension_patterns in patterns
+    )
+
+
+def compress(data):
+    """{encoding suffix: bytes} for the variants worth keeping"""
+    variants = {}
+    limit = len(data) * (1 - MIN_SAVING)
+    gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gzipped) < limit:
+        variants['.gz'] = gzipped
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        if len(compressed) < limit:
+            variants['.br'] = compressed
+    return variants
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes .gz/.br variants"""
+
+    patterns = _without_sourcemaps(ManifestStaticFilesStorage.patterns)
+
+    def post_process(self, paths, dry_run=False, **options):
+        collected = set(paths)
+        for name, hashed_name, processed in super().post_process(paths, dry_run=dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                collected.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        # zlib and brotli release the GIL, so threads compress in parallel
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+            list(pool.map(self.write_variants, sorted(collected)))
+
+    def write_variants(self, name):
+        if os.path.splitext(name)[1].lower() in SKIP_EXTENSIONS:
+            return
+        min_size = getattr(settings, 'STATIC_COMPRESS_MIN_SIZE', 512)
+        if not self.exists(name) or self.size(name) < min_size:
+            return
+        with self.open(name) as source:
+            data = source.read()
+        for suffix in ('.gz', '.br'):
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+        for suffix, content in compress(data).items():
+            self._save(name + suffix, ContentFile(content))
+
+
+def parse_accept_encoding(header):
+    """The encodings a client accepts (q > 0)"""
+    accepted = set()
+    for item in header.split(','):
+        encoding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if encoding and quality > 0:
+            accepted.add(encoding.strip().lower())
+    return accepted
+
+
+@lru_cache(maxsize=1)
+def hashed_names():
+    """Every content-hashed name in the staticfiles manifest"""
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def serve_static(request, path):
+    """
+    Response for a file under STATIC_ROOT, or None to let the request
+    through (unknown file, or no STATIC_ROOT).
+    """
+    root = settings.STATIC_ROOT
+    try:
+        full_path = safe_join(root, path)
+    except SuspiciousFileOperation:
+        return None
+    if not os.path.isfile(full_path):
+        return None
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/javascript', 'text/javascript'):
+        content_type += '; charset=utf-8'
+
+    accepted = parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    serve_path, encoding = full_path, None
+    for candidate, suffix in ENCODINGS:
+        if candidate in accepted and os.path.isfile(full_path + suffix):
+            serve_path, encoding = full_path + suffix, candidate
+            break
+
+    stat = os.stat(serve_path)
+    immutable = path in hashed_names()
+    if not immutable and not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    response = FileResponse(open(serve_path, 'rb'), content_type=content_type,
+                            filename=os.path.basename(path))
+    response['Vary'] = 'Accept-Encoding'
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if immutable:
+        response['Cache-Control'] = f'public, max-age={ONE_YEAR}, immutable'
+    else:
+        response['Cache-Control'] = f"public, max-age={getattr(settings, 'STATIC_UNHASHED_MAX_AGE', 300)}"
+    return response
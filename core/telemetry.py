@@ -0,0 +1,222 @@
+"""
+Sampled per-request performance telemetry
+
+A sampled request (TELEMETRY_SAMPLE_RATE, or a per-tenant rate from
+TELEMETRY_BRAND_SAMPLE_RATES keyed by subdomain) gets a RequestMetrics
+bound to a context variable for its lifetime. Database time comes from a
+core.querycount.QueryRecorder; template rendering, storage calls and cache
+lookups are measured by wrappers that install() puts on the configured
+template, storage and cache backend classes once at startup. The wrappers
+only do work while a sampled request is running, and nested calls (a
+storage method calling another, get_many calling get) are counted once.
+
+core.middleware.TelemetryMiddleware turns the metrics into a Server-Timing
+header (TELEMETRY_SERVER_TIMING) and a JSON record on the
+core.telemetry.requests logger, which TELEMETRY_LOG_PATH points at a local
+JSON lines file. Records are tagged with the brand, view and auth state so
+one tenant can be profiled in production without an external APM.
+"""
+import functools
+import json
+import logging
+import logging.handlers
+import random
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .querycount import QueryRecorder
+
+record_logger = logging.getLogger('core.telemetry.requests')
+
+_current = ContextVar('request_telemetry', default=None)
+_MISSING = object()
+
+# Calls that reach the backing store; url() is usually just string building
+STORAGE_METHODS = ('_open', '_save', 'delete', 'exists', 'listdir', 'size')
+
+
+class RequestMetrics:
+    """Timings gathered for one sampled request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = QueryRecorder(capture_stacks=False)
+        self.times = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._depth = defaultdict(int)
+        self._token = None
+
+    def start(self):
+        self.queries.start()
+        self._token = _current.set(self)
+        return self
+
+    def stop(self):
+        self.queries.stop()
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        self.duration = time.perf_counter() - self.started
+        return self
+
+    def server_timing(self):
+        """Server-Timing header value (durations in milliseconds)"""
+        entries = [
+            f'db;dur={self.queries.duration * 1000:.1f};desc="{len(self.queries)} queries"',
+            f'tpl;dur={self.times["template"] * 1000:.1f};desc="{self.counts["template"]} renders"',
+            f'storage;dur={self.times["storage"] * 1000:.1f};desc="{self.counts["storage"]} calls"',
+            f'cache;dur={self.times["cache"] * 1000:.1f};'
+            f'desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'total;dur={self.duration * 1000:.1f}',
+        ]
+        return ', '.join(entries)
+
+    def as_record(self):
+        return {
+            'duration_ms': round(self.duration * 1000, 2),
+            'db_ms': round(self.queries.duration * 1000, 2),
+            'queries': len(self.queries),
+            'template_ms': round(self.times['template'] * 1000, 2),
+            'template_renders': self.counts['template'],
+            'storage_ms': round(self.times['storage'] * 1000, 2),
+            'storage_calls': self.counts['storage'],
+            'cache_ms': round(self.times['cache'] * 1000, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+def sample_rate_for(subdomain):
+    """The sampling rate for a tenant (subdomain None is the default brand)"""
+    rates = getattr(settings, 'TELEMETRY_BRAND_SAMPLE_RATES', {})
+    return rates.get(subdomain or 'default', getattr(settings, 'TELEMETRY_SAMPLE_RATE', 0.0))
+
+
+def should_sample(subdomain):
+    rate = sample_rate_for(subdomain)
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def emit(record):
+    record_logger.info(json.dumps(record, default=str, separators=(',', ':')))
+
+
+# -- backend instrumentation -------------------------------------------------
+
+def _timed(func, kind):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        if metrics is None or metrics._depth[kind]:
+            return func(*args, **kwargs)
+        metrics._depth[kind] += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics._depth[kind] -= 1
+            metrics.times[kind] += time.perf_counter() - started
+            metrics.counts[kind] += 1
+    wrapper._telemetry = True
+    return wrapper
+
+
+def _counted_get(func):
+    @functools.wraps(func)
+    def get(self, key, default=None, version=None):
+        metrics = _current.get()
+        if metrics is None or metrics._depth['cache']:
+            return func(self, key, default, version)
+        started = time.perf_counter()
+        value = func(self, key, _MISSING, version)
+        metrics.times['cache'] += time.perf_counter() - started
+        if value is _MISSING:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+    get._telemetry = True
+    return get
+
+
+def _counted_get_many(func):
+    @functools.wraps(func)
+    def get_many(self, keys, version=None):
+        metrics = _current.get()
+        if metrics is None or metrics._depth['cache']:
+            return func(self, keys, version)
+        keys = list(keys)
+        metrics._depth['cache'] += 1
+        started = time.perf_counter()
+        try:
+            found = func(self, keys, version)
+        finally:
+            metrics._depth['cache'] -= 1
+            metrics.times['cache'] += time.perf_counter() - started
+        metrics.cache_hits += len(found)
+        metrics.cache_misses += len(keys) - len(found)
+        return found
+    get_many._telemetry = True
+    return get_many
+
+
+def _wrap(cls, name, wrapper_factory):
+    method = getattr(cls, name, None)
+    if method is None or getattr(method, '_telemetry', False):
+        return
+    setattr(cls, name, wrapper_factory(method))
+
+
+def _backend_classes(dotted_paths):
+    classes = set()
+    for path in dotted_paths:
+        if not path:
+            continue
+        try:
+            classes.add(import_string(path))
+        except ImportError:
+            continue
+    return classes
+
+
+def _configure_sink():
+    path = getattr(settings, 'TELEMETRY_LOG_PATH', '')
+    if not path or record_logger.handlers:
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.handlers.WatchedFileHandler(path)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    record_logger.addHandler(handler)
+    record_logger.setLevel(logging.INFO)
+    record_logger.propagate = False
+
+
+def install():
+    """Instrument the configured backends (idempotent). Called from CoreConfig.ready()."""
+    from django.template.backends.django import Template
+
+    _wrap(Template, 'render', lambda method: _timed(method, 'template'))
+
+    storage_paths = [
+        config.get('BACKEND') for alias, config in settings.STORAGES.items() if alias != 'staticfiles'
+    ]
+    storage_paths += [
+        getattr(settings, 'IMAGEKIT_DEFAULT_FILE_STORAGE', None),
+        getattr(settings, 'IMAGEKIT_SPEC_CACHEFILE_STORAGE', None),
+    ]
+    for cls in _backend_classes(storage_paths):
+        for name in STORAGE_METHODS:
+            _wrap(cls, name, lambda method: _timed(method, 'storage'))
+
+    for cls in _backend_classes(config.get('BACKEND') for config in settings.CACHES.values()):
+        _wrap(cls, 'get', _counted_get)
+        _wrap(cls, 'get_many', _counted_get_many)
+
+    _configure_sink()
@@ -0,0 +1,11 @@
+from django import template
+
+from core.slowlog import top_queries
+
+register = template.Library()
+
+
+@register.simple_tag
+def top_slow_queries():
+    """The SLOW_QUERY_TOP_N slow-query buckets by total time (core.slowlog)"""
+    return list(top_queries())
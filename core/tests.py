@@ -1,3 +1,488 @@
-from django.test import TestCase
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.template import engines
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from brands.models import (
+    Brand, BrandEarnings, BrandImage, BrandImageCategory, BrandOwner, BrandTemplate, flush_template_usage, template_usage,
+)
+from cart.models import Cart, CartItem
+from core.counters import BufferedCounter, unregister
+from core.middleware import PIN_COOKIE_NAME
+from core.models import RequestProfile, SlowQuery
+from core.profiling import StackSampler
+from core.slowlog import SlowQueryBuffer
+from core.staticfiles import CompressedManifestStaticFilesStorage, brotli, serve_static
+from core import telemetry
+from core.querycount import QueryBudgetExceeded, QueryRecorder, check_request, registered_budgets
+from core.routers import PrimaryReplicaRouter, end_request, start_request
+from designer.models import Design
+from products.data import get_product_by_id
+from products.models import BrandProduct, Product
+
+
+@override_settings(COUNTER_FLUSH_INTERVAL=0)
+class BufferedCounterTests(TransactionTestCase):
+
+    def setUp(self):
+        brand = Brand.objects.create(name='Counter Brand')
+        self.templates = [
+            BrandTemplate.objects.create(brand=brand, name=f'Template {i}')
+            for i in range(3)
+        ]
+
+    def test_concurrent_increments_are_exact(self):
+        # A tiny buffer forces many overlapping flushes from different threads
+        counter = BufferedCounter(
+            'tests.template_usage', flush_template_usage,
+            flush_interval=3600, max_pending=2,
+        )
+        self.addCleanup(unregister, counter.name)
+        thread_count, per_thread = 8, 300
+
+        def worker():
+            try:
+                for i in range(per_thread):
+                    counter.increment(self.templates[i % len(self.templates)].pk)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.flush()
+
+        self.assertEqual(counter.pending(), 0)
+        for template in self.templates:
+            template.refresh_from_db()
+            self.assertEqual(template.usage_count, thread_count * per_thread // len(self.templates))
+
+    def test_failed_flush_keeps_increments(self):
+        def failing_flush(counts):
+            raise RuntimeError('database unavailable')
+
+        counter = BufferedCounter('tests.failing', failing_flush, flush_interval=3600)
+        self.addCleanup(unregister, counter.name)
+        counter.increment('a', 3)
+        with self.assertRaises(RuntimeError):
+            counter.flush()
+        self.assertEqual(counter.pending('a'), 3)
+
+    def test_increment_usage_is_buffered(self):
+        template = self.templates[0]
+        template.increment_usage()
+        template.increment_usage()
+        self.assertEqual(template.usage_count, 2)
+
+        template_usage.flush()
+        template.refresh_from_db()
+        self.assertEqual(template.usage_count, 2)
+
+    def test_module_counters_follow_settings(self):
+        # template_usage was created at import time, before this override
+        template = self.templates[1]
+        template.increment_usage()
+        self.assertEqual(template_usage.pending(), 0)
+        template.refresh_from_db()
+        self.assertEqual(template.usage_count, 1)
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class PrimaryReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.addCleanup(end_request)
+
+    def test_reads_use_primary_outside_requests(self):
+        self.assertIsNone(self.router.db_for_read(Brand))
+
+    def test_read_only_view_reads_from_replica(self):
+        state = start_request()
+        state.use_replica = True
+        self.assertEqual(self.router.db_for_read(Brand), 'replica')
+
+    def test_write_switches_request_to_primary(self):
+        state = start_request()
+        state.use_replica = True
+        self.assertEqual(self.router.db_for_write(Brand), 'default')
+        self.assertEqual(self.router.db_for_read(Brand), 'default')
+
+    def test_pinned_client_reads_from_primary(self):
+        state = start_request(pinned=True)
+        state.use_replica = True
+        self.assertEqual(self.router.db_for_read(Brand), 'default')
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaRoutingMiddlewareTests(TestCase):
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.post('/designer/save/', {
+            'name': 'Pinned', 'product': '1', 'data': '{}',
+        })
+        self.assertTrue(response.json()['success'])
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+
+@skipUnless('replica' in settings.DATABASES, 'Set DATABASE_REPLICA_NAME to test against a second database')
+class ReplicaDatabaseTests(TransactionTestCase):
+    databases = set(settings.DATABASES)
+
+    def setUp(self):
+        # Make sure the default brand exists so the request itself doesn't write
+        Brand.get_by_subdomain()
+
+    def test_gallery_reads_from_replica(self):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get('/designer/gallery/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('designer_publicdesignlisting' in q['sql'] for q in replica_queries))
+
+
+@override_settings(QUERY_COUNT_ENABLED=True, QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(TestCase):
+    # Every view with a @query_budget, requested as a brand owner
+    VIEWS = (
+        'core:home', 'products:list', 'designer:designer', 'designer:service_worker', 'designer:gallery',
+        'designer:bootstrap', 'designer:my_designs',
+        'designer:user_images_api', 'cart:view', 'cart:sidebar', 'brands:dashboard', 'brands:catalog',
+        'brands:earnings', 'brands:templates', 'brands:images', 'brands:image_categories', 'brands:settings',
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('sync_catalog', stdout=StringIO())
+        cls.user = get_user_model().objects.create_user(username='budget-owner', password='x', is_brand_owner=True)
+        cls.brand = Brand.objects.create(name='Budget Brand', is_default=True)
+        BrandOwner.objects.create(brand=cls.brand, user=cls.user, is_primary=True)
+        cls.cart = Cart.objects.create(user=cls.user)
+        cls.products = list(Product.objects.all())
+
+    def setUp(self):
+        # Budgets have to hold with cold caches
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def add_rows(self, count):
+        """count more rows of everything the views list"""
+        for i in range(count):
+            product = self.products[i % len(self.products)]
+            design = Design.objects.create(user=self.user, brand=self.brand, name=f'Design {i}',
+                                           product=product.pk, data={'layers': {}}, public=True)
+            CartItem.objects.create(cart=self.cart, design_id=str(design.pk), product_id=product.pk,
+                                    sizes={'M': 1}, quantity=1, price=Decimal('20.00'))
+            BrandEarnings.objects.create(brand=self.brand, order_id=i, amount=Decimal('100.00'),
+                                         commission_rate=Decimal('10.00'), transaction_date=timezone.now())
+            BrandTemplate.objects.create(brand=self.brand, name=f'Template {i}')
+            category, _ = BrandImageCategory.objects.get_or_create(brand=self.brand, name=f'Category {i}')
+            BrandImage.objects.create(brand=self.brand, category=category, name=f'Image {i}', image_url=f'/media/{i}.png')
+            BrandProduct.objects.get_or_create(brand=self.brand, product=product)
+
+    def query_count(self, name):
+        cache.clear()
+        response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200, name)
+        return int(response['X-Query-Count'])
+
+    def test_views_stay_within_budget(self):
+        self.add_rows(3)
+        for name in self.VIEWS:
+            with self.subTest(view=name):
+                self.query_count(name)  # strict mode raises QueryBudgetExceeded
+
+        response = self.client.post(reverse('designer:save_design'), {
+            'name': 'Budget', 'product': self.products[0].pk, 'data': json.dumps({'layers': {}}),
+        })
+        self.assertTrue(response.json()['success'])
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        self.add_rows(2)
+        before = {name: self.query_count(name) for name in self.VIEWS}
+        self.add_rows(12)
+        after = {name: self.query_count(name) for name in self.VIEWS}
+        self.assertEqual(before, after)
+
+    def test_every_budgeted_view_is_tested(self):
+        tested = set()
+        for name in self.VIEWS + ('designer:save_design',):
+            func = resolve(reverse(name)).func
+            view = getattr(func, 'view_class', func)
+            tested.add(f'{view.__module__}.{view.__qualname__}')
+        self.assertEqual(set(registered_budgets()) - tested, set())
+
+    def test_repeated_query_shapes_are_flagged(self):
+        brands = [Brand.objects.create(name=f'Loop {i}') for i in range(4)]
+        with QueryRecorder() as recorder:
+            for brand in brands:
+                Brand.objects.filter(pk=brand.pk).first()
+
+        with self.assertLogs('core.querycount', 'WARNING') as logs:
+            problems = check_request(recorder, 'loop')
+        self.assertEqual(len(problems), 1)
+        self.assertIn('core/tests.py', logs.output[0])
+
+        with self.assertRaises(QueryBudgetExceeded), self.assertLogs('core.querycount', 'WARNING'):
+            check_request(recorder, 'loop', budget=2)
+
+
+class GenerateLoadDataTests(TestCase):
+
+    def test_generated_rows_are_consistent(self):
+        call_command('sync_catalog', stdout=StringIO())
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            call_command('generate_load_data', brands=2, users=10, designs=60, carts=10, placeholders=2,
+                         images_per_brand=1, images_per_user=1, earnings_per_brand=2, stdout=StringIO())
+
+        items = list(CartItem.objects.all())
+        self.assertTrue(items)
+        products = Product.objects.in_bulk([item.product_id for item in items])
+        designs = Design.objects.in_bulk([int(item.design_id) for item in items])
+        for item in items:
+            design_product = get_product_by_id(designs[int(item.design_id)].product)
+            self.assertEqual(products[item.product_id].name, design_product.name)
+
+        designs = Design.objects.all()
+        self.assertEqual(len({design.updated_at for design in designs}), designs.count())
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_INTERVAL_MS=1)
+class ProfilingTests(TestCase):
+
+    def test_staff_request_is_profiled(self):
+        staff = get_user_model().objects.create_user(username='profiler', password='x', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse('core:home'), {'_profile': '1'})
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual(profile.view_name, 'core:home')
+        self.assertEqual(profile.status_code, 200)
+
+    def test_other_requests_are_not_profiled(self):
+        response = self.client.get(reverse('core:home'), {'_profile': '1'})
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_backed_off_interval_is_reported(self):
+        sampler = StackSampler(threading.get_ident(), interval=0.001, max_overhead=0).start()
+        time.sleep(0.05)
+        sampler.stop()
+        self.assertGreater(sampler.current_interval, sampler.interval)
+
+
+class SlowQueryTests(TestCase):
+
+    def test_buffer_aggregates_and_flushes(self):
+        buffer = SlowQueryBuffer()
+        self.addCleanup(unregister, buffer.name)
+        with self.settings(COUNTER_FLUSH_INTERVAL=3600):
+            buffer.add('SELECT ?', 'core:home', None, 'anonymous', 120)
+            buffer.add('SELECT ?', 'core:home', None, 'anonymous', 300)
+        self.assertEqual(buffer.pending(), 2)
+        self.assertEqual(buffer.flush(), 2)
+
+        query = SlowQuery.objects.get()
+        self.assertEqual((query.calls, query.total_ms, query.max_ms), (2, 420, 300))
+
+    def test_admin_index_lists_top_queries(self):
+        SlowQuery.objects.create(bucket='a', fingerprint='a', view_name='core:home', user_type='anonymous',
+                                 sql='SELECT "slowest"', calls=3, total_ms=900, max_ms=400,
+                                 first_seen=timezone.now(), last_seen=timezone.now())
+        admin = get_user_model().objects.create_superuser(username='admin', password='x')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:index'))
+        self.assertContains(response, 'Slow queries by total time')
+        self.assertContains(response, 'SELECT &quot;slowest&quot;')
+
+
+FILE_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(TELEMETRY_ENABLED=True, TELEMETRY_SERVER_TIMING=True, TELEMETRY_SAMPLE_RATE=1,
+                   TELEMETRY_BRAND_SAMPLE_RATES={}, STORAGES=FILE_STORAGES)
+class TelemetryTests(TestCase):
+
+    def setUp(self):
+        # CoreConfig.ready() only installs it when telemetry is on at startup
+        telemetry.install()
+
+    def get(self, **extra):
+        with self.assertLogs('core.telemetry.requests', 'INFO') as logs:
+            response = self.client.get(reverse('core:home'), **extra)
+        return response, json.loads(logs.records[-1].getMessage())
+
+    def test_server_timing_on_sampled_requests(self):
+        response, _ = self.get()
+        metrics = re.findall(r'(?:^|, )(\w+);dur=[\d.]+', response['Server-Timing'])
+        self.assertEqual(metrics, ['db', 'tpl', 'storage', 'cache', 'total'])
+
+        with override_settings(TELEMETRY_SAMPLE_RATE=0), self.assertNoLogs('core.telemetry.requests'):
+            response = self.client.get(reverse('core:home'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(TELEMETRY_SAMPLE_RATE=0, TELEMETRY_BRAND_SAMPLE_RATES={'acme': 1})
+    def test_per_subdomain_rate(self):
+        response, record = self.get(HTTP_HOST='acme.example.com')
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(record['brand'], 'acme')
+
+        with self.assertNoLogs('core.telemetry.requests'):
+            response = self.client.get(reverse('core:home'), HTTP_HOST='example.com')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_record_fields(self):
+        user = get_user_model().objects.create_user(username='sampled', password='x')
+        self.client.force_login(user)
+        _, record = self.get()
+        self.assertEqual((record['method'], record['path'], record['view'], record['status']),
+                         ('GET', '/', 'core:home', 200))
+        self.assertEqual((record['brand'], record['auth']), ('default', 'user'))
+        self.assertEqual(record['brand_id'], Brand.objects.get(is_default=True).pk)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['template_renders'], 0)
+        for field in ('duration_ms', 'db_ms', 'template_ms', 'storage_ms', 'storage_calls', 'cache_ms',
+                      'cache_hits', 'cache_misses'):
+            self.assertIn(field, record)
+
+    def test_backend_timings(self):
+        cache.set('telemetry-hit', 1)
+        with tempfile.TemporaryDirectory() as directory:
+            storage = FileSystemStorage(location=directory)
+            metrics = telemetry.RequestMetrics().start()
+            try:
+                # get_many runs get per key: counted once, not twice
+                cache.get_many(['telemetry-hit', 'telemetry-miss'])
+                cache.get('telemetry-miss')
+                storage.save('sampled.txt', ContentFile(b'x'))
+                engines['django'].from_string('{{ value }}').render({'value': 1})
+            finally:
+                metrics.stop()
+
+        record = metrics.as_record()
+        self.assertEqual((record['cache_hits'], record['cache_misses']), (1, 2))
+        self.assertGreaterEqual(record['storage_calls'], 1)
+        self.assertEqual(record['template_renders'], 1)
+
+        # Outside a sampled request the wrappers record nothing
+        cache.get('telemetry-hit')
+        self.assertEqual(metrics.as_record()['cache_hits'], 1)
+
+    def test_install_is_idempotent(self):
+        from django.template.backends.django import Template
+
+        telemetry.install()
+        telemetry.install()
+        for method in (Template.render, FileSystemStorage.exists, type(caches['default']).get,
+                       type(caches['default']).get_many):
+            self.assertTrue(method._telemetry)
+            self.assertFalse(getattr(method.__wrapped__, '_telemetry', False))
+
+
+HASHED = 'js/app.3f2a9c1b7e4d.js'
+
+
+class StaticServingTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.join(tmp.name, 'static')
+        # A readable file next to STATIC_ROOT, for the traversal test
+        with open(os.path.join(tmp.name, 'secret.js'), 'w') as handle:
+            handle.write('secret')
+        override = override_settings(STATIC_ROOT=self.root, STATIC_UNHASHED_MAX_AGE=300)
+        override.enable()
+        self.addCleanup(override.disable)
+        patch = mock.patch('core.staticfiles.hashed_names', return_value=frozenset({HASHED}))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.body = b'console.log("designer");\n' * 100
+        for name in (HASHED, 'models/shirt.js'):
+            path = os.path.join(self.root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            for suffix in ('', '.gz', '.br'):
+                with open(path + suffix, 'wb') as handle:
+                    handle.write(suffix.encode() + self.body)
+
+    def serve(self, path, **extra):
+        return serve_static(RequestFactory().get('/static/' + path, **extra), path)
+
+    def test_brotli_is_preferred_over_gzip(self):
+        response = self.serve(HASHED, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(b''.join(response.streaming_content), b'.br' + self.body)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_refused_encoding_falls_back(self):
+        response = self.serve(HASHED, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+        response = self.serve(HASHED)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+
+    def test_only_hashed_names_are_immutable(self):
+        self.assertEqual(self.serve(HASHED)['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(self.serve('models/shirt.js')['Cache-Control'], 'public, max-age=300')
+
+    def test_unhashed_paths_are_revalidated(self):
+        modified = http_date(os.stat(os.path.join(self.root, 'models/shirt.js')).st_mtime)
+        self.assertEqual(self.serve('models/shirt.js', HTTP_IF_MODIFIED_SINCE=modified).status_code, 304)
+        self.assertEqual(self.serve(HASHED, HTTP_IF_MODIFIED_SINCE=modified).status_code, 200)
+
+    def test_paths_outside_static_root_are_not_served(self):
+        self.assertIsNone(self.serve('../secret.js'))
+        self.assertIsNone(self.serve('js/../../secret.js'))
+        self.assertIsNone(self.serve('js/missing.js'))
+
+
+@override_settings(STATIC_COMPRESS_MIN_SIZE=512)
+class CompressedStorageTests(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.storage = CompressedManifestStaticFilesStorage(location=self.root.name, base_url='/static/')
+
+    def variants(self, name, data):
+        self.storage._save(name, ContentFile(data))
+        self.storage.write_variants(name)
+        return {suffix for suffix in ('.gz', '.br') if self.storage.exists(name + suffix)}
+
+    def test_compressible_files_get_variants(self):
+        expected = {'.gz', '.br'} if brotli else {'.gz'}
+        self.assertEqual(self.variants('app.js', b'var designer = 1;\n' * 100), expected)
+
+    def test_small_files_are_skipped(self):
+        self.assertEqual(self.variants('small.js', b'var designer = 1;\n' * 20), set())
+
+    def test_variants_must_save_enough(self):
+        self.assertEqual(self.variants('random.js', os.urandom(4096)), set())
+
+    def test_compressed_formats_are_skipped(self):
+        self.assertEqual(self.variants('mesh.ktx2', b'\0' * 4096), set())
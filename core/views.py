@@ -1,9 +1,11 @@
 from django.shortcuts import render
 from brands.models import Brand
 from products.models import Product, ProductCategory, BrandProduct
-from products.data import products as PRODUCTS_DATA
+from products.data import get_products
+from core.querycount import query_budget
 
 
+@query_budget(8)
 def home(request):
     """Homepage view with exact HTML from PHP"""
     # Get current brand from middleware
@@ -12,7 +14,7 @@ def home(request):
         current_brand = Brand.get_by_subdomain()
     
     # Get products from static data
-    brand_products = [p for p in PRODUCTS_DATA if p.get('canOrder', True)]
+    brand_products = [p for p in get_products() if p.can_order]
     
     # Organize products by category for dynamic tab display
     from django.utils.text import slugify
@@ -20,7 +22,7 @@ def home(request):
     category_info = []  # List of dicts with category info and products
     
     for product in brand_products:
-        categories = product.get('categories', [])
+        categories = product.categories
         for category_name in categories:
             category_slug = slugify(category_name)
             
@@ -32,7 +34,7 @@ def home(request):
     for slug, products in products_by_category.items():
         # Get category name from first product
         if products:
-            category_name = products[0].get('categories', [])[0] if products[0].get('categories') else slug
+            category_name = products[0].categories[0] if products[0].categories else slug
             category_info.append({
                 'name': category_name,
                 'slug': slug,
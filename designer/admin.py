@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Design, DesignTemplate, DesignShare, DesignImage
+from .models import Design, DesignTemplate, DesignShare, DesignImage, PublicDesignListing
 
 
 @admin.register(Design)
@@ -41,6 +41,15 @@ class DesignShareAdmin(admin.ModelAdmin):
     ordering = ['-created_at']
 
 
+@admin.register(PublicDesignListing)
+class PublicDesignListingAdmin(admin.ModelAdmin):
+    list_display = ['name', 'brand', 'product', 'views', 'score', 'published_at']
+    list_filter = ['brand', 'published_at']
+    search_fields = ['name', 'design__name']
+    readonly_fields = ['design', 'views', 'score', 'published_at']
+    ordering = ['-score']
+
+
 @admin.register(DesignImage)
 class DesignImageAdmin(admin.ModelAdmin):
     list_display = ['name', 'get_owner', 'filetype', 'file_size', 'width', 'height', 'created_at']
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DesignerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'designer'
+
+    def ready(self):
+        from . import signals  # noqa: F401
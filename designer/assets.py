@@ -0,0 +1,213 @@
+"""
+Designer asset manifest and preload hints
+
+The designer's heavy assets (the product GLB, the initial bumpmap and the
+neutral.hdr environment map) are only requested once designer-alpine.js has
+run and built the scene. designer_assets() works the same list out on the
+server from the catalog, so the view can announce it up front:
+
+ - as <link rel=preload> tags in the page head, and
+ - as a Link response header. Django answers over WSGI and can't send a
+   1xx response itself, but Cloudflare turns the Link header of the page
+   into a 103 Early Hints response, so the downloads start while the HTML
+   is still being generated.
+
+The URLs must be exactly the ones the JavaScript requests, or the browser
+downloads twice: the optimized model when it is built, the WebP levels
+bumpmapUrl() picks (1024px at 1x, 2048px at 2x, offered as an imagesrcset)
+and the static URL of neutral.hdr, which the page hands to the
+JavaScript. three.js loads models and the HDR with XHR and textures as
+anonymous-CORS images, hence the as/crossorigin values.
+
+The brand's default background is only shown once picked, so it gets a
+low-priority prefetch instead of a preload.
+
+asset_manifest() is the versioned list behind the designer's service
+worker (designer/sw.js): every model, bumpmap level, thumbnail and
+self-hosted font URL the designer can request, each with the content hash
+of the file it serves. The service worker precaches the models and
+environment map, caches the rest on first use, and serves all of them
+cache-first. A cached entry is dropped once the manifest lists its URL
+with another hash, so even the catalog's unhashed /static/models/... links
+are invalidated by content.
+"""
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from products import buildcache, fonts, glb, textures
+from products.buildcache import static_url
+from products.data import get_bumpmap_textures, get_catalog, get_fonts, get_products
+from products.glb import optimized_model
+
+ENVIRONMENT_MAP = 'neutral.hdr'
+
+# bumpmapUrl() in designer-alpine.js: the largest level within this size
+BUMPMAP_TARGET_SIZES = ((1024, '1x'), (2048, '2x'))
+
+
+def environment_map_url():
+    return static_url(ENVIRONMENT_MAP)
+
+
+def _model_asset(product):
+    optimized = optimized_model(product.model_link)
+    url = optimized['url'] if optimized else product.model_link
+    if not url:
+        return None
+    return {'rel': 'preload', 'href': url, 'as': 'fetch', 'crossorigin': True}
+
+
+def _pick_level(levels, limit):
+    for level in levels:
+        if max(level['width'], level['height']) <= limit:
+            return level
+    return levels[-1]
+
+
+def _bumpmap_asset(product, bumpmaps):
+    key = product.initial_bumpmap
+    bumpmap = bumpmaps.get(key) if key and key != 'none' else None
+    if not bumpmap or not bumpmap.get('link'):
+        return None
+    # Applied on load only to layers that allow bumpmaps
+    if not any(layer.can_change_bumpmap for _, layer in product.mesh_settings):
+        return None
+
+    levels = (bumpmap.get('variants') or {}).get('webp')
+    if not levels:
+        return {'rel': 'preload', 'href': bumpmap['link'], 'as': 'image', 'crossorigin': True}
+    candidates = [(_pick_level(levels, size)['url'], density) for size, density in BUMPMAP_TARGET_SIZES]
+    asset = {'rel': 'preload', 'href': candidates[0][0], 'as': 'image', 'type': 'image/webp', 'crossorigin': True}
+    if len({url for url, _ in candidates}) > 1:
+        asset['imagesrcset'] = ', '.join(f'{url} {density}' for url, density in candidates)
+    return asset
+
+
+def designer_assets(product, bumpmaps, backgrounds=()):
+    """
+    [{'rel', 'href', 'as', ...}] for a designer page: the product's model,
+    its initial bumpmap, the environment map and the default background.
+    backgrounds are the designer view's brand background dicts.
+    """
+    assets = []
+    if product is not None:
+        assets += [_model_asset(product), _bumpmap_asset(product, bumpmaps)]
+    assets.append({'rel': 'preload', 'href': environment_map_url(), 'as': 'fetch', 'crossorigin': True})
+
+    default = next((bg for bg in backgrounds if bg['is_default'] and bg['image_url']), None)
+    if default:
+        assets.append({'rel': 'prefetch', 'href': default['image_url'], 'as': 'image'})
+    return [asset for asset in assets if asset]
+
+
+def link_header(assets):
+    """The Link header value announcing the assets"""
+    links = []
+    for asset in assets:
+        params = [f'<{asset["href"]}>', f'rel={asset["rel"]}', f'as={asset["as"]}']
+        if asset.get('type'):
+            params.append(f'type="{asset["type"]}"')
+        if asset.get('imagesrcset'):
+            params.append(f'imagesrcset="{asset["imagesrcset"]}"')
+        if asset.get('crossorigin'):
+            params.append('crossorigin=anonymous')
+        links.append('; '.join(params))
+    return ', '.join(links)
+
+
+# -- service worker manifest -------------------------------------------------------
+
+def _static_path(url):
+    """The file a /static/ URL is served from, or None"""
+    if not url or not url.startswith(settings.STATIC_URL):
+        return None
+    name = url[len(settings.STATIC_URL):]
+    roots = [settings.STATIC_ROOT, *settings.STATICFILES_DIRS] if settings.STATIC_ROOT else settings.STATICFILES_DIRS
+    for root in roots:
+        path = Path(root) / name
+        if path.is_file():
+            return path
+    return None
+
+
+# {path: (st_mtime_ns, st_size, hash)}, one entry per file
+_hashes = {}
+
+
+def file_hash(path):
+    """buildcache.file_hash of a file, cached until it changes"""
+    stat = path.stat()
+    mtime, size, digest = _hashes.get(str(path), (None, None, None))
+    if (mtime, size) != (stat.st_mtime_ns, stat.st_size):
+        digest = buildcache.file_hash(path)
+        _hashes[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def _designer_urls():
+    """(url, precache) for everything the designer can load from /static/"""
+    yield environment_map_url(), True
+    for product in get_products():
+        optimized = optimized_model(product.model_link)
+        yield (optimized['url'] if optimized else product.model_link), True
+        yield product.thumbnail, False
+    for bumpmap in get_bumpmap_textures().values():
+        yield bumpmap.get('link'), False
+        yield bumpmap.get('thumbnail'), False
+        variants = bumpmap.get('variants') or {}
+        for level in variants.get('webp', []):
+            yield level['url'], False
+        yield variants.get('ktx2'), False
+    web_fonts = fonts.font_stylesheet(get_fonts())
+    yield web_fonts['css'], False
+    for url in web_fonts['files']:
+        yield url, False
+
+
+def _manifest_key():
+    directories = (glb.variants_dir(), textures.variants_dir(), fonts.output_dir())
+    return (get_catalog().version, *map(buildcache.manifest_mtime, directories))
+
+
+_files = (None, None)
+_files_lock = threading.Lock()
+
+
+def _manifest_files():
+    """[(url, path, precache)], resolved again when the catalog or a variants manifest changes"""
+    global _files
+    key = _manifest_key()
+    cached_key, cached = _files
+    if cached_key == key:
+        return cached
+
+    with _files_lock:
+        files = {}
+        for url, precache in _designer_urls():
+            path = _static_path(url)
+            if path is None:
+                continue
+            if url in files:
+                files[url] = (url, path, files[url][2] or precache)
+            else:
+                files[url] = (url, path, precache)
+        files = sorted(files.values())
+        _files = (key, files)
+    return files
+
+
+def asset_manifest():
+    """
+    {'version', 'assets': [{'url', 'hash', 'precache'}]} for the designer's
+    service worker. Hashes come from file_hash(), so a file edited in place
+    (the catalog's unhashed links) changes its hash and the version.
+    """
+    assets = [{'url': url, 'hash': file_hash(path), 'precache': precache}
+              for url, path, precache in _manifest_files()]
+    version = hashlib.sha256(
+        ''.join(f"{asset['url']}={asset['hash']};" for asset in assets).encode()
+    ).hexdigest()[:16]
+    return {'version': version, 'assets': assets}
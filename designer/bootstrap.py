@@ -0,0 +1,263 @@
+"""
+Designer start-up data
+
+The designer page and the /designer/bootstrap/ endpoint build the same
+sections from these functions: the product, the design or template being
+opened, the brand's backgrounds and image categories, the catalog lists
+(bumpmaps and fonts) and the first page of the image bank.
+
+bootstrap() returns them in one JSON response, each section with its own
+ETag. A client that already holds some sections sends their ETags in
+?known=<etag>,<etag> and gets {'etag', 'unchanged': true} for those
+instead of the data, so the brand and catalog, which rarely change, are
+not sent again. The response's own ETag covers every section, so a
+revalidation with If-None-Match gets a 304 when nothing changed at all.
+
+designer_view inlines these sections into the page, so the designer itself
+makes no start-up requests for them. Its image bank still loads the whole
+list from /designer/images/ in one request when the modal opens.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from brands.models import BrandBackground, BrandImage, BrandImageCategory
+from products.data import get_bumpmap_textures, get_fonts, get_product_by_id, get_products
+from products.fonts import font_stylesheet
+from products.glb import optimized_model
+from .models import Design, DesignImage, DesignTemplate
+
+
+def current_product(product_id):
+    """The catalog product for a ?product= value, else the first product"""
+    try:
+        product = get_product_by_id(int(product_id))
+    except (ValueError, TypeError):
+        product = None
+    if product is None and get_products():
+        product = get_products()[0]
+    return product
+
+
+def product_section(product):
+    if not product:
+        return None
+    # Static products are compact records; JavaScript gets the original dict shape
+    data = product.to_dict()
+    data['optimizedModel'] = optimized_model(product.model_link)
+    return data
+
+
+def design_section(request, design_id):
+    """The user's (or guest session's) design, or None"""
+    if not design_id:
+        return None
+    try:
+        if request.user.is_authenticated:
+            # Try to load user's design
+            design = Design.objects.get(id=design_id, user=request.user)
+        else:
+            # Try to load guest's design using session_id
+            if not request.session.session_key:
+                request.session.create()
+            design = Design.objects.get(id=design_id, session_id=request.session.session_key)
+    except (ValueError, Design.DoesNotExist):
+        return None
+
+    return {
+        'id': design.id,
+        'name': design.name,
+        'product_id': design.product,
+        'design_data': design.data,
+        'screenshots': {
+            'front': design.thumbnail_front.url if design.thumbnail_front else '',
+            'back': design.thumbnail_back.url if design.thumbnail_back else '',
+            'left': design.thumbnail_left.url if design.thumbnail_left else '',
+            'right': design.thumbnail_right.url if design.thumbnail_right else ''
+        }
+    }
+
+
+def template_section(brand, template_id=None, template_edit_id=None, is_brand_owner=False):
+    """
+    (template data or None, is_editing) for ?template= (an active template
+    of the brand) or ?template_edit= (brand owners only)
+    """
+    if template_id:
+        filters, editing = {'id': template_id, 'is_active': True}, False
+    elif template_edit_id and is_brand_owner:
+        filters, editing = {'id': template_edit_id}, True
+    else:
+        return None, False
+
+    try:
+        template = DesignTemplate.objects.get(brand=brand, **filters)
+    except (ValueError, DesignTemplate.DoesNotExist):
+        return None, False
+
+    return {
+        'id': template.id,
+        'name': template.name,
+        'product': template.product,
+        'design_data': template.design_data,
+        'thumbnails': {
+            'front': template.thumbnail_front,
+            'back': template.thumbnail_back,
+            'left': template.thumbnail_left,
+            'right': template.thumbnail_right
+        }
+    }, editing
+
+
+def brand_backgrounds(brand):
+    if not brand:
+        return []
+    backgrounds = BrandBackground.objects.filter(brand=brand, is_active=True).order_by('sort_order', 'name')
+    return [
+        {
+            'id': bg.id,
+            'name': bg.name,
+            'image_url': bg.image_url,
+            'thumbnail_url': bg.thumbnail_url,
+            'is_default': bg.is_default,
+        }
+        for bg in backgrounds
+    ]
+
+
+def image_categories(brand):
+    if not brand:
+        return []
+    return [
+        {
+            'id': cat.id,
+            'name': cat.name,
+            'slug': cat.slug,
+            'description': cat.description,
+        }
+        for cat in BrandImageCategory.objects.filter(brand=brand).order_by('name')
+    ]
+
+
+def brand_section(brand):
+    return {
+        'id': brand.id if brand else 0,
+        'name': brand.name if brand else '',
+        'primaryColor': brand.primary_color if brand else '#000000',
+        'backgrounds': brand_backgrounds(brand),
+        'imageCategories': image_categories(brand),
+    }
+
+
+def catalog_section():
+    return {
+        'bumpmaps': get_bumpmap_textures(),
+        'fonts': get_fonts(),
+        'fontStylesheet': font_stylesheet(get_fonts())['css'],
+    }
+
+
+def user_image_dict(img):
+    return {
+        'id': f'user_{img.id}',
+        'name': img.name,
+        'image_url': img.image.url,
+        'thumbnail_url': img.thumbnail.url if img.thumbnail else img.image.url,
+        'width': img.width,
+        'height': img.height,
+        'file_size': img.file_size,
+        'filetype': img.filetype,
+        'created_at': img.created_at.isoformat(),
+        'source': 'user',
+        'category_id': None
+    }
+
+
+def brand_image_dict(img):
+    return {
+        'id': f'brand_{img.id}',
+        'name': img.name,
+        'image_url': img.image_url,
+        'thumbnail_url': img.thumbnail_url or img.image_url,
+        'width': img.width,
+        'height': img.height,
+        'file_size': img.file_size,
+        'filetype': 'jpg',  # Default for brand images
+        'created_at': img.created_at.isoformat(),
+        'source': 'brand',
+        'category_id': img.category_id
+    }
+
+
+def image_page(request, offset=0, limit=None):
+    """
+    {'images', 'next_offset'}: the user's uploads (newest first), then the
+    brand's images. limit=None returns everything.
+    """
+    if request.user.is_authenticated:
+        user_images = DesignImage.objects.filter(user=request.user)
+    else:
+        # For guest users, use session ID
+        if not request.session.session_key:
+            request.session.create()
+        user_images = DesignImage.objects.filter(session_id=request.session.session_key)
+    brand_images = (
+        BrandImage.objects.filter(brand=request.brand) if request.brand else BrandImage.objects.none()
+    )
+    # Unique orderings, so pages neither repeat nor skip images
+    user_images = user_images.order_by('-created_at', '-id')
+    brand_images = brand_images.order_by('-created_at', '-id')
+
+    # One row past the page tells whether there is a next one
+    end = None if limit is None else offset + limit + 1
+    images = [user_image_dict(img) for img in user_images[offset:end]]
+    if limit is None or len(images) <= limit:
+        # The page reaches into the brand images
+        brand_offset = 0 if images or not offset else max(offset - user_images.count(), 0)
+        brand_end = None if limit is None else brand_offset + limit + 1 - len(images)
+        images += [brand_image_dict(img) for img in brand_images[brand_offset:brand_end]]
+    if limit is None or len(images) <= limit:
+        return {'images': images, 'next_offset': None}
+    return {'images': images[:limit], 'next_offset': offset + limit}
+
+
+def section_etag(data):
+    payload = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _template(request):
+    is_brand_owner = request.user.is_authenticated and request.user.is_brand_owner
+    template, editing = template_section(
+        request.brand, request.GET.get('template'), request.GET.get('template_edit'), is_brand_owner
+    )
+    return dict(template, isEditing=editing) if template else None
+
+
+SECTIONS = {
+    'product': lambda request: product_section(current_product(request.GET.get('product'))),
+    'design': lambda request: design_section(request, request.GET.get('design')),
+    'template': _template,
+    'brand': lambda request: brand_section(request.brand),
+    'catalog': lambda request: catalog_section(),
+    'images': lambda request: image_page(request, limit=getattr(settings, 'DESIGNER_IMAGE_PAGE_SIZE', 48)),
+}
+
+
+def bootstrap(request):
+    """
+    {'sections': {name: {'etag', 'data'} or {'etag', 'unchanged'}}, 'etag'}.
+    ?sections=a,b limits the response to those sections.
+    """
+    known = set(filter(None, request.GET.get('known', '').split(',')))
+    names = [name for name in request.GET.get('sections', '').split(',') if name in SECTIONS] or list(SECTIONS)
+
+    result = {}
+    for name in names:
+        data = SECTIONS[name](request)
+        etag = section_etag(data)
+        result[name] = {'etag': etag, 'unchanged': True} if etag in known else {'etag': etag, 'data': data}
+    etag = hashlib.sha256(''.join(section['etag'] for section in result.values()).encode()).hexdigest()[:16]
+    return {'sections': result, 'etag': etag}
@@ -0,0 +1,182 @@
+"""
+Public design gallery
+
+Maintains the PublicDesignListing table, ranks listings by popularity and
+serves keyset-paginated gallery pages. Share page views are buffered in
+process memory and written back in batches.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils.crypto import get_random_string
+
+from core.counters import BufferedCounter
+from .models import Design, DesignShare, PublicDesignListing
+
+GALLERY_PAGE_SIZE = 24
+
+# Reference point for the time component of the score
+SCORE_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# Seconds of recency worth one order of magnitude of views
+SCORE_DECAY_SECONDS = 45000
+
+
+def compute_score(views, published_at):
+    """
+    "Hot" ranking: log10 of views plus a recency term.
+    Scores never change with wall-clock time, so rows only need rewriting
+    when their view count changes.
+    """
+    order = math.log10(max(views, 1))
+    age = (published_at - SCORE_EPOCH).total_seconds()
+    return round(order + age / SCORE_DECAY_SECONDS, 7)
+
+
+def refresh_listing(design):
+    """Create, update or remove the gallery listing for a single design"""
+    if not design.public:
+        PublicDesignListing.objects.filter(design_id=design.pk).delete()
+        return None
+
+    listing = PublicDesignListing.objects.filter(design_id=design.pk).first()
+    if listing is None:
+        views = DesignShare.objects.filter(design_id=design.pk).aggregate(total=Sum('views'))['total'] or 0
+        listing = PublicDesignListing(design=design, views=views, published_at=design.updated_at)
+
+    listing.brand_id = design.brand_id
+    listing.name = design.name
+    listing.product = design.product
+    listing.thumbnail = design.thumbnail_front.name if design.thumbnail_front else ''
+    listing.score = compute_score(listing.views, listing.published_at)
+    listing.save()
+    return listing
+
+
+def rebuild_listings(batch_size=1000):
+    """Rebuild the whole listing table from public designs"""
+    with transaction.atomic():
+        PublicDesignListing.objects.all().delete()
+
+        view_totals = dict(
+            DesignShare.objects.filter(design__public=True)
+            .values('design_id')
+            .annotate(total=Sum('views'))
+            .values_list('design_id', 'total')
+        )
+
+        designs = Design.objects.filter(public=True).only(
+            'id', 'brand_id', 'name', 'product', 'thumbnail_front', 'updated_at'
+        )
+        listings = []
+        created = 0
+        for design in designs.iterator(chunk_size=batch_size):
+            views = view_totals.get(design.pk, 0) or 0
+            listings.append(PublicDesignListing(
+                design_id=design.pk,
+                brand_id=design.brand_id,
+                name=design.name,
+                product=design.product,
+                thumbnail=design.thumbnail_front.name if design.thumbnail_front else '',
+                views=views,
+                score=compute_score(views, design.updated_at),
+                published_at=design.updated_at,
+            ))
+            if len(listings) >= batch_size:
+                PublicDesignListing.objects.bulk_create(listings)
+                created += len(listings)
+                listings = []
+
+        if listings:
+            PublicDesignListing.objects.bulk_create(listings)
+            created += len(listings)
+
+    return created
+
+
+def flush_share_views(counts):
+    """Write buffered share views to DesignShare and the gallery listings"""
+    design_ids = list(counts)
+
+    # Group designs by increment so each distinct amount is a single UPDATE
+    by_amount = defaultdict(list)
+    for design_id, amount in counts.items():
+        by_amount[amount].append(design_id)
+
+    with transaction.atomic():
+        # Oldest share row per design receives the views
+        share_ids = {}
+        for share_id, design_id in (
+            DesignShare.objects.filter(design_id__in=design_ids)
+            .order_by('-pk')
+            .values_list('pk', 'design_id')
+        ):
+            share_ids[design_id] = share_id
+
+        for amount, ids in by_amount.items():
+            existing = [share_ids[i] for i in ids if i in share_ids]
+            if existing:
+                DesignShare.objects.filter(pk__in=existing).update(views=F('views') + amount)
+            PublicDesignListing.objects.filter(design_id__in=ids).update(views=F('views') + amount)
+
+        # Public designs get their first share row here; views of private,
+        # never-shared designs are not counted
+        missing = [i for i in design_ids if i not in share_ids]
+        if missing:
+            DesignShare.objects.bulk_create([
+                DesignShare(design_id=design_id, share_code=get_random_string(12), views=counts[design_id])
+                for design_id in Design.objects.filter(pk__in=missing, public=True).values_list('pk', flat=True)
+            ])
+
+        listings = list(PublicDesignListing.objects.filter(design_id__in=design_ids).only('views', 'published_at'))
+        for listing in listings:
+            listing.score = compute_score(listing.views, listing.published_at)
+        PublicDesignListing.objects.bulk_update(listings, ['score'])
+
+
+share_views = BufferedCounter('designer.share_views', flush_share_views)
+
+
+def record_share_view(design_id):
+    """Count a share page view without touching the database on the hot path"""
+    share_views.increment(design_id)
+
+
+def encode_cursor(listing):
+    return f"{listing.score!r}_{listing.design_id}"
+
+
+def decode_cursor(cursor):
+    """Parse a "score_id" cursor, returning None when it is malformed"""
+    try:
+        score, design_id = cursor.rsplit('_', 1)
+        return float(score), int(design_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def gallery_page(brand, cursor=None, product=None, per_page=GALLERY_PAGE_SIZE):
+    """
+    Return (listings, next_cursor) for one gallery page.
+    Keyset pagination on (score, design_id) keeps every page an index range
+    scan no matter how deep the visitor scrolls.
+    """
+    queryset = PublicDesignListing.objects.filter(brand=brand)
+    if product is not None:
+        queryset = queryset.filter(product=product)
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        score, design_id = position
+        queryset = queryset.filter(Q(score__lt=score) | Q(score=score, design_id__lt=design_id))
+
+    listings = list(queryset.order_by('-score', '-design_id')[:per_page + 1])
+    next_cursor = None
+    if len(listings) > per_page:
+        listings = listings[:per_page]
+        next_cursor = encode_cursor(listings[-1])
+
+    return listings, next_cursor
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from designer.gallery import rebuild_listings, share_views
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the public design gallery listing from public designs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        # Write any buffered share views first so scores are current
+        share_views.flush()
+
+        self.stdout.write('Rebuilding public design gallery...')
+        created = rebuild_listings(batch_size=options['batch_size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt gallery with {created} public designs')
+        )
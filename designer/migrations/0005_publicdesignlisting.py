@@ -0,0 +1,35 @@
+# Generated by Django 5.1.11 on 2026-10-18 23:53
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0006_add_brand_background_model'),
+        ('designer', '0004_design_brand'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicDesignListing',
+            fields=[
+                ('design', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='designer.design')),
+                ('name', models.CharField(max_length=255)),
+                ('product', models.IntegerField()),
+                ('thumbnail', models.CharField(blank=True, help_text='Storage name of the front thumbnail', max_length=500)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('score', models.FloatField(default=0, help_text='Popularity ranking (higher first)')),
+                ('published_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('brand', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='gallery_listings', to='brands.brand')),
+            ],
+            options={
+                'verbose_name': 'Public Design Listing',
+                'verbose_name_plural': 'Public Design Listings',
+                'ordering': ['-score', '-design'],
+                'indexes': [models.Index(fields=['brand', '-score', '-design'], name='gallery_brand_score_idx'), models.Index(fields=['brand', 'product', '-score', '-design'], name='gallery_brand_product_idx')],
+            },
+        ),
+    ]
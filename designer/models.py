@@ -101,6 +101,50 @@ class DesignShare(models.Model):
         return f"Share for {self.design.name}"
 
 
+class PublicDesignListing(models.Model):
+    """
+    Precomputed gallery row for a public design.
+    Kept in sync with Design by signals so the gallery never scans designs.
+    """
+    design = models.OneToOneField(
+        Design,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='listing'
+    )
+    brand = models.ForeignKey(
+        Brand,
+        on_delete=models.CASCADE,
+        related_name='gallery_listings',
+        null=True,
+        blank=True
+    )
+    name = models.CharField(max_length=255)
+    product = models.IntegerField()
+    thumbnail = models.CharField(max_length=500, blank=True, help_text="Storage name of the front thumbnail")
+    views = models.PositiveIntegerField(default=0)
+    score = models.FloatField(default=0, help_text="Popularity ranking (higher first)")
+    published_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-score', '-design']
+        verbose_name = "Public Design Listing"
+        verbose_name_plural = "Public Design Listings"
+        indexes = [
+            models.Index(fields=['brand', '-score', '-design'], name='gallery_brand_score_idx'),
+            models.Index(fields=['brand', 'product', '-score', '-design'], name='gallery_brand_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.score:.2f})"
+
+    @property
+    def thumbnail_url(self):
+        """Resolve the stored thumbnail name through the media storage"""
+        from django.core.files.storage import default_storage
+        return default_storage.url(self.thumbnail) if self.thumbnail else ''
+
+
 def design_image_upload_path(instance, filename):
     """Generate upload path for design images"""
     # Use user_id if available, otherwise session_id
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Design
+
+
+@receiver(post_save, sender=Design)
+def sync_gallery_listing(sender, instance, raw=False, **kwargs):
+    """Keep the public gallery listing in step with the design"""
+    if raw:
+        return
+    from .gallery import refresh_listing
+    refresh_listing(instance)
@@ -0,0 +1,106 @@
+// Designer asset cache (see designer/assets.py asset_manifest)
+//
+// Models and the environment map are precached on install; bumpmaps,
+// thumbnails and fonts are cached the first time the designer loads them.
+// All of them are then served cache-first. Each cached response carries the
+// content hash it was stored for, and entries whose hash no longer matches
+// the manifest are dropped, so a changed file is fetched again even when its
+// URL stays the same. A new manifest version changes this script, which is
+// what makes the browser install the new worker.
+
+const MANIFEST = {{ manifest|safe }};
+const CACHE_NAME = "designer-assets";
+const FONT_CACHE_NAME = "designer-fonts";
+const HASH_HEADER = "X-Asset-Hash";
+
+// Google Fonts files (families not self-hosted yet) are versioned by URL
+// and served with CORS
+const FONT_ORIGINS = {{ font_origins|safe }};
+
+const assets = new Map(
+  MANIFEST.assets.map((asset) => [new URL(asset.url, self.location.origin).href, asset])
+);
+
+async function store(cache, request, response, hash) {
+  // Keep the hash next to the body so a later manifest can invalidate it
+  const headers = new Headers(response.headers);
+  headers.set(HASH_HEADER, hash);
+  const body = await response.blob();
+  await cache.put(request, new Response(body, { status: response.status, statusText: response.statusText, headers }));
+}
+
+async function precache() {
+  const cache = await caches.open(CACHE_NAME);
+  const pending = [];
+  for (const [url, asset] of assets) {
+    if (!asset.precache) continue;
+    pending.push(
+      (async () => {
+        const cached = await cache.match(url);
+        if (cached && cached.headers.get(HASH_HEADER) === asset.hash) return;
+        // Unhashed URLs may be stale in the HTTP cache; revalidate them
+        const response = await fetch(url, { cache: "no-cache" });
+        if (response.ok) await store(cache, url, response, asset.hash);
+      })()
+    );
+  }
+  // A missing file must not keep the rest from being cached
+  await Promise.allSettled(pending);
+}
+
+async function prune() {
+  const cache = await caches.open(CACHE_NAME);
+  for (const request of await cache.keys()) {
+    const asset = assets.get(request.url);
+    const cached = await cache.match(request);
+    if (!asset || !cached || cached.headers.get(HASH_HEADER) !== asset.hash) {
+      await cache.delete(request);
+    }
+  }
+  const keep = [CACHE_NAME, FONT_CACHE_NAME];
+  for (const name of await caches.keys()) {
+    if (!keep.includes(name)) await caches.delete(name);
+  }
+}
+
+async function cacheFirst(request, asset) {
+  const cache = await caches.open(CACHE_NAME);
+  const cached = await cache.match(request.url);
+  if (cached && cached.headers.get(HASH_HEADER) === asset.hash) return cached;
+
+  const response = await fetch(request.url, { cache: "no-cache" });
+  if (response.ok) await store(cache, request.url, response.clone(), asset.hash);
+  return response;
+}
+
+async function fontCacheFirst(request) {
+  const cache = await caches.open(FONT_CACHE_NAME);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+
+  const response = await fetch(request);
+  if (response.ok && response.type === "cors") await cache.put(request, response.clone());
+  return response;
+}
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(prune().then(() => self.clients.claim()));
+});
+
+self.addEventListener("fetch", (event) => {
+  const request = event.request;
+  if (request.method !== "GET" || request.headers.has("range")) return;
+
+  const asset = assets.get(request.url);
+  if (asset) {
+    event.respondWith(cacheFirst(request, asset).catch(() => fetch(request)));
+    return;
+  }
+  if (FONT_ORIGINS.includes(new URL(request.url).origin)) {
+    event.respondWith(fontCacheFirst(request).catch(() => fetch(request)));
+  }
+});
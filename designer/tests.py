@@ -1,3 +1,251 @@
-from django.test import TestCase
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from brands.models import Brand, BrandImage
+from products import buildcache, glb, textures
+from products.data import get_bumpmap_textures
+from . import bootstrap
+from .assets import asset_manifest
+from .gallery import decode_cursor, flush_share_views, gallery_page
+from .models import Design, DesignImage, DesignShare, PublicDesignListing
+
+
+class GalleryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name='Gallery Brand')
+
+    def create_design(self, name, public=True, product=1):
+        return Design.objects.create(brand=self.brand, name=name, product=product, data={}, public=public)
+
+    def test_listing_follows_design(self):
+        design = self.create_design('Shirt')
+        self.assertEqual(PublicDesignListing.objects.get(design=design).name, 'Shirt')
+
+        design.name = 'Renamed'
+        design.save()
+        self.assertEqual(PublicDesignListing.objects.get(design=design).name, 'Renamed')
+
+        design.public = False
+        design.save()
+        self.assertFalse(PublicDesignListing.objects.filter(design=design).exists())
+
+    def test_private_design_has_no_listing(self):
+        design = self.create_design('Private', public=False)
+        self.assertFalse(PublicDesignListing.objects.filter(design=design).exists())
+
+    def test_pages_cover_every_listing_once(self):
+        designs = [self.create_design(f'Design {i}') for i in range(7)]
+        # Equal scores must be ordered by design id, not skipped or repeated
+        PublicDesignListing.objects.filter(design__in=designs[2:5]).update(score=1.5)
+
+        seen, cursor = [], None
+        while True:
+            listings, cursor = gallery_page(self.brand, cursor=cursor, per_page=3)
+            seen += [listing.design_id for listing in listings]
+            if cursor is None:
+                break
+
+        expected = list(PublicDesignListing.objects.order_by('-score', '-design_id').values_list('design_id', flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), len(designs))
+
+    def test_product_filter(self):
+        shirt = self.create_design('Shirt', product=1)
+        self.create_design('Towel', product=2)
+        listings, cursor = gallery_page(self.brand, product=1)
+        self.assertEqual([listing.design_id for listing in listings], [shirt.pk])
+        self.assertIsNone(cursor)
+
+    def test_malformed_cursor_starts_over(self):
+        self.assertIsNone(decode_cursor('garbage'))
+        self.create_design('Shirt')
+        listings, _ = gallery_page(self.brand, cursor='garbage')
+        self.assertEqual(len(listings), 1)
+
+    def test_flush_counts_views(self):
+        shared = self.create_design('Shared', public=False)
+        share = DesignShare.objects.create(design=shared, share_code='shared', views=2)
+        public = self.create_design('Public')
+
+        flush_share_views({shared.pk: 3, public.pk: 4})
+
+        share.refresh_from_db()
+        self.assertEqual(share.views, 5)
+        self.assertEqual(DesignShare.objects.get(design=public).views, 4)
+        listing = PublicDesignListing.objects.get(design=public)
+        self.assertEqual(listing.views, 4)
+
+    def test_flush_does_not_share_private_designs(self):
+        private = self.create_design('Private', public=False)
+        flush_share_views({private.pk: 5})
+        self.assertFalse(DesignShare.objects.filter(design=private).exists())
+
+
+class ImagePageTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name='Image Brand')
+        cls.user = get_user_model().objects.create_user(username='uploader', password='x')
+        # bulk_create: DesignImage.save() would read the files from media storage
+        cls.user_images = DesignImage.objects.bulk_create(
+            DesignImage(user=cls.user, name=f'Upload {i}', image=f'design_images/{i}.png') for i in range(3)
+        )[::-1]
+        cls.brand_images = [BrandImage.objects.create(brand=cls.brand, name=f'Logo {i}', image_url=f'/logo{i}.png')
+                            for i in range(4)][::-1]
+
+    def setUp(self):
+        # The thumbnail spec renders through media storage too; only the paging is under test
+        patch = mock.patch.object(bootstrap, 'user_image_dict', lambda img: {'id': f'user_{img.id}'})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def page(self, offset=0, limit=None):
+        request = RequestFactory().get('/designer/images/')
+        request.user, request.brand = self.user, self.brand
+        page = bootstrap.image_page(request, offset=offset, limit=limit)
+        return [image['id'] for image in page['images']], page['next_offset']
+
+    def test_everything_without_limit(self):
+        expected = ([f'user_{img.id}' for img in self.user_images]
+                    + [f'brand_{img.id}' for img in self.brand_images])
+        self.assertEqual(self.page(), (expected, None))
+
+        seen, offset = [], 0
+        while offset is not None:
+            ids, offset = self.page(offset, limit=2)
+            seen += ids
+        self.assertEqual(seen, expected)
+
+    def test_page_crosses_into_brand_images(self):
+        self.assertEqual(self.page(2, limit=2),
+                         ([f'user_{self.user_images[2].id}', f'brand_{self.brand_images[0].id}'], 4))
+
+    def test_offset_past_user_images(self):
+        self.assertEqual(self.page(4, limit=2),
+                         ([f'brand_{self.brand_images[1].id}', f'brand_{self.brand_images[2].id}'], 6))
+        self.assertEqual(self.page(6, limit=2), ([f'brand_{self.brand_images[3].id}'], None))
+        self.assertEqual(self.page(9, limit=2), ([], None))
+
+
+class BootstrapTests(TestCase):
+
+    url = '/designer/bootstrap/?sections=brand,catalog'
+
+    def test_known_sections_are_unchanged(self):
+        first = self.client.get(self.url).json()
+        self.assertEqual(set(first['sections']), {'brand', 'catalog'})
+        self.assertIn('fonts', first['sections']['catalog']['data'])
+
+        known = first['sections']['catalog']['etag']
+        again = self.client.get(f'{self.url}&known={known}').json()
+        self.assertEqual(again['sections']['catalog'], {'etag': known, 'unchanged': True})
+        self.assertIn('data', again['sections']['brand'])
+
+    def test_if_none_match(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{response.json()["etag"]}"')
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get('/designer/bootstrap/?sections=brand', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class DesignerAssetTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.static = Path(directory.name)
+        override = override_settings(STATICFILES_DIRS=[*settings.STATICFILES_DIRS, directory.name],
+                                     MODEL_VARIANTS_DIR=self.static / 'optimized',
+                                     BUMPMAP_VARIANTS_DIR=self.static / 'variants')
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def build_model(self, source):
+        buildcache.write_manifest({
+            'version': glb.MANIFEST_VERSION,
+            'sources': {source: 'model'},
+            'models': {'model': {'file': 'model.glb', 'bytes': 1, 'lods': []}},
+        }, self.static / 'optimized')
+
+    def build_bumpmap(self, source):
+        buildcache.write_manifest({
+            'version': textures.MANIFEST_VERSION,
+            'sources': {source: 'bump'},
+            'textures': {'bump': {'width': 2048, 'height': 2048, 'ktx2': None, 'webp': [
+                {'width': size, 'height': size, 'file': f'bump-{size}x{size}.webp', 'bytes': 1}
+                for size in (2048, 1024, 512)
+            ]}},
+        }, self.static / 'variants')
+
+    def assets(self, product, **overrides):
+        with self.settings(**overrides):
+            response = self.client.get(reverse('designer:designer'), {'product': product})
+        return response, response.context['preload_assets']
+
+    def test_link_header_follows_setting(self):
+        response, assets = self.assets(1, DESIGNER_PRELOAD_HEADER=True)
+        self.assertIn('</static/models/pro-series-hoodie.glb>; rel=preload; as=fetch; crossorigin=anonymous',
+                      response['Link'])
+        self.assertEqual(response['Link'].count('rel='), len(assets))
+
+        response, _ = self.assets(1, DESIGNER_PRELOAD_HEADER=False)
+        self.assertFalse(response.has_header('Link'))
+
+    def test_optimized_model_is_preloaded(self):
+        self.build_model('models/pro-series-hoodie.glb')
+        _, assets = self.assets(1)
+        self.assertEqual(assets[0]['href'], '/static/optimized/model.glb')
+
+    def test_bumpmap_levels_as_srcset(self):
+        link = get_bumpmap_textures()['Polyester']['link']
+        self.build_bumpmap(link[len(settings.STATIC_URL):])
+        response, assets = self.assets(1, DESIGNER_PRELOAD_HEADER=True)
+        bumpmap = next(asset for asset in assets if asset['as'] == 'image')
+        self.assertEqual(bumpmap['href'], '/static/variants/bump-1024x1024.webp')
+        self.assertEqual(bumpmap['type'], 'image/webp')
+        self.assertEqual(bumpmap['imagesrcset'],
+                         '/static/variants/bump-1024x1024.webp 1x, /static/variants/bump-2048x2048.webp 2x')
+        self.assertIn(f'imagesrcset="{bumpmap["imagesrcset"]}"', response['Link'])
+
+    def test_bumpmap_needs_a_layer_that_takes_it(self):
+        _, assets = self.assets(1)
+        self.assertIn('image', [asset['as'] for asset in assets])
+        # The cornhole board has a bumpmap but no layer that can change it
+        _, assets = self.assets(4)
+        self.assertNotIn('image', [asset['as'] for asset in assets])
+
+    def test_service_worker_manifest_follows_file_content(self):
+        self.build_model('models/pro-series-hoodie.glb')
+        model = self.static / 'optimized' / 'model.glb'
+
+        def fetch(content):
+            model.write_bytes(content)
+            response = self.client.get(reverse('designer:service_worker'))
+            entry = next(asset for asset in asset_manifest()['assets'] if asset['url'] == '/static/optimized/model.glb')
+            self.assertTrue(entry['precache'])
+            self.assertIn(f'"hash": "{entry["hash"]}"', response.content.decode())
+            return entry['hash'], response['ETag']
+
+        first_hash, first_etag = fetch(b'glTF one')
+        second_hash, second_etag = fetch(b'glTF second')
+        self.assertEqual(first_hash, buildcache.content_hash(b'glTF one'))
+        self.assertEqual(second_hash, buildcache.content_hash(b'glTF second'))
+        self.assertNotEqual(first_etag, second_etag)
+        self.assertEqual(second_etag, f'"{asset_manifest()["version"]}"')
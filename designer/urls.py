@@ -5,12 +5,15 @@ app_name = 'designer'
 
 urlpatterns = [
     path('', views.designer_view, name='designer'),
+    path('sw.js', views.service_worker, name='service_worker'),
+    path('bootstrap/', views.designer_bootstrap, name='bootstrap'),
     path('save/', views.save_design, name='save_design'),
     path('update-visibility/<int:design_id>/', views.update_design_visibility, name='update_design_visibility'),
     path('delete/<int:design_id>/', views.delete_design, name='delete_design'),
     path('share/<int:design_id>/', views.design_share, name='design_share'),
     path('copy/<int:design_id>/', views.copy_design, name='copy_design'),
     path('my-designs/', views.my_designs, name='my_designs'),
+    path('gallery/', views.gallery, name='gallery'),
     
     # Template related URLs
     path('templates/', views.select_template, name='select_template'),
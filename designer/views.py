@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponseNotModified, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
@@ -9,11 +10,18 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 import json
 from .models import Design, DesignTemplate, DesignShare, DesignImage
-from brands.models import Brand, BrandBackground, BrandImageCategory, BrandImage
+from .assets import asset_manifest, designer_assets, environment_map_url, link_header
+from . import bootstrap
+from .gallery import gallery_page, record_share_view
+from core.db import write_transaction
+from core.querycount import query_budget
+from brands.models import Brand
 from products.models import Product
-from products.data import products as PRODUCTS_DATA, bumpmap_textures as BUMPMAPS_DATA, fonts as FONTS_DATA, get_product_by_id
+from products.data import get_products, get_bumpmap_textures, get_fonts, get_product_by_id, products_json
+from products.fonts import font_stylesheet
 
 
+@query_budget(10)
 def designer_view(request):
     """Main designer interface view"""
     # Get current brand from middleware
@@ -25,171 +33,112 @@ def designer_view(request):
         is_brand_owner = request.user.is_brand_owner
     
     # Get product ID and design ID from URL
-    product_id = request.GET.get('product', 0)
     design_id = request.GET.get('design')
-    template_id = request.GET.get('template')
     create_template = request.GET.get('create_template') == '1'
-    template_edit_id = request.GET.get('template_edit')
-    
-    # Convert to int
-    try:
-        product_id = int(product_id)
-    except (ValueError, TypeError):
-        product_id = 0
-        
-    # Find the current product from static data
-    current_product = None
-    if product_id is not None:
-        current_product = get_product_by_id(product_id)
     
-    # Fall back to first product if none specified or not found
-    if not current_product and PRODUCTS_DATA:
-        current_product = PRODUCTS_DATA[0]
-        product_id = current_product['id']
+    # Find the current product from static data, falling back to the first product
+    current_product = bootstrap.current_product(request.GET.get('product', 0))
+    product_id = current_product.id if current_product else 0
     
     # Load design data if design ID is provided
-    design_data = None
-    if design_id:
-        try:
-            if request.user.is_authenticated:
-                # Try to load user's design
-                design = Design.objects.get(id=design_id, user=request.user)
-            else:
-                # Try to load guest's design using session_id
-                if not request.session.session_key:
-                    request.session.create()
-                design = Design.objects.get(id=design_id, session_id=request.session.session_key)
-            
-            design_data = {
-                'id': design.id,
-                'name': design.name,
-                'product_id': design.product,
-                'design_data': design.data,
-                'screenshots': {
-                    'front': design.thumbnail_front.url if design.thumbnail_front else '',
-                    'back': design.thumbnail_back.url if design.thumbnail_back else '',
-                    'left': design.thumbnail_left.url if design.thumbnail_left else '',
-                    'right': design.thumbnail_right.url if design.thumbnail_right else ''
-                }
-            }
-        except Design.DoesNotExist:
-            pass
+    design_data = bootstrap.design_section(request, design_id)
     
-    # Load template data if template ID is provided
-    template_data = None
-    is_editing_template = False
+    # Load template data (?template=) or a template to edit (?template_edit=, brand owners)
+    template_data, is_editing_template = bootstrap.template_section(
+        current_brand, request.GET.get('template'), request.GET.get('template_edit'), is_brand_owner
+    )
     
-    if template_id:
-        try:
-            template_id = int(template_id)
-            template = DesignTemplate.objects.get(
-                id=template_id,
-                brand=current_brand,
-                is_active=True
-            )
-            template_data = {
-                'id': template.id,
-                'name': template.name,
-                'product': template.product,
-                'design_data': template.design_data,
-                'thumbnails': {
-                    'front': template.thumbnail_front,
-                    'back': template.thumbnail_back,
-                    'left': template.thumbnail_left,
-                    'right': template.thumbnail_right
-                }
-            }
-        except (ValueError, DesignTemplate.DoesNotExist):
-            pass
-    
-    # Load template for editing if template_edit_id is provided
-    elif template_edit_id and is_brand_owner:
-        try:
-            template_edit_id = int(template_edit_id)
-            template = DesignTemplate.objects.get(
-                id=template_edit_id,
-                brand=current_brand
-            )
-            template_data = {
-                'id': template.id,
-                'name': template.name,
-                'product': template.product,
-                'design_data': template.design_data,
-                'thumbnails': {
-                    'front': template.thumbnail_front,
-                    'back': template.thumbnail_back,
-                    'left': template.thumbnail_left,
-                    'right': template.thumbnail_right
-                }
-            }
-            is_editing_template = True
-        except (ValueError, DesignTemplate.DoesNotExist):
-            pass
-    
-    # Convert static product dict to ensure JavaScript compatibility
-    def product_to_dict(product):
-        if not product:
-            return None
-        # Static product is already a dict, just return it
-        return product
-    
-    # Get brand backgrounds
-    brand_backgrounds = []
-    if current_brand:
-        backgrounds = BrandBackground.objects.filter(
-            brand=current_brand,
-            is_active=True
-        ).order_by('sort_order', 'name')
-        
-        brand_backgrounds = [
-            {
-                'id': bg.id,
-                'name': bg.name,
-                'image_url': bg.image_url,
-                'thumbnail_url': bg.thumbnail_url,
-                'is_default': bg.is_default,
-            }
-            for bg in backgrounds
-        ]
-    
-    # Get image categories for image bank
-    image_categories = []
-    if current_brand:
-        categories = BrandImageCategory.objects.filter(brand=current_brand).order_by('name')
-        image_categories = [
-            {
-                'id': cat.id,
-                'name': cat.name,
-                'slug': cat.slug,
-                'description': cat.description,
-            }
-            for cat in categories
-        ]
+    # Get brand backgrounds and image categories for image bank
+    brand_backgrounds = bootstrap.brand_backgrounds(current_brand)
+    image_categories = bootstrap.image_categories(current_brand)
     
+    bumpmaps = get_bumpmap_textures()
+    preload_assets = designer_assets(current_product, bumpmaps, brand_backgrounds)
+    web_fonts = font_stylesheet(get_fonts())
+
     context = {
         'page_title': 'Designer',
+        'service_worker': settings.DESIGNER_SERVICE_WORKER,
         'current_brand': current_brand,
         'user': request.user if request.user.is_authenticated else None,
         'is_guest': not request.user.is_authenticated,
         'is_brand_owner': is_brand_owner,
         'current_product': current_product,  # Raw product object for template HTML
-        'current_product_json': json.dumps(product_to_dict(current_product)) if current_product else 'null',  # JSON for JavaScript
+        'current_product_json': json.dumps(bootstrap.product_section(current_product)) if current_product else 'null',  # JSON for JavaScript
         'product_id': product_id,
         'design_data': json.dumps(design_data) if design_data else None,
         'template_data': json.dumps(template_data) if template_data else None,
         'is_editing_template': is_editing_template,
         'create_template': create_template,
-        'bumpmaps': json.dumps(BUMPMAPS_DATA),
-        'fonts': json.dumps(FONTS_DATA),
-        'fonts_list': FONTS_DATA,  # Pass the raw list for template iteration
+        'bumpmaps': json.dumps(bumpmaps),
+        'fonts': json.dumps(get_fonts()),
+        'fonts_list': get_fonts(),  # Pass the raw list for template iteration
+        'font_css_url': web_fonts['css'],
+        'google_fonts': web_fonts['google'],  # Families not self-hosted yet
         'brand_backgrounds': json.dumps(brand_backgrounds),
         'image_categories': json.dumps(image_categories),
+        'preload_assets': preload_assets,
+        'environment_map_url': environment_map_url(),
     }
     
-    return render(request, 'designer/designer.html', context)
+    response = render(request, 'designer/designer.html', context)
+    if settings.DESIGNER_PRELOAD_HEADER:
+        # Cloudflare sends this as 103 Early Hints on later requests
+        response['Link'] = link_header(preload_assets)
+    return response
+
+
+@query_budget(8)
+@require_http_methods(["GET"])
+def designer_bootstrap(request):
+    """
+    Everything the designer needs to start, in one response (see
+    designer.bootstrap). Sections the client sends in ?known= come back
+    as unchanged.
+    """
+    data = bootstrap.bootstrap(request)
+    etag = f'"{data["etag"]}"'
+    # Per user and session, so only the browser may keep it, and must revalidate
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache', 'Vary': 'Cookie'}
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(data)
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+@query_budget(6)
+def service_worker(request):
+    """The designer's asset-caching service worker, with the asset manifest inlined"""
+    manifest = asset_manifest()
+    response = render(request, 'designer/sw.js', {
+        'manifest': json.dumps(manifest),
+        'font_origins': json.dumps(settings.DESIGNER_SW_FONT_ORIGINS),
+    }, content_type='application/javascript')
+    # Browsers revalidate workers anyway; make sure proxies do too
+    response['Cache-Control'] = 'no-cache'
+    response['ETag'] = f'"{manifest["version"]}"'
+    return response
 
 
 
+def _store_thumbnails(design, thumbnails):
+    """
+    Upload thumbnail files to storage and point the design at them.
+    Done before the database write so the write lock is never held during
+    storage I/O (uploads to R2 can take hundreds of milliseconds).
+    """
+    for field_name, upload in thumbnails.items():
+        if not upload:
+            continue
+        field = design._meta.get_field(field_name)
+        name = field.generate_filename(design, upload.name)
+        setattr(design, field_name, field.storage.save(name, upload, max_length=field.max_length))
+
+
+@query_budget(12)
 @require_http_methods(["POST"])
 def save_design(request):
     """Save or update a design"""
@@ -211,10 +160,10 @@ def save_design(request):
         design_data = json.loads(request.POST.get('data'))  # Parse JSON from form field
         
         # Get uploaded thumbnail files directly (no base64 processing needed!)
-        thumbnail_front = request.FILES.get('thumbnail_front')
-        thumbnail_back = request.FILES.get('thumbnail_back')
-        thumbnail_left = request.FILES.get('thumbnail_left')
-        thumbnail_right = request.FILES.get('thumbnail_right')
+        thumbnails = {
+            field: request.FILES.get(field)
+            for field in ('thumbnail_front', 'thumbnail_back', 'thumbnail_left', 'thumbnail_right')
+        }
     except (ValueError, json.JSONDecodeError) as e:
         return JsonResponse({'success': False, 'error': f'Invalid request data: {str(e)}'})
     
@@ -241,39 +190,24 @@ def save_design(request):
                 design.name = name
                 design.product = product
                 design.brand = current_brand
-                # Only update thumbnails if new ones were provided (files come directly from request.FILES)
-                if thumbnail_front:
-                    design.thumbnail_front = thumbnail_front
-                if thumbnail_back:
-                    design.thumbnail_back = thumbnail_back
-                if thumbnail_left:
-                    design.thumbnail_left = thumbnail_left
-                if thumbnail_right:
-                    design.thumbnail_right = thumbnail_right
                 design.data = design_data
                 design.public = is_public
-                design.save()
             else:
                 # Create new guest design
-                design_kwargs = {
-                    'session_id': session_id,
-                    'brand': current_brand,
-                    'name': name,
-                    'product': product,
-                    'data': design_data,
-                    'public': is_public
-                }
-                # Only add thumbnails if they exist (files come directly from request.FILES)
-                if thumbnail_front:
-                    design_kwargs['thumbnail_front'] = thumbnail_front
-                if thumbnail_back:
-                    design_kwargs['thumbnail_back'] = thumbnail_back
-                if thumbnail_left:
-                    design_kwargs['thumbnail_left'] = thumbnail_left
-                if thumbnail_right:
-                    design_kwargs['thumbnail_right'] = thumbnail_right
-                
-                design = Design.objects.create(**design_kwargs)
+                design = Design(
+                    session_id=session_id,
+                    brand=current_brand,
+                    name=name,
+                    product=product,
+                    data=design_data,
+                    public=is_public
+                )
+            
+            # Only update thumbnails if new ones were provided (files come directly from request.FILES)
+            _store_thumbnails(design, thumbnails)
+            
+            with write_transaction():
+                design.save()
             
             return JsonResponse({
                 'success': True,
@@ -303,39 +237,24 @@ def save_design(request):
                 design.name = name
                 design.product = product
                 design.brand = current_brand
-                # Only update thumbnails if new ones were provided (files come directly from request.FILES)
-                if thumbnail_front:
-                    design.thumbnail_front = thumbnail_front
-                if thumbnail_back:
-                    design.thumbnail_back = thumbnail_back
-                if thumbnail_left:
-                    design.thumbnail_left = thumbnail_left
-                if thumbnail_right:
-                    design.thumbnail_right = thumbnail_right
                 design.data = design_data
                 design.public = is_public
-                design.save()
             else:
                 # Create new design
-                design_kwargs = {
-                    'user': request.user,
-                    'brand': current_brand,
-                    'name': name,
-                    'product': product,
-                    'data': design_data,
-                    'public': is_public
-                }
-                # Only add thumbnails if they exist (files come directly from request.FILES)
-                if thumbnail_front:
-                    design_kwargs['thumbnail_front'] = thumbnail_front
-                if thumbnail_back:
-                    design_kwargs['thumbnail_back'] = thumbnail_back
-                if thumbnail_left:
-                    design_kwargs['thumbnail_left'] = thumbnail_left
-                if thumbnail_right:
-                    design_kwargs['thumbnail_right'] = thumbnail_right
-                
-                design = Design.objects.create(**design_kwargs)
+                design = Design(
+                    user=request.user,
+                    brand=current_brand,
+                    name=name,
+                    product=product,
+                    data=design_data,
+                    public=is_public
+                )
+            
+            # Only update thumbnails if new ones were provided (files come directly from request.FILES)
+            _store_thumbnails(design, thumbnails)
+            
+            with write_transaction():
+                design.save()
             
             return JsonResponse({
                 'success': True,
@@ -370,6 +289,9 @@ def design_share(request, design_id):
         # Get product info
         product_info = get_product_by_id(design.product)
         
+        # Count the view (buffered, flushed to DesignShare in batches)
+        record_share_view(design.id)
+        
         context = {
             'page_title': f"{design.name} - Shared Design",
             'design': design,
@@ -387,6 +309,40 @@ def design_share(request, design_id):
         return redirect('/404')
 
 
+@query_budget(9)
+def gallery(request):
+    """Public design gallery for the current brand"""
+    current_brand = getattr(request, 'brand', None)
+    cursor = request.GET.get('cursor')
+    
+    # Optional product filter
+    product_id = request.GET.get('product')
+    try:
+        product_id = int(product_id) if product_id else None
+    except (ValueError, TypeError):
+        product_id = None
+    
+    listings, next_cursor = gallery_page(current_brand, cursor=cursor, product=product_id)
+    
+    # Attach product names from static data
+    for listing in listings:
+        product_info = get_product_by_id(listing.product)
+        listing.product_name = product_info.name if product_info else f"Product {listing.product}"
+    
+    context = {
+        'page_title': 'Design Gallery',
+        'current_brand': current_brand,
+        'listings': listings,
+        'next_cursor': next_cursor,
+        'is_first_page': not cursor,
+        'selected_product': product_id,
+        'products': [p for p in get_products() if p.can_order],
+    }
+    
+    return render(request, 'designer/gallery.html', context)
+
+
+@query_budget(12)
 def my_designs(request):
     """View for user's saved designs - supports both guest and authenticated users"""
     from django.core.paginator import Paginator
@@ -468,9 +424,9 @@ def my_designs(request):
         'recent_designs': recent_designs,
         'products_designed': unique_products,
         'has_search_or_filter': bool(search) or order_by != 'updated_desc',
-        'products_data': json.dumps(PRODUCTS_DATA),  # For JavaScript
-        'bumpmaps_data': json.dumps(BUMPMAPS_DATA),
-        'fonts_data': json.dumps(FONTS_DATA),
+        'products_data': products_json(),  # For JavaScript
+        'bumpmaps_data': json.dumps(get_bumpmap_textures()),
+        'fonts_data': json.dumps(get_fonts()),
     }
     
     return render(request, 'designer/my_designs.html', context)
@@ -665,64 +621,27 @@ def select_template(request):
     return render(request, 'designer/select_template.html', context)
 
 
+@query_budget(6)
 @require_http_methods(["GET"])
 def user_images_api(request):
-    """API endpoint to get user's design images and brand images"""
+    """
+    API endpoint to get user's design images and brand images.
+    ?offset=&limit= return one page; without limit, all of them.
+    """
     try:
-        image_data = []
-        
-        # Get user uploaded images (DesignImage)
-        if request.user.is_authenticated:
-            user_images = DesignImage.objects.filter(user=request.user)
-        else:
-            # For guest users, use session ID
-            session_key = request.session.session_key
-            if not session_key:
-                # Create session if it doesn't exist
-                request.session.create()
-                session_key = request.session.session_key
-            
-            user_images = DesignImage.objects.filter(session_id=session_key)
-        
-        # Add user uploaded images
-        for img in user_images:
-            image_data.append({
-                'id': f'user_{img.id}',
-                'name': img.name,
-                'image_url': img.image.url,
-                'thumbnail_url': img.thumbnail.url if img.thumbnail else img.image.url,
-                'width': img.width,
-                'height': img.height,
-                'file_size': img.file_size,
-                'filetype': img.filetype,
-                'created_at': img.created_at.isoformat(),
-                'source': 'user',
-                'category_id': None
-            })
-        
-        # Get brand images
-        current_brand = request.brand
-        if current_brand:
-            brand_images = BrandImage.objects.filter(brand=current_brand).select_related('category')
-            
-            for img in brand_images:
-                image_data.append({
-                    'id': f'brand_{img.id}',
-                    'name': img.name,
-                    'image_url': img.image_url,
-                    'thumbnail_url': img.thumbnail_url or img.image_url,
-                    'width': img.width,
-                    'height': img.height,
-                    'file_size': img.file_size,
-                    'filetype': 'jpg',  # Default for brand images
-                    'created_at': img.created_at.isoformat(),
-                    'source': 'brand',
-                    'category_id': img.category.id if img.category else None
-                })
-        
+        try:
+            offset = max(int(request.GET.get('offset', 0)), 0)
+            limit = int(request.GET['limit']) if 'limit' in request.GET else None
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Invalid offset or limit'}, status=400)
+        if limit is not None:
+            limit = min(max(limit, 1), getattr(settings, 'DESIGNER_IMAGE_PAGE_MAX', 200))
+
+        page = bootstrap.image_page(request, offset=offset, limit=limit)
         return JsonResponse({
             'success': True,
-            'images': image_data
+            'images': page['images'],
+            'next_offset': page['next_offset'],
         })
         
     except Exception as e:
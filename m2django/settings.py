@@ -55,13 +55,20 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticAssetMiddleware',  # Static files short-circuit everything below
+    'core.middleware.TelemetryMiddleware',  # Outermost so its timings cover the whole stack
+    'core.middleware.SlowQueryMiddleware',  # Sees middleware queries too
+    'core.middleware.QueryCountMiddleware',  # Outermost app middleware so every query is counted
+    'core.middleware.ReplicaRoutingMiddleware',  # Before sessions so session saves count as writes
     'django.contrib.sessions.middleware.SessionMiddleware',
     'brands.middleware.BrandMiddleware',  # Add brand detection early
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'brands.middleware.BrandAccessMiddleware',  # request.brand_access (needs request.user)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ProfilingMiddleware',  # Last: profiles just the view and its rendering
 ]
 
 ROOT_URLCONF = 'm2django.urls'
@@ -98,6 +105,80 @@ DATABASES = {
     }
 }
 
+# Database profile: 'development' (SQLite defaults) or 'production'
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'development').lower()
+
+# PRAGMAs applied to every new SQLite connection (see core.db.configure_sqlite)
+# WAL lets readers run alongside the single writer, NORMAL sync is durable in
+# WAL mode, busy_timeout makes writers wait instead of raising "database is locked"
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # milliseconds
+    'mmap_size': 268435456,  # 256MB
+    'cache_size': -64000,  # 64MB (negative values are KiB)
+    'temp_store': 'MEMORY',
+}
+
+if DATABASE_PROFILE == 'production':
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    DATABASES['default']['OPTIONS'] = {
+        # Python-level lock wait, matches busy_timeout
+        'timeout': 5,
+    }
+else:
+    SQLITE_PRAGMAS = {}
+
+# Optional read replica. Read-only views (REPLICA_READ_VIEWS) read from it;
+# everything else, and any request that writes, uses the primary.
+# For local testing point DATABASE_REPLICA_NAME at a second SQLite file.
+DATABASE_REPLICA_NAME = os.getenv('DATABASE_REPLICA_NAME', '')
+
+if DATABASE_REPLICA_NAME:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DATABASE_REPLICA_NAME,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICA_ALIAS = 'replica'
+else:
+    DATABASE_REPLICA_ALIAS = None
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+# Cache shared by every worker process. Without REDIS_URL Django uses
+# per-process local memory, and data that signals invalidate (brand price
+# maps, see core.caches.is_shared) is then not cached between requests:
+# dropping it in one worker would leave the others stale.
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Seconds a client stays pinned to the primary after its own write
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
+REPLICA_READ_VIEWS = [
+    'products:list',
+    'products:category',
+    'products:detail',
+    'brands:catalog',
+    'brands:images',
+    'brands:image_categories',
+    'brands:api_backgrounds',
+    'brands:api_public_templates',
+    'brands:earnings',
+    'designer:my_designs',
+    'designer:design_share',
+    'designer:gallery',
+    'designer:user_images_api',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -169,6 +250,134 @@ STATICFILES_DIRS = [
 # Site configuration
 SITE_NAME = 'Model2Design'
 
+# Buffered counters (share views, template usage)
+# Increments are held in memory and written back every COUNTER_FLUSH_INTERVAL
+# seconds or once COUNTER_MAX_PENDING keys are buffered. 0 writes immediately.
+COUNTER_FLUSH_INTERVAL = int(os.getenv('COUNTER_FLUSH_INTERVAL', '10'))
+COUNTER_MAX_PENDING = int(os.getenv('COUNTER_MAX_PENDING', '500'))
+
+# Seconds a brand's dashboard snapshot (brands.stats) stays cached.
+# Product, template, image and earnings changes drop it straight away.
+BRAND_STATS_CACHE_TIMEOUT = int(os.getenv('BRAND_STATS_CACHE_TIMEOUT', '60'))
+
+# Seconds a brand's price map (brands.pricing) stays cached when the cache
+# is shared (REDIS_URL). BrandProduct saves/deletes drop it straight away.
+BRAND_PRICING_CACHE_TIMEOUT = int(os.getenv('BRAND_PRICING_CACHE_TIMEOUT', '3600'))
+
+# Brand storefront catalogs (products.catalog) each worker keeps in memory;
+# the least recently used brands are dropped beyond this.
+BRAND_CATALOG_CACHE_SIZE = int(os.getenv('BRAND_CATALOG_CACHE_SIZE', '100'))
+
+# Static product catalog (products.data). Workers check the file's mtime at
+# most every PRODUCT_CATALOG_CHECK_INTERVAL seconds and reload it when it
+# changes; validated copies are pickled to PRODUCT_CATALOG_CACHE_DIR, a
+# directory only this user may write (created 0700).
+PRODUCT_CATALOG_PATH = Path(os.getenv('PRODUCT_CATALOG_PATH', BASE_DIR / 'products' / 'catalog.json'))
+PRODUCT_CATALOG_CHECK_INTERVAL = float(os.getenv('PRODUCT_CATALOG_CHECK_INTERVAL', '2'))
+PRODUCT_CATALOG_CACHE_DIR = Path(os.getenv('PRODUCT_CATALOG_CACHE_DIR', BASE_DIR / '.cache' / 'catalog'))
+
+# Query counting (core.querycount). On by default with DEBUG: logs likely
+# N+1 loops (one query shape repeated QUERY_DUPLICATE_THRESHOLD+ times in a
+# request) and views over their @query_budget. QUERY_BUDGET_STRICT raises
+# instead of logging; the test suite turns it on.
+QUERY_COUNT_ENABLED = os.getenv('QUERY_COUNT_ENABLED', str(DEBUG)).lower() == 'true'
+QUERY_DUPLICATE_THRESHOLD = int(os.getenv('QUERY_DUPLICATE_THRESHOLD', '3'))
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'false').lower() == 'true'
+
+# Sampled request telemetry (core.telemetry): db, template, storage and cache
+# timings per request. TELEMETRY_BRAND_SAMPLE_RATES overrides the rate per
+# subdomain ("acme=1,beta=0.25"; "default" is the main domain). Records are
+# written as JSON lines to TELEMETRY_LOG_PATH; TELEMETRY_SERVER_TIMING also
+# exposes the timings to the browser in a Server-Timing header.
+TELEMETRY_ENABLED = os.getenv('TELEMETRY_ENABLED', 'false').lower() == 'true'
+TELEMETRY_SAMPLE_RATE = float(os.getenv('TELEMETRY_SAMPLE_RATE', '0.01'))
+TELEMETRY_BRAND_SAMPLE_RATES = {
+    subdomain.strip(): float(rate)
+    for subdomain, _, rate in (
+        item.partition('=') for item in os.getenv('TELEMETRY_BRAND_SAMPLE_RATES', '').split(',') if item.strip()
+    )
+}
+TELEMETRY_LOG_PATH = os.getenv('TELEMETRY_LOG_PATH', '')
+TELEMETRY_SERVER_TIMING = os.getenv('TELEMETRY_SERVER_TIMING', str(DEBUG)).lower() == 'true'
+
+# On-demand profiling of staff requests (core.profiling), off by default.
+# Staff add ?_profile=1 or send an X-Profile-Token from `manage.py
+# profile_token`; the folded-stack profile is downloadable from the admin.
+# One profile runs per process at a time, for at most PROFILING_MAX_SECONDS,
+# and the sampler backs off above PROFILING_MAX_OVERHEAD of wall time.
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILING_INTERVAL_MS = float(os.getenv('PROFILING_INTERVAL_MS', '5'))
+PROFILING_MAX_SECONDS = float(os.getenv('PROFILING_MAX_SECONDS', '30'))
+PROFILING_MAX_OVERHEAD = float(os.getenv('PROFILING_MAX_OVERHEAD', '0.05'))
+PROFILING_TOKEN_MAX_AGE = int(os.getenv('PROFILING_TOKEN_MAX_AGE', '3600'))
+PROFILING_KEEP = int(os.getenv('PROFILING_KEEP', '200'))
+
+# Slow-query log (core.slowlog). Queries slower than SLOW_QUERY_THRESHOLD_MS
+# are logged with their view, brand and user type and aggregated into the
+# SlowQuery admin (written back by the counter flusher). Rows not seen for
+# SLOW_QUERY_WINDOW_HOURS are dropped; the admin index shows the top N.
+SLOW_QUERY_ENABLED = os.getenv('SLOW_QUERY_ENABLED', 'true').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERY_WINDOW_HOURS = int(os.getenv('SLOW_QUERY_WINDOW_HOURS', '168'))
+SLOW_QUERY_TOP_N = int(os.getenv('SLOW_QUERY_TOP_N', '10'))
+
+# Static asset pipeline (core.staticfiles). With STATIC_PIPELINE on (the
+# default when DEBUG is off) collectstatic writes content-hashed copies and
+# .gz/.br variants to STATIC_ROOT. With STATIC_SERVE on, StaticAssetMiddleware
+# serves them, negotiating Accept-Encoding. Hashed names are cached for a
+# year as immutable; plain paths for STATIC_UNHASHED_MAX_AGE seconds.
+STATIC_ROOT = Path(os.getenv('STATIC_ROOT', BASE_DIR / 'staticfiles'))
+STATIC_PIPELINE = os.getenv('STATIC_PIPELINE', str(not DEBUG)).lower() == 'true'
+STATIC_SERVE = os.getenv('STATIC_SERVE', str(STATIC_PIPELINE)).lower() == 'true'
+STATIC_UNHASHED_MAX_AGE = int(os.getenv('STATIC_UNHASHED_MAX_AGE', '300'))
+STATIC_COMPRESS_MIN_SIZE = int(os.getenv('STATIC_COMPRESS_MIN_SIZE', '512'))
+STATICFILES_BACKEND = (
+    'core.staticfiles.CompressedManifestStaticFilesStorage' if STATIC_PIPELINE
+    else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+
+# Compressed bumpmap variants (products.textures). Build them with
+# `manage.py build_texture_variants` before collectstatic; until then the
+# designer loads the original PNGs. The directory must be inside
+# STATICFILES_DIRS.
+BUMPMAP_VARIANTS_DIR = Path(os.getenv('BUMPMAP_VARIANTS_DIR', BASE_DIR / 'core' / 'static' / 'bumpmaps' / 'variants'))
+BUMPMAP_VARIANT_MAX_SIZE = int(os.getenv('BUMPMAP_VARIANT_MAX_SIZE', '2048'))
+BUMPMAP_VARIANT_MIN_SIZE = int(os.getenv('BUMPMAP_VARIANT_MIN_SIZE', '256'))
+
+# Optimized product models (products.glb). Build them with
+# `manage.py optimize_models` before collectstatic; until then the designer
+# loads the original GLBs. LOD ratios (e.g. "0.5,0.25") need gltfpack. The
+# directory must be inside STATICFILES_DIRS.
+MODEL_VARIANTS_DIR = Path(os.getenv('MODEL_VARIANTS_DIR', BASE_DIR / 'core' / 'static' / 'models' / 'optimized'))
+MODEL_LOD_RATIOS = os.getenv('MODEL_LOD_RATIOS', '')
+
+# Announce the designer's model, bumpmap and environment map in a Link
+# header (designer.assets) as well as in <link rel=preload> tags. Cloudflare
+# turns it into 103 Early Hints.
+DESIGNER_PRELOAD_HEADER = os.getenv('DESIGNER_PRELOAD_HEADER', 'true').lower() == 'true'
+
+# Service worker caching the designer's models, bumpmaps and thumbnails
+# cache-first (designer/sw.js). Turning it off makes the designer page
+# unregister workers that are already installed.
+DESIGNER_SERVICE_WORKER = os.getenv('DESIGNER_SERVICE_WORKER', 'true').lower() == 'true'
+DESIGNER_SW_FONT_ORIGINS = ['https://fonts.gstatic.com']
+
+# Image bank page size for /designer/bootstrap/ and the largest ?limit= the
+# images API accepts
+DESIGNER_IMAGE_PAGE_SIZE = int(os.getenv('DESIGNER_IMAGE_PAGE_SIZE', '48'))
+DESIGNER_IMAGE_PAGE_MAX = int(os.getenv('DESIGNER_IMAGE_PAGE_MAX', '200'))
+
+# Self-hosted designer fonts (products.fonts). Put each family's .ttf/.otf
+# files in FONT_SOURCES_DIR/<Family Name>/ and run `manage.py build_fonts`
+# before collectstatic; families without sources load from Google Fonts.
+# The output directory must be inside STATICFILES_DIRS. FONT_SUBSET_RANGES
+# is a CSS unicode-range; unset, it is Google Fonts' "latin" range
+# (products.fonts.DEFAULT_SUBSET_RANGES).
+FONT_SOURCES_DIR = Path(os.getenv('FONT_SOURCES_DIR', BASE_DIR / 'core' / 'fonts'))
+FONT_OUTPUT_DIR = Path(os.getenv('FONT_OUTPUT_DIR', BASE_DIR / 'core' / 'static' / 'webfonts'))
+FONT_WEIGHTS = (400, 700)
+FONT_SUBSET_RANGES = os.getenv('FONT_SUBSET_RANGES')
+
 
 # PIL/Pillow Settings for handling large images
 from PIL import Image
@@ -217,7 +426,7 @@ if USE_R2_STORAGE:
             "BACKEND": "core.storage_backends.R2MediaStorage",
         },
         "staticfiles": {
-            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+            "BACKEND": STATICFILES_BACKEND,
         },
     }
     
@@ -243,7 +452,7 @@ else:
             "BACKEND": "django.core.files.storage.FileSystemStorage",
         },
         "staticfiles": {
-            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+            "BACKEND": STATICFILES_BACKEND,
         },
     }
     # Media files URL for local storage
@@ -0,0 +1,101 @@
+"""
+Shared plumbing for the offline asset builds
+
+build_texture_variants, optimize_models and build_fonts each write
+content-hashed files into a directory under STATICFILES_DIRS, plus a
+manifest.json that the running site reads to find them. This module holds
+what they have in common: locating static files, hashing, the manifest
+itself and the URL an output is served from.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def static_root_dirs():
+    return [Path(directory) for directory in settings.STATICFILES_DIRS]
+
+
+def source_path(link):
+    """The file under STATICFILES_DIRS that a /static/... link points at, or None"""
+    if not link or not link.startswith(settings.STATIC_URL):
+        return None
+    relative = link[len(settings.STATIC_URL):]
+    for directory in static_root_dirs():
+        candidate = directory / relative
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def static_name(path):
+    """The static name (relative to its STATICFILES_DIRS entry) of a file"""
+    path = Path(path).resolve()
+    for directory in static_root_dirs():
+        try:
+            return path.relative_to(directory.resolve()).as_posix()
+        except ValueError:
+            continue
+    raise ValueError(f"{path} is not under STATICFILES_DIRS")
+
+
+def static_url(name):
+    # Through the staticfiles storage so the pipeline's hashed URL is used
+    # once collectstatic has seen the file
+    try:
+        return staticfiles_storage.url(name)
+    except ValueError:
+        return settings.STATIC_URL + name
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_hash(path):
+    """content_hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def manifest_mtime(directory):
+    """st_mtime_ns of a build's manifest, or None before the first build"""
+    try:
+        return (Path(directory) / MANIFEST_NAME).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_manifest(directory, version, **empty):
+    """
+    The manifest in directory, or a fresh {'version': version, **empty}
+    when it is missing, unreadable or from another manifest version
+    """
+    try:
+        with open(Path(directory) / MANIFEST_NAME, encoding='utf-8') as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get('version') != version:
+        return {'version': version, **empty}
+    return manifest
+
+
+def write_manifest(manifest, directory):
+    """Write atomically; running workers may be reading it"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(tmp_path, directory / MANIFEST_NAME)
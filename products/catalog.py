@@ -0,0 +1,98 @@
+"""
+Per-brand storefront catalog
+
+Joins the static catalog (products.data) with a brand's BrandProduct rows:
+availability, effective price tiers and category counts. Each brand's
+catalog is built once and kept in process memory, shared by every request.
+It is keyed by the version of the brand's price map, a hash of the
+BrandProduct rows it was compiled from, and the catalog file's version. A
+worker therefore rebuilds as soon as it loads a price map with different
+rows or reloads the catalog file; nothing has to reach every process. The
+BRAND_CATALOG_CACHE_SIZE most recently used brands are kept.
+
+A brand without any BrandProduct rows sells the full static catalog.
+Once a brand has rows, only its available products are listed.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+
+from django.conf import settings
+from django.utils.text import slugify
+
+from brands.pricing import load_price_map
+from .data import get_catalog
+
+# brand id -> (version, BrandCatalog), least recently used first
+_catalogs = OrderedDict()
+_catalogs_lock = threading.Lock()
+
+
+class BrandCatalog:
+    """A brand's storefront products, with brand prices and category counts"""
+
+    def __init__(self, brand_id, products):
+        self.brand_id = brand_id
+        self.products = products
+        self.by_id = {product.id: product for product in products}
+
+        counts = {}
+        self.by_category = {}
+        for product in products:
+            for category in product.categories:
+                if category not in counts:
+                    counts[category] = {'name': category, 'slug': slugify(category), 'count': 0}
+                counts[category]['count'] += 1
+                self.by_category.setdefault(category, []).append(product)
+
+        self.category_counts = sorted(counts.values(), key=lambda x: x['name'])
+        self.categories_by_slug = {category['slug']: category['name'] for category in self.category_counts}
+
+    def __len__(self):
+        return len(self.products)
+
+    def get(self, product_id):
+        return self.by_id.get(product_id)
+
+    def in_category(self, category_name):
+        return self.by_category.get(category_name, [])
+
+    @classmethod
+    def build(cls, brand, price_map):
+        """Merge products.data with the brand's availability and price overrides"""
+        curated = bool(price_map.entries)
+
+        products = []
+        for product in get_catalog().products:
+            if not product.can_order:
+                continue
+            if curated and not price_map.is_available(product):
+                continue
+
+            # Records are immutable; brand prices get their own copy
+            tiers = price_map.tiers(product)
+            if tiers:
+                product = replace(product, price_tiers=tiers)
+            products.append(product)
+
+        return cls(brand.pk, products)
+
+
+def get_brand_catalog(brand):
+    """The brand's catalog, rebuilt only when its version has changed"""
+    price_map = load_price_map(brand)
+    version = (price_map.version, get_catalog().version)
+
+    with _catalogs_lock:
+        entry = _catalogs.get(brand.pk)
+        if entry and entry[0] == version:
+            _catalogs.move_to_end(brand.pk)
+            return entry[1]
+
+    catalog = BrandCatalog.build(brand, price_map)
+    with _catalogs_lock:
+        _catalogs[brand.pk] = (version, catalog)
+        _catalogs.move_to_end(brand.pk)
+        while len(_catalogs) > getattr(settings, 'BRAND_CATALOG_CACHE_SIZE', 100):
+            _catalogs.popitem(last=False)
+    return catalog
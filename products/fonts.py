@@ -0,0 +1,196 @@
+"""
+Self-hosted, subsetted designer fonts
+
+The designer's font list (products.data fonts) used to come from Google
+Fonts: one stylesheet request for all 30 families, and a third-party origin
+for every font file. `manage.py build_fonts` builds them from font files in
+the repo instead, with no network access:
+
+ - sources live in FONT_SOURCES_DIR/<Family Name>/ (the .ttf/.otf files of
+   the family as distributed, static or variable),
+ - the regular and bold faces (FONT_WEIGHTS) are subset to
+   FONT_SUBSET_RANGES (Latin text by default) and written as WOFF2 named
+   by content hash into FONT_OUTPUT_DIR,
+ - a stylesheet with one @font-face per face (font-display: swap and the
+   unicode-range) is written next to them, also content-hashed.
+
+An @font-face only downloads its file once text on the page uses that
+family. The designer links the stylesheet and asks the browser for the
+fonts its text decals use, instead of loading every family up front.
+Families without sources stay on Google Fonts; font_stylesheet() tells the
+designer which ones.
+"""
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.text import slugify
+
+from . import buildcache
+from .buildcache import manifest_mtime, static_name, static_url
+
+try:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+except ImportError:  # optional: only `build_fonts` needs it
+    subset = TTFont = None
+
+MANIFEST_VERSION = 1
+SOURCE_EXTENSIONS = {'.ttf', '.otf'}
+
+# Google Fonts' "latin" range
+DEFAULT_SUBSET_RANGES = (
+    'U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,U+0329,'
+    'U+2000-206F,U+2074,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD'
+)
+
+
+def sources_dir():
+    return Path(getattr(settings, 'FONT_SOURCES_DIR', Path(settings.BASE_DIR) / 'core' / 'fonts'))
+
+
+def output_dir():
+    return Path(getattr(settings, 'FONT_OUTPUT_DIR', Path(settings.BASE_DIR) / 'core' / 'static' / 'webfonts'))
+
+
+def subset_ranges():
+    return getattr(settings, 'FONT_SUBSET_RANGES', None) or DEFAULT_SUBSET_RANGES
+
+
+def parse_unicode_ranges(ranges):
+    """The code points of a CSS unicode-range value"""
+    codepoints = set()
+    for item in ranges.split(','):
+        item = item.strip().upper().removeprefix('U+')
+        if not item:
+            continue
+        start, _, end = item.partition('-')
+        codepoints.update(range(int(start, 16), int(end or start, 16) + 1))
+    return codepoints
+
+
+def font_face(path):
+    """{'weight', 'italic', 'variable'} of a font file; weight is (min, max)"""
+    font = TTFont(path, lazy=True)
+    try:
+        italic = bool(font['OS/2'].fsSelection & 1)
+        if 'fvar' in font:
+            axes = {axis.axisTag: axis for axis in font['fvar'].axes}
+            if 'wght' in axes:
+                weight = (int(axes['wght'].minValue), int(axes['wght'].maxValue))
+                return {'weight': weight, 'italic': italic, 'variable': True}
+        weight = font['OS/2'].usWeightClass
+        return {'weight': (weight, weight), 'italic': italic, 'variable': False}
+    finally:
+        font.close()
+
+
+def pick_faces(paths, weights):
+    """
+    The source files to build for a family: a variable font covering the
+    weights, else the static upright faces closest to each weight
+    """
+    faces = [(path, font_face(path)) for path in sorted(paths)]
+    upright = [(path, face) for path, face in faces if not face['italic']] or faces
+    for path, face in upright:
+        low, high = face['weight']
+        if face['variable'] and all(low <= weight <= high for weight in weights):
+            return [(path, face)]
+
+    statics = [(path, face) for path, face in upright if not face['variable']] or upright
+    chosen = {}
+    for weight in weights:
+        path, face = min(statics, key=lambda item: abs(item[1]['weight'][0] - weight))
+        chosen[path] = face
+    return sorted(chosen.items())
+
+
+def recipe_hash(codepoints):
+    return hashlib.sha256(','.join(map(str, sorted(codepoints))).encode()).hexdigest()[:8]
+
+
+def build_face(source, codepoints, output):
+    """Subset one source file to WOFF2; returns the output bytes"""
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.hinting = False
+    options.desubroutinize = True
+    # Keep the copyright and license names; the fonts are OFL/Apache licensed
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+
+    font = TTFont(source)
+    try:
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        font.flavor = 'woff2'
+        font.save(output)
+    finally:
+        font.close()
+    return Path(output).read_bytes()
+
+
+def face_filename(family, weight, digest):
+    low, high = weight
+    weights = str(low) if low == high else f'{low}-{high}'
+    return f'{slugify(family)}-{weights}-{digest}.woff2'
+
+
+def stylesheet(families, ranges):
+    """The @font-face rules for {family: [face entries]}"""
+    rules = []
+    for family, faces in sorted(families.items()):
+        for face in faces:
+            low, high = face['weight']
+            rules.append(
+                '@font-face {\n'
+                f"  font-family: '{family}';\n"
+                f"  font-style: {'italic' if face['italic'] else 'normal'};\n"
+                f"  font-weight: {low if low == high else f'{low} {high}'};\n"
+                '  font-display: swap;\n'
+                f"  src: url('{face['file']}') format('woff2');\n"
+                f'  unicode-range: {ranges};\n'
+                '}\n'
+            )
+    return '\n'.join(rules).encode()
+
+
+def read_manifest(directory=None):
+    return buildcache.read_manifest(directory or output_dir(), MANIFEST_VERSION, families={}, css=None)
+
+
+_cache = (None, None)
+_cache_lock = threading.Lock()
+
+
+def font_stylesheet(families):
+    """
+    {'css': stylesheet URL or None, 'files': [font URLs], 'google': [families
+    without a built face]} for the designer's font list
+    """
+    global _cache
+    directory = output_dir()
+    mtime = manifest_mtime(directory)
+    if mtime is None:
+        return {'css': None, 'files': [], 'google': list(families)}
+    key = mtime, tuple(families)
+
+    cached_key, cached = _cache
+    if cached_key == key:
+        return cached
+
+    with _cache_lock:
+        manifest = read_manifest(directory)
+        built = manifest['families']
+        prefix = static_name(directory) + '/'
+        result = {
+            'css': static_url(prefix + manifest['css']) if manifest['css'] and built else None,
+            'files': [static_url(prefix + face['file'])
+                      for family in families for face in built.get(family, [])],
+            'google': [family for family in families if family not in built],
+        }
+        _cache = (key, result)
+    return result
@@ -0,0 +1,336 @@
+"""
+Offline GLB optimization for product models
+
+The product models in core/static/models (each product's modelLink) are
+exported as plain float GLBs: 32 bytes per vertex, and sometimes the same
+data stored more than once. `manage.py optimize_models` rewrites each one
+once, offline, and the designer loads the result instead.
+
+The built-in optimizer (stdlib only) keeps the scene, node and mesh names
+the designer uses as layers, and:
+ - quantizes normals to normalized int8 (KHR_mesh_quantization, which
+   GLTFLoader supports natively),
+ - quantizes UVs in [0, 1] to normalized uint16 (core glTF),
+ - deduplicates identical accessors and drops unused ones,
+ - repacks the binary chunk with one aligned bufferView per accessor.
+Positions stay float, because quantizing them moves the dequantization
+into node transforms, which the designer's layer and camera code reads.
+
+When gltfpack is installed it can be used instead (--tool gltfpack), for
+its vertex cache optimization and simplified LOD levels (--lods). It runs
+with -noq, so positions stay float there too. Meshopt compression isn't
+offered: the designer's GLTFLoader has no MeshoptDecoder.
+
+Outputs are named by their own content hash, so they are immutable and a
+rebuild with other options gets new files. MODEL_VARIANTS_DIR/manifest.json
+maps each source to its hash and each hash to its output, LODs and the
+size/vertex/triangle report.
+optimized_model() is how the catalog exposes them to the designer.
+"""
+import json
+import shutil
+import struct
+import subprocess
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from . import buildcache
+from .buildcache import manifest_mtime, static_name, static_url
+
+GLB_MAGIC = 0x46546C67
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+FLOAT = 5126
+BYTE = 5120
+UNSIGNED_SHORT = 5123
+COMPONENTS = {
+    5120: ('b', 1), 5121: ('B', 1), 5122: ('h', 2),
+    5123: ('H', 2), 5125: ('I', 4), 5126: ('f', 4),
+}
+TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT2': 4, 'MAT3': 9, 'MAT4': 16}
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+QUANTIZATION = 'KHR_mesh_quantization'
+# Extensions whose data lives outside plain accessors; such files are copied as-is
+COMPRESSED = {'KHR_draco_mesh_compression', 'EXT_meshopt_compression'}
+
+MANIFEST_VERSION = 1
+
+
+class UnsupportedModel(ValueError):
+    """A GLB the built-in optimizer can't rewrite safely"""
+
+
+# -- GLB container -------------------------------------------------------------
+
+def read_glb(data):
+    """(json document, binary chunk) of a GLB file's bytes"""
+    if len(data) < 20:
+        raise UnsupportedModel("not a GLB file")
+    magic, version, _ = struct.unpack_from('<III', data, 0)
+    if magic != GLB_MAGIC or version != 2:
+        raise UnsupportedModel("not a glTF 2.0 binary")
+
+    document, binary = None, b''
+    offset = 12
+    while offset < len(data):
+        length, chunk_type = struct.unpack_from('<II', data, offset)
+        chunk = data[offset + 8:offset + 8 + length]
+        if chunk_type == CHUNK_JSON:
+            document = json.loads(chunk)
+        elif chunk_type == CHUNK_BIN:
+            binary = bytes(chunk)
+        offset += 8 + length
+    if document is None:
+        raise UnsupportedModel("GLB has no JSON chunk")
+    return document, binary
+
+
+def _pad(data, filler):
+    return data + filler * (-len(data) % 4)
+
+
+def write_glb(document, binary):
+    json_chunk = _pad(json.dumps(document, separators=(',', ':')).encode(), b' ')
+    chunks = struct.pack('<II', len(json_chunk), CHUNK_JSON) + json_chunk
+    if binary:
+        bin_chunk = _pad(binary, b'\0')
+        chunks += struct.pack('<II', len(bin_chunk), CHUNK_BIN) + bin_chunk
+    return struct.pack('<III', GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+
+# -- accessors -------------------------------------------------------------------
+
+def read_accessor(document, binary, index):
+    """The accessor's elements as a list of tuples"""
+    accessor = document['accessors'][index]
+    if 'sparse' in accessor or 'bufferView' not in accessor:
+        raise UnsupportedModel(f"accessor {index} is sparse or has no bufferView")
+    view = document['bufferViews'][accessor['bufferView']]
+    if view.get('buffer', 0) != 0:
+        raise UnsupportedModel("only the GLB binary buffer is supported")
+
+    code, size = COMPONENTS[accessor['componentType']]
+    width = TYPE_SIZES[accessor['type']]
+    element = struct.Struct('<' + code * width)
+    stride = view.get('byteStride') or element.size
+    start = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    return [element.unpack_from(binary, start + i * stride) for i in range(accessor['count'])]
+
+
+def _encode(values, component_type, width, pad_to_4=False):
+    code, size = COMPONENTS[component_type]
+    element = struct.Struct('<' + code * width)
+    padding = b'\0' * (-element.size % 4) if pad_to_4 else b''
+    stride = element.size + len(padding)
+    return b''.join(element.pack(*value) + padding for value in values), stride
+
+
+def _quantize_normals(values):
+    def q(component):
+        return max(-127, min(127, round(component * 127)))
+    return [tuple(q(c) for c in value) for value in values]
+
+
+def _quantize_unit(values):
+    return [tuple(round(c * 65535) for c in value) for value in values]
+
+
+def _accessor_roles(document):
+    """{accessor index: role} for every accessor the document references"""
+    roles = {}
+    for mesh in document.get('meshes', []):
+        for primitive in mesh['primitives']:
+            if set(primitive.get('extensions', {})) & COMPRESSED:
+                raise UnsupportedModel("primitive is already compressed")
+            for semantic, index in primitive['attributes'].items():
+                roles[index] = semantic.split('_')[0] if semantic.startswith('TEXCOORD') else semantic
+            if 'indices' in primitive:
+                roles[primitive['indices']] = 'INDICES'
+            for target in primitive.get('targets', []):
+                for index in target.values():
+                    roles[index] = 'TARGET'
+    for skin in document.get('skins', []):
+        if 'inverseBindMatrices' in skin:
+            roles[skin['inverseBindMatrices']] = 'OTHER'
+    for animation in document.get('animations', []):
+        for sampler in animation['samplers']:
+            roles[sampler['input']] = 'OTHER'
+            roles[sampler['output']] = 'OTHER'
+    return roles
+
+
+def optimize_glb(data):
+    """Optimized GLB bytes for a GLB file's bytes (the built-in optimizer)"""
+    document, binary = read_glb(data)
+    if set(document.get('extensionsUsed', [])) & COMPRESSED:
+        raise UnsupportedModel("file is already compressed")
+    roles = _accessor_roles(document)
+
+    out = bytearray()
+    views, accessors = [], []
+    remap, seen = {}, {}
+    quantized = False
+
+    def add_view(payload, target=None, stride=None):
+        out.extend(b'\0' * (-len(out) % 4))
+        view = {'buffer': 0, 'byteOffset': len(out), 'byteLength': len(payload)}
+        if target:
+            view['target'] = target
+        if stride:
+            view['byteStride'] = stride
+        out.extend(payload)
+        views.append(view)
+        return len(views) - 1
+
+    for index in sorted(roles):
+        role = roles[index]
+        source = document['accessors'][index]
+        values = read_accessor(document, binary, index)
+        accessor = {key: value for key, value in source.items()
+                    if key not in ('bufferView', 'byteOffset')}
+        width = TYPE_SIZES[source['type']]
+        is_float = source['componentType'] == FLOAT
+
+        if role == 'NORMAL' and is_float and source['type'] == 'VEC3':
+            values = _quantize_normals(values)
+            accessor.update(componentType=BYTE, normalized=True)
+            accessor.pop('min', None)
+            accessor.pop('max', None)
+            quantized = True
+        elif (role == 'TEXCOORD' and is_float
+              and all(0.0 <= c <= 1.0 for value in values for c in value)):
+            values = _quantize_unit(values)
+            accessor.update(componentType=UNSIGNED_SHORT, normalized=True)
+            accessor.pop('min', None)
+            accessor.pop('max', None)
+
+        vertex_data = role not in ('INDICES', 'OTHER')
+        payload, stride = _encode(values, accessor['componentType'], width, pad_to_4=vertex_data)
+        key = (payload, accessor['componentType'], accessor['type'], accessor.get('normalized', False), role == 'INDICES')
+        if key in seen:
+            remap[index] = seen[key]
+            continue
+
+        if role == 'INDICES':
+            accessor['bufferView'] = add_view(payload, ELEMENT_ARRAY_BUFFER)
+        elif vertex_data:
+            element_size = COMPONENTS[accessor['componentType']][1] * width
+            accessor['bufferView'] = add_view(payload, ARRAY_BUFFER, stride if stride != element_size else None)
+        else:
+            accessor['bufferView'] = add_view(payload)
+        accessors.append(accessor)
+        remap[index] = seen[key] = len(accessors) - 1
+
+    # Images embedded in the binary chunk are copied unchanged
+    for image in document.get('images', []):
+        if 'bufferView' in image:
+            view = document['bufferViews'][image['bufferView']]
+            start = view.get('byteOffset', 0)
+            image['bufferView'] = add_view(binary[start:start + view['byteLength']])
+
+    for mesh in document.get('meshes', []):
+        for primitive in mesh['primitives']:
+            primitive['attributes'] = {semantic: remap[index] for semantic, index in primitive['attributes'].items()}
+            if 'indices' in primitive:
+                primitive['indices'] = remap[primitive['indices']]
+            if 'targets' in primitive:
+                primitive['targets'] = [{key: remap[index] for key, index in target.items()}
+                                        for target in primitive['targets']]
+    for skin in document.get('skins', []):
+        if 'inverseBindMatrices' in skin:
+            skin['inverseBindMatrices'] = remap[skin['inverseBindMatrices']]
+    for animation in document.get('animations', []):
+        for sampler in animation['samplers']:
+            sampler['input'] = remap[sampler['input']]
+            sampler['output'] = remap[sampler['output']]
+
+    document['accessors'] = accessors
+    document['bufferViews'] = views
+    document['buffers'] = [{'byteLength': len(out)}] if out else []
+    if quantized:
+        for key in ('extensionsUsed', 'extensionsRequired'):
+            document[key] = sorted(set(document.get(key, [])) | {QUANTIZATION})
+    return write_glb(document, bytes(out))
+
+
+def model_stats(data):
+    """{'vertices', 'triangles', 'meshes'} of a GLB (counted per primitive)"""
+    document, _ = read_glb(data)
+    vertices = triangles = 0
+    for mesh in document.get('meshes', []):
+        for primitive in mesh['primitives']:
+            count = document['accessors'][primitive['attributes']['POSITION']]['count']
+            vertices += count
+            if primitive.get('mode', 4) == 4:
+                indices = primitive.get('indices')
+                triangles += (document['accessors'][indices]['count'] if indices is not None else count) // 3
+    return {'vertices': vertices, 'triangles': triangles, 'meshes': len(document.get('meshes', []))}
+
+
+# -- gltfpack --------------------------------------------------------------------
+
+def gltfpack_available():
+    return shutil.which('gltfpack') is not None
+
+
+def run_gltfpack(source, output, simplify=None):
+    # -kn/-km keep the named nodes and materials the designer uses as layers;
+    # -noq keeps positions float (see the module docstring)
+    command = ['gltfpack', '-i', str(source), '-o', str(output), '-kn', '-km', '-ke', '-noq']
+    if simplify:
+        command += ['-si', str(simplify)]
+    subprocess.run(command, check=True, capture_output=True)
+    return Path(output).read_bytes()
+
+
+# -- manifest ----------------------------------------------------------------------
+
+def variants_dir():
+    return Path(getattr(settings, 'MODEL_VARIANTS_DIR',
+                        Path(settings.BASE_DIR) / 'core' / 'static' / 'models' / 'optimized'))
+
+
+def read_manifest(directory=None):
+    return buildcache.read_manifest(directory or variants_dir(), MANIFEST_VERSION, sources={}, models={})
+
+
+_cache = {'mtime': None, 'models': {}}
+_cache_lock = threading.Lock()
+
+
+def optimized_model(model_link):
+    """
+    {'url', 'bytes', 'lods': [{'ratio', 'url'}]} for a product's modelLink
+    once optimize_models has built it, else None
+    """
+    if not model_link or not model_link.startswith(settings.STATIC_URL):
+        return None
+    directory = variants_dir()
+    mtime = manifest_mtime(directory)
+    if mtime is None:
+        return None
+
+    if _cache['mtime'] != mtime:
+        manifest = read_manifest(directory)
+        prefix = static_name(directory) + '/'
+        models = {}
+        for name, digest in manifest['sources'].items():
+            entry = manifest['models'].get(digest)
+            if entry is None:
+                continue
+            models[name] = {
+                'url': static_url(prefix + entry['file']),
+                'bytes': entry['bytes'],
+                'lods': [{'ratio': lod['ratio'], 'url': static_url(prefix + lod['file'])}
+                         for lod in entry.get('lods', [])],
+            }
+        with _cache_lock:
+            _cache['mtime'] = mtime
+            _cache['models'] = models
+
+    return _cache['models'].get(model_link[len(settings.STATIC_URL):])
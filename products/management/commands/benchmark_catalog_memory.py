@@ -0,0 +1,80 @@
+"""
+Measure how much memory the static catalog costs each worker as plain dicts
+(as parsed from the catalog file) versus compact records (products.records).
+Each representation is built in a fresh interpreter so interned strings and
+shared tuples from one run can't flatter the other.
+"""
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a child interpreter: build the catalog `copies` times (distinct ids,
+# as a larger catalog would have) and report retained bytes and RSS growth.
+PROBE = r'''
+import gc, json, sys, tracemalloc
+sys.path.insert(0, {base_dir!r})
+mode, copies = {mode!r}, {copies!r}
+
+def rss_kb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+with open({data_path!r}, encoding='utf-8') as handle:
+    source = handle.read()
+
+from products.records import load_products
+
+gc.collect()
+tracemalloc.start()
+rss_before = rss_kb()
+catalog = []
+for copy_index in range(copies):
+    products = json.loads(source)['products']
+    for product in products:
+        product['id'] += copy_index * 1000
+    catalog.extend(load_products(products) if mode == 'records' else products)
+    del products
+gc.collect()
+retained, _ = tracemalloc.get_traced_memory()
+print(json.dumps({{'products': len(catalog), 'bytes': retained, 'rss_kb': rss_kb() - rss_before}}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Compare per-worker memory of the product catalog as dicts vs compact records'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--copies', type=int, default=1,
+                            help='Load the catalog this many times to model a larger catalog '
+                                 '(copies share most values, so treat the result as an upper bound)')
+
+    def handle(self, *args, **options):
+        copies = max(options['copies'], 1)
+        data_path = str(getattr(settings, 'PRODUCT_CATALOG_PATH', settings.BASE_DIR / 'products' / 'catalog.json'))
+
+        results = {}
+        for mode in ('dicts', 'records'):
+            probe = PROBE.format(base_dir=str(settings.BASE_DIR), mode=mode, copies=copies, data_path=data_path)
+            output = subprocess.run(
+                [sys.executable, '-c', probe], capture_output=True, text=True, check=True
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+        dicts, records = results['dicts'], results['records']
+        self.stdout.write(f"Catalog products: {dicts['products']} ({copies}x the catalog file)")
+        self.stdout.write(f"{'':10} {'retained':>14} {'RSS growth':>12}")
+        for mode in ('dicts', 'records'):
+            row = results[mode]
+            self.stdout.write(f"{mode:10} {row['bytes'] / 1024:>11.1f} KB {row['rss_kb']:>9} KB")
+
+        saved = dicts['bytes'] - records['bytes']
+        self.stdout.write(self.style.SUCCESS(
+            f"Records retain {saved / 1024:.1f} KB less per worker "
+            f"({saved / dicts['bytes']:.0%} of the dict representation)"
+        ))
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.text import slugify
+
+from products import fonts
+from products.buildcache import MANIFEST_NAME, content_hash, static_name, write_manifest
+from products.data import get_fonts
+
+
+class Command(BaseCommand):
+    help = 'Subset the designer fonts in FONT_SOURCES_DIR to content-hashed WOFF2 (run before collectstatic)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild faces that are already built')
+
+    def handle(self, *args, **options):
+        if fonts.subset is None:
+            raise CommandError('fontTools is not installed (pip install fonttools brotli)')
+
+        source_root = fonts.sources_dir()
+        directory = fonts.output_dir()
+        try:
+            static_name(directory)
+        except ValueError as exc:
+            raise CommandError(f"FONT_OUTPUT_DIR must be inside STATICFILES_DIRS ({exc})")
+        directory.mkdir(parents=True, exist_ok=True)
+
+        ranges = fonts.subset_ranges()
+        codepoints = fonts.parse_unicode_ranges(ranges)
+        recipe = fonts.recipe_hash(codepoints)
+        weights = getattr(settings, 'FONT_WEIGHTS', (400, 700))
+
+        manifest = fonts.read_manifest(directory)
+        previous = manifest['families']
+        families, missing, built = {}, [], 0
+        for family in get_fonts():
+            paths = [path for path in (source_root / family).glob('*')
+                     if path.suffix.lower() in fonts.SOURCE_EXTENSIONS]
+            if not paths:
+                missing.append(family)
+                continue
+
+            faces = []
+            for path, face in fonts.pick_faces(paths, weights):
+                source_hash = content_hash(path.read_bytes())
+                known = next((entry for entry in previous.get(family, [])
+                              if entry['source_hash'] == source_hash and entry['recipe'] == recipe), None)
+                if known and (directory / known['file']).is_file() and not options['force']:
+                    faces.append(known)
+                    continue
+
+                tmp_path = directory / f'{slugify(family)}.tmp.woff2'
+                data = fonts.build_face(path, codepoints, tmp_path)
+                name = fonts.face_filename(family, face['weight'], content_hash(data))
+                tmp_path.replace(directory / name)
+                faces.append({
+                    'file': name, 'bytes': len(data), 'source': path.name,
+                    'source_bytes': path.stat().st_size, 'source_hash': source_hash, 'recipe': recipe,
+                    'weight': list(face['weight']), 'italic': face['italic'],
+                })
+                built += 1
+            families[family] = faces
+
+        css = fonts.stylesheet(families, ranges)
+        css_name = f'fonts-{content_hash(css)}.css'
+        (directory / css_name).write_bytes(css)
+        manifest.update(families=families, css=css_name)
+        write_manifest(manifest, directory)
+
+        keep = {MANIFEST_NAME, css_name}
+        keep.update(face['file'] for faces in families.values() for face in faces)
+        for path in directory.iterdir():
+            if path.is_file() and path.name not in keep:
+                path.unlink()
+
+        for family, faces in families.items():
+            for face in faces:
+                self.stdout.write(f"{family:<20} {face['source']:<32} {face['source_bytes'] / 1024:>7.0f}K -> "
+                                  f"{face['bytes'] / 1024:>5.0f}K")
+        if missing:
+            self.stdout.write(self.style.WARNING(
+                f"No sources in {source_root} for: {', '.join(missing)} (still loaded from Google Fonts)"
+            ))
+        self.stdout.write(self.style.SUCCESS(f'{built} faces built, {len(families)} families in {css_name}'))
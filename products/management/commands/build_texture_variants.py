@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from products.buildcache import MANIFEST_NAME, file_hash, source_path, static_name, write_manifest
+from products.data import get_catalog
+from products.textures import build_variants, ktx2_encoder, read_manifest, variants_dir
+
+
+class Command(BaseCommand):
+    help = 'Build compressed WebP/KTX2 variants of the catalog bumpmaps (run before collectstatic)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-size', type=int,
+                            default=getattr(settings, 'BUMPMAP_VARIANT_MAX_SIZE', 2048),
+                            help='Largest variant edge in pixels')
+        parser.add_argument('--min-size', type=int,
+                            default=getattr(settings, 'BUMPMAP_VARIANT_MIN_SIZE', 256),
+                            help='Smallest mip level edge in pixels')
+        parser.add_argument('--quality', type=int, default=90, help='WebP quality (0-100)')
+        parser.add_argument('--no-ktx2', action='store_true', help='Skip KTX2 even if an encoder is installed')
+        parser.add_argument('--force', action='store_true', help='Re-encode sources that are already built')
+
+    def handle(self, *args, **options):
+        output_dir = variants_dir()
+        try:
+            static_name(output_dir)
+        except ValueError as exc:
+            raise CommandError(f"BUMPMAP_VARIANTS_DIR must be inside STATICFILES_DIRS ({exc})")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        encoder = None if options['no_ktx2'] else ktx2_encoder()
+        if encoder is None and not options['no_ktx2']:
+            self.stdout.write(self.style.WARNING('No toktx or basisu on PATH: building WebP variants only'))
+
+        sources = {}
+        for key, bumpmap in get_catalog().bumpmap_textures.items():
+            link = bumpmap.get('link')
+            if not link:
+                continue
+            path = source_path(link)
+            if path is None:
+                self.stdout.write(self.style.WARNING(f'{key}: {link} not found, skipped'))
+                continue
+            sources[link[len(settings.STATIC_URL):]] = path
+
+        manifest = read_manifest(output_dir)
+        hashes = {name: file_hash(path) for name, path in sources.items()}
+        todo = {
+            digest: sources[name] for name, digest in hashes.items()
+            if options['force'] or digest not in manifest['textures']
+            or (encoder and not manifest['textures'][digest].get('ktx2'))
+        }
+
+        # Pillow's WebP encoder holds the GIL, so encode in separate processes
+        digests = list(todo)
+        build = partial(build_variants, output_dir=output_dir, max_size=options['max_size'],
+                        min_size=options['min_size'], quality=options['quality'], encoder=encoder)
+        with ProcessPoolExecutor() as pool:
+            entries = pool.map(build, [todo[digest] for digest in digests], digests)
+            for digest, entry in zip(digests, entries):
+                manifest['textures'][digest] = entry
+                self.stdout.write(f"Built {static_name(todo[digest])} -> {len(entry['webp'])} WebP levels"
+                                  f"{' + KTX2' if entry['ktx2'] else ''}")
+
+        manifest['sources'] = hashes
+        live = set(hashes.values())
+        manifest['textures'] = {digest: entry for digest, entry in manifest['textures'].items() if digest in live}
+        write_manifest(manifest, output_dir)
+
+        # Drop files of sources that changed or left the catalog
+        keep = {MANIFEST_NAME}
+        for entry in manifest['textures'].values():
+            keep.update(level['file'] for level in entry['webp'])
+            if entry.get('ktx2'):
+                keep.add(entry['ktx2']['file'])
+        removed = 0
+        for path in output_dir.iterdir():
+            if path.is_file() and path.name not in keep:
+                path.unlink()
+                removed += 1
+
+        original = sum(path.stat().st_size for path in sources.values())
+        largest = sum(entry['webp'][0]['bytes'] for entry in manifest['textures'].values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(todo)} built, {len(sources) - len(todo)} up to date, {removed} stale files removed. "
+            f"Full-size WebP: {largest / 1e6:.1f}MB vs {original / 1e6:.1f}MB of originals"
+        ))
@@ -0,0 +1,132 @@
+from subprocess import CalledProcessError
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from products.buildcache import MANIFEST_NAME, content_hash, source_path, static_name, write_manifest
+from products.data import get_products
+from products.glb import (
+    UnsupportedModel, gltfpack_available, model_stats, optimize_glb, read_manifest, run_gltfpack, variants_dir,
+)
+
+
+class Command(BaseCommand):
+    help = 'Optimize the product GLB models offline and report size/vertex counts (run before collectstatic)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tool', choices=['auto', 'builtin', 'gltfpack'], default='auto',
+                            help='Optimizer to use (auto: gltfpack when installed)')
+        parser.add_argument('--lods', default=getattr(settings, 'MODEL_LOD_RATIOS', ''),
+                            help='Comma-separated simplification ratios for LOD levels, e.g. 0.5,0.25 (gltfpack only)')
+        parser.add_argument('--force', action='store_true', help='Rebuild models that are already optimized')
+
+    def handle(self, *args, **options):
+        output_dir = variants_dir()
+        try:
+            static_name(output_dir)
+        except ValueError as exc:
+            raise CommandError(f"MODEL_VARIANTS_DIR must be inside STATICFILES_DIRS ({exc})")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        tool = options['tool']
+        if tool == 'auto':
+            tool = 'gltfpack' if gltfpack_available() else 'builtin'
+        if tool == 'gltfpack' and not gltfpack_available():
+            raise CommandError('gltfpack is not on PATH')
+        try:
+            lods = [float(ratio) for ratio in options['lods'].split(',') if ratio.strip()]
+        except ValueError:
+            raise CommandError(f"--lods must be comma-separated ratios, got {options['lods']!r}")
+        if tool == 'builtin' and lods:
+            self.stdout.write(self.style.WARNING('LODs need gltfpack; skipped'))
+            lods = []
+        recipe = {'tool': tool, 'lod_ratios': lods}
+
+        sources = {}
+        for product in get_products():
+            path = source_path(product.model_link)
+            if path is None:
+                self.stdout.write(self.style.WARNING(f'{product.name}: {product.model_link} not found, skipped'))
+                continue
+            sources.setdefault(product.model_link[len(settings.STATIC_URL):], (path, []))[1].append(product.name)
+
+        manifest = read_manifest(output_dir)
+        hashes = {}
+        built = 0
+        for name, (path, product_names) in sorted(sources.items()):
+            data = path.read_bytes()
+            digest = hashes[name] = content_hash(data)
+            entry = manifest['models'].get(digest)
+            if entry and entry.get('recipe') == recipe and not options['force']:
+                continue
+
+            tmp_path = output_dir / f'{digest}.tmp.glb'
+            try:
+                if tool == 'gltfpack':
+                    optimized = run_gltfpack(path, tmp_path)
+                else:
+                    optimized = optimize_glb(data)
+            except (UnsupportedModel, OSError, CalledProcessError) as exc:
+                self.stdout.write(self.style.WARNING(f'{name}: {self.reason(exc)}; kept as-is'))
+                optimized = data
+
+            entry = self.write(output_dir, optimized)
+            entry.update(recipe=recipe, original_bytes=len(data), original=model_stats(data),
+                         products=sorted(product_names), lods=[])
+            for ratio in lods:
+                try:
+                    lod = run_gltfpack(path, tmp_path, simplify=ratio)
+                except (OSError, CalledProcessError) as exc:
+                    self.stdout.write(self.style.WARNING(f'{name}: LOD {ratio} failed ({self.reason(exc)}); skipped'))
+                    continue
+                entry['lods'].append(dict(self.write(output_dir, lod), ratio=ratio))
+            tmp_path.unlink(missing_ok=True)
+            manifest['models'][digest] = entry
+            built += 1
+
+        manifest['sources'] = hashes
+        live = set(hashes.values())
+        manifest['models'] = {digest: entry for digest, entry in manifest['models'].items() if digest in live}
+        write_manifest(manifest, output_dir)
+
+        keep = {MANIFEST_NAME}
+        for entry in manifest['models'].values():
+            keep.add(entry['file'])
+            keep.update(lod['file'] for lod in entry['lods'])
+        for path in output_dir.iterdir():
+            if path.is_file() and path.name not in keep:
+                path.unlink()
+
+        self.report(manifest)
+        self.stdout.write(self.style.SUCCESS(f'{built} optimized with {tool}, {len(sources) - built} up to date'))
+
+    def reason(self, exc):
+        if isinstance(exc, CalledProcessError) and exc.stderr:
+            return f'gltfpack: {exc.stderr.decode(errors="replace").strip()}'
+        return str(exc)
+
+    def write(self, output_dir, data):
+        name = f'{content_hash(data)}.glb'
+        (output_dir / name).write_bytes(data)
+        return dict(model_stats(data), file=name, bytes=len(data))
+
+    def report(self, manifest):
+        self.stdout.write(f"{'Model':<36} {'Original':>10} {'Optimized':>10} {'Saved':>6} {'Vertices':>9} {'Triangles':>9}")
+        total_before = total_after = 0
+        for name, digest in sorted(manifest['sources'].items()):
+            entry = manifest['models'][digest]
+            total_before += entry['original_bytes']
+            total_after += entry['bytes']
+            saved = 1 - entry['bytes'] / entry['original_bytes']
+            self.stdout.write(
+                f"{name.rsplit('/', 1)[-1]:<36} {entry['original_bytes'] / 1024:>9.0f}K {entry['bytes'] / 1024:>9.0f}K "
+                f"{saved:>6.0%} {entry['vertices']:>9} {entry['triangles']:>9}"
+            )
+            for lod in entry['lods']:
+                self.stdout.write(f"  LOD {lod['ratio']:<30} {'':>10} {lod['bytes'] / 1024:>9.0f}K "
+                                  f"{'':>6} {lod['vertices']:>9} {lod['triangles']:>9}")
+            for product_name in entry['products']:
+                self.stdout.write(f"  used by {product_name}")
+        if total_before:
+            self.stdout.write(f"Total: {total_before / 1e6:.2f}MB -> {total_after / 1e6:.2f}MB "
+                              f"({1 - total_after / total_before:.0%} smaller)")
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.data import CatalogError, load_catalog
+from products.sync import apply_sync, plan_sync
+
+
+class Command(BaseCommand):
+    help = 'Sync Product and ProductCategory rows with the static catalog (idempotent)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Show what would change without writing anything')
+        parser.add_argument('--keep-missing', action='store_true',
+                            help='Keep products and categories that are no longer in the catalog')
+        parser.add_argument('--catalog', help='Catalog file to sync from (default: PRODUCT_CATALOG_PATH)')
+
+    def handle(self, *args, **options):
+        records = None
+        if options['catalog']:
+            try:
+                records = load_catalog(options['catalog'], use_compiled=False).products
+            except CatalogError as exc:
+                raise CommandError(str(exc))
+
+        try:
+            plan = plan_sync(records, delete=not options['keep_missing'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.report(plan, verbose=options['dry_run'] or options['verbosity'] > 1)
+
+        if plan.is_empty:
+            self.stdout.write(self.style.SUCCESS('Catalog already in sync'))
+            return
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: nothing written'))
+            return
+
+        apply_sync(plan)
+        self.stdout.write(self.style.SUCCESS('Catalog synced'))
+
+    def report(self, plan, verbose):
+        self.stdout.write(
+            f"Categories: +{len(plan.create_categories)} ~{len(plan.update_categories)} "
+            f"-{len(plan.delete_categories)}"
+        )
+        self.stdout.write(f"Products:   +{len(plan.create)} ~{len(plan.update)} -{len(plan.delete)}")
+        self.stdout.write(f"Links:      +{len(plan.link)} -{len(plan.unlink)}")
+
+        cascaded = plan.cascaded_brand_products()
+        if cascaded:
+            self.stdout.write(self.style.WARNING(
+                f"Deleting products also removes {cascaded} brand product assignment(s)"
+            ))
+
+        if not verbose:
+            return
+        for name in plan.create_categories:
+            self.stdout.write(f"  + category {name}")
+        for name in plan.update_categories:
+            self.stdout.write(f"  ~ category {name} (slug -> {plan.categories[name]})")
+        for category in plan.delete_categories:
+            self.stdout.write(f"  - category {category.name}")
+        for product in plan.create:
+            self.stdout.write(f"  + {product.name}")
+        for product, changed in plan.update:
+            self.stdout.write(f"  ~ {product.name}: {', '.join(changed)}")
+        for product in plan.delete:
+            self.stdout.write(f"  - {product.name} (#{product.pk})")
+        for name, category_name in sorted(plan.link):
+            self.stdout.write(f"  + {name} in {category_name}")
+        for _, name, category_name in plan.unlink:
+            self.stdout.write(f"  - {name} in {category_name}")
@@ -0,0 +1,174 @@
+"""
+Compact product catalog records
+
+The catalog file (products/catalog.json) is plain dicts, but every worker
+keeps the catalog in memory for its whole life. On load the dicts are
+converted into frozen, slotted dataclasses:
+
+- strings are interned (sizes, colours, layer names repeat across products)
+- lists become tuples, and equal tuples are shared between products
+- identical mesh settings (most layers of most products) are one object
+
+Records read like the old dicts in templates (product.name,
+product.prices.items) and are turned back into dicts only where they are
+serialized, via to_dict().
+"""
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+# Canonical instances of repeated tuples and mesh settings
+_shared = {}
+
+
+def _share(value):
+    """Return the canonical instance of an equal, hashable value"""
+    return _shared.setdefault(value, value)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _strings(values):
+    return _share(tuple(_intern(value) for value in values))
+
+
+@dataclass(frozen=True, slots=True)
+class MeshSetting:
+    """Settings for one mesh (layer) of a product model"""
+    min_x: float
+    max_x: float
+    min_y: float
+    max_y: float
+    initial_color: str
+    bump_map: bool
+    linked_colors: tuple
+    can_select: bool
+    can_add_images: bool
+    can_change_color: bool
+    can_change_bumpmap: bool
+    # Optional in the source data; None means the key is absent
+    linked_bumpmaps: Optional[tuple] = None
+    alias: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        linked_bumpmaps = data.get('linkedBumpmaps')
+        return _share(cls(
+            min_x=data['minX'],
+            max_x=data['maxX'],
+            min_y=data['minY'],
+            max_y=data['maxY'],
+            initial_color=_intern(data['initialColor']),
+            bump_map=data['bumpMap'],
+            linked_colors=_strings(data['linkedColors']),
+            can_select=data['canSelect'],
+            can_add_images=data['canAddImages'],
+            can_change_color=data['canChangeColor'],
+            can_change_bumpmap=data['canChangeBumpmap'],
+            linked_bumpmaps=_strings(linked_bumpmaps) if linked_bumpmaps is not None else None,
+            alias=_intern(data.get('alias')),
+        ))
+
+    def to_dict(self):
+        data = {
+            'minX': self.min_x, 'maxX': self.max_x, 'minY': self.min_y, 'maxY': self.max_y,
+            'initialColor': self.initial_color,
+            'bumpMap': self.bump_map,
+            'linkedColors': list(self.linked_colors),
+        }
+        if self.linked_bumpmaps is not None:
+            data['linkedBumpmaps'] = list(self.linked_bumpmaps)
+        if self.alias is not None:
+            data['alias'] = self.alias
+        data.update({
+            'canSelect': self.can_select,
+            'canAddImages': self.can_add_images,
+            'canChangeColor': self.can_change_color,
+            'canChangeBumpmap': self.can_change_bumpmap,
+        })
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class ProductRecord:
+    """One product of the static catalog"""
+    id: int
+    name: str
+    model_link: str
+    thumbnail: str
+    categories: tuple
+    description: str
+    initial_layer: str
+    initial_bumpmap: str
+    can_order: bool
+    sizes: tuple
+    price_tiers: tuple  # ((min_quantity, unit_price), ...) sorted by quantity
+    supported_bumpmaps: tuple
+    product_details: tuple
+    mesh_settings: tuple  # ((mesh_name, MeshSetting), ...)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            model_link=data['modelLink'],
+            thumbnail=data['thumbnail'],
+            categories=_strings(data['categories']),
+            description=data['description'],
+            initial_layer=_intern(data['initialLayer']),
+            initial_bumpmap=_intern(data['initialBumpmap']),
+            can_order=data['canOrder'],
+            sizes=_strings(data['sizes']),
+            # JSON object keys are strings; quantities are ints
+            price_tiers=_share(tuple(sorted(
+                (int(quantity), price) for quantity, price in data['prices'].items()
+            ))),
+            supported_bumpmaps=_strings(data['supportedBumpmaps']),
+            product_details=_strings(data['productDetails']),
+            mesh_settings=tuple(
+                (_intern(mesh_name), MeshSetting.from_dict(settings))
+                for mesh_name, settings in data['meshSettings'].items()
+            ),
+        )
+
+    @property
+    def prices(self):
+        """{min_quantity: unit_price}, as in products.data"""
+        return dict(self.price_tiers)
+
+    @property
+    def base_price(self):
+        """Same rules as Product.get_base_price()"""
+        prices = self.prices
+        if 1 in prices:
+            return float(prices[1])
+        if prices:
+            return float(min(prices.values()))
+        return 19.99
+
+    def to_dict(self):
+        """The products.data dict for this product (for JSON/JavaScript)"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'modelLink': self.model_link,
+            'thumbnail': self.thumbnail,
+            'categories': list(self.categories),
+            'description': self.description,
+            'initialLayer': self.initial_layer,
+            'initialBumpmap': self.initial_bumpmap,
+            'canOrder': self.can_order,
+            'sizes': list(self.sizes),
+            'prices': self.prices,
+            'supportedBumpmaps': list(self.supported_bumpmaps),
+            'productDetails': list(self.product_details),
+            'meshSettings': {name: settings.to_dict() for name, settings in self.mesh_settings},
+        }
+
+
+def load_products(products):
+    """Convert products.data dicts into a tuple of ProductRecord"""
+    return tuple(ProductRecord.from_dict(product) for product in products)
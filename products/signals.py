@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import BrandProduct, Product
+
+
+@receiver(post_save, sender=Product)
+def invalidate_price_maps_for_product(sender, instance, raw=False, **kwargs):
+    """Brand price maps match products by name; brand catalogs follow the maps"""
+    if raw:
+        return
+    from brands.pricing import invalidate_price_map
+
+    for brand_id in BrandProduct.objects.filter(product=instance).values_list('brand_id', flat=True):
+        invalidate_price_map(brand_id)
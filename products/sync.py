@@ -0,0 +1,213 @@
+"""
+Catalog -> database sync
+
+Brings the Product / ProductCategory tables (and the category M2M) in line
+with the static catalog (products.data) in a handful of bulk statements:
+
+- plan_sync() diffs the catalog against the tables and returns a SyncPlan
+  describing every insert, update and delete. It only reads.
+- apply_sync() applies a plan in one transaction: categories are upserted
+  with bulk_create(update_conflicts=True), products are bulk-created and
+  bulk-updated, category links are added and removed on the through table.
+
+Products are matched by name, as everywhere else the catalog meets the
+database (catalog ids and Product pks are unrelated). Running the sync a
+second time finds nothing to do.
+"""
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .data import get_products
+from .models import BrandProduct, Product, ProductCategory
+
+# Product fields owned by the catalog (name is the match key)
+SYNC_FIELDS = (
+    'description', 'model_link', 'thumbnail', 'initial_layer', 'initial_bumpmap',
+    'can_order', 'sizes', 'prices', 'supported_bumpmaps', 'product_details', 'mesh_settings',
+)
+
+BATCH_SIZE = 500
+
+
+def product_values(record):
+    """Product field values for a catalog record, as stored in the database"""
+    data = record.to_dict()
+    return {
+        'description': data['description'],
+        'model_link': data['modelLink'],
+        'thumbnail': data['thumbnail'],
+        'initial_layer': data['initialLayer'],
+        'initial_bumpmap': data['initialBumpmap'],
+        'can_order': data['canOrder'],
+        'sizes': data['sizes'],
+        # JSONField keys are strings once stored
+        'prices': {str(quantity): price for quantity, price in data['prices'].items()},
+        'supported_bumpmaps': data['supportedBumpmaps'],
+        'product_details': data['productDetails'],
+        'mesh_settings': data['meshSettings'],
+    }
+
+
+@dataclass
+class SyncPlan:
+    """Everything apply_sync() would change"""
+    categories: dict  # name -> slug, for every catalog category
+    create_categories: list = field(default_factory=list)
+    update_categories: list = field(default_factory=list)
+    delete_categories: list = field(default_factory=list)  # ProductCategory
+    create: list = field(default_factory=list)  # unsaved Product
+    update: list = field(default_factory=list)  # (Product, [changed fields])
+    delete: list = field(default_factory=list)  # Product
+    link: set = field(default_factory=set)  # (product name, category name)
+    unlink: list = field(default_factory=list)  # (through pk, product name, category name)
+    links: dict = field(default_factory=dict)  # product name -> category names
+
+    @property
+    def is_empty(self):
+        return not (
+            self.create_categories or self.update_categories or self.delete_categories
+            or self.create or self.update or self.delete or self.link or self.unlink
+        )
+
+    def cascaded_brand_products(self):
+        """BrandProduct rows that deleting products would remove"""
+        if not self.delete:
+            return 0
+        return BrandProduct.objects.filter(product__in=[product.pk for product in self.delete]).count()
+
+
+def plan_sync(records=None, delete=True):
+    """Diff catalog records (default: the loaded catalog) against the database"""
+    records = list(get_products() if records is None else records)
+
+    desired = {}
+    for record in records:
+        if record.name in desired:
+            raise ValueError(f"Duplicate product name in catalog: {record.name!r}")
+        desired[record.name] = record
+
+    categories = {}
+    for record in records:
+        for name in record.categories:
+            categories.setdefault(name, slugify(name))
+    plan = SyncPlan(categories=categories)
+    plan.links = {record.name: set(record.categories) for record in records}
+
+    # Categories
+    existing_categories = {category.name: category for category in ProductCategory.objects.all()}
+    for name, slug in categories.items():
+        category = existing_categories.get(name)
+        if category is None:
+            plan.create_categories.append(name)
+        elif category.slug != slug:
+            plan.update_categories.append(name)
+    if delete:
+        plan.delete_categories = [
+            category for name, category in existing_categories.items() if name not in categories
+        ]
+
+    # Products; when names repeat in the table, the oldest row is kept
+    kept = {}
+    for product in Product.objects.only('pk', 'name', *SYNC_FIELDS).order_by('pk'):
+        if product.name in kept or (delete and product.name not in desired):
+            if delete:
+                plan.delete.append(product)
+            continue
+        kept[product.name] = product
+
+    for name, record in desired.items():
+        values = product_values(record)
+        product = kept.get(name)
+        if product is None:
+            plan.create.append(Product(name=name, **values))
+            continue
+        changed = [field_name for field_name, value in values.items() if getattr(product, field_name) != value]
+        if changed:
+            for field_name in changed:
+                setattr(product, field_name, values[field_name])
+            plan.update.append((product, changed))
+
+    # Category links, compared by name so new products can be planned too
+    product_names = {product.pk: name for name, product in kept.items()}
+    category_names = {category.pk: name for name, category in existing_categories.items()}
+    through = Product.categories.through
+    existing_links = set()
+    for pk, product_id, category_id in through.objects.values_list('pk', 'product_id', 'productcategory_id'):
+        name = product_names.get(product_id)
+        if name is None:
+            continue  # product is being deleted; the cascade drops its links
+        category_name = category_names[category_id]
+        existing_links.add((name, category_name))
+        if category_name not in plan.links.get(name, ()):
+            plan.unlink.append((pk, name, category_name))
+
+    plan.link = {
+        (name, category_name)
+        for name, category_names_ in plan.links.items()
+        for category_name in category_names_
+        if (name, category_name) not in existing_links
+    }
+    return plan
+
+
+@transaction.atomic
+def apply_sync(plan):
+    """Apply a SyncPlan in one transaction"""
+    if plan.create_categories or plan.update_categories:
+        ProductCategory.objects.bulk_create(
+            [
+                ProductCategory(name=name, slug=plan.categories[name])
+                for name in plan.create_categories + plan.update_categories
+            ],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['slug'],
+            batch_size=BATCH_SIZE,
+        )
+    if plan.delete_categories:
+        ProductCategory.objects.filter(pk__in=[category.pk for category in plan.delete_categories]).delete()
+
+    if plan.delete:
+        Product.objects.filter(pk__in=[product.pk for product in plan.delete]).delete()
+    if plan.create:
+        Product.objects.bulk_create(plan.create, batch_size=BATCH_SIZE)
+    if plan.update:
+        # bulk_update() skips auto_now
+        now = timezone.now()
+        fields = {'updated_at'}
+        for product, changed in plan.update:
+            product.updated_at = now
+            fields.update(changed)
+        Product.objects.bulk_update([product for product, _ in plan.update], sorted(fields), batch_size=BATCH_SIZE)
+
+    through = Product.categories.through
+    if plan.unlink:
+        through.objects.filter(pk__in=[pk for pk, _, _ in plan.unlink]).delete()
+    if plan.link:
+        product_ids = dict(
+            Product.objects.filter(name__in={name for name, _ in plan.link})
+            .order_by('-pk').values_list('name', 'pk')
+        )
+        category_ids = dict(ProductCategory.objects.values_list('name', 'pk'))
+        through.objects.bulk_create(
+            [
+                through(product_id=product_ids[name], productcategory_id=category_ids[category_name])
+                for name, category_name in plan.link
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+    # Bulk writes skip the model signals that drop cached price maps
+    if plan.create or plan.update or plan.delete:
+        transaction.on_commit(_invalidate_brand_caches)
+
+
+def _invalidate_brand_caches():
+    from brands.pricing import invalidate_price_map
+
+    # Brand catalogs are rebuilt once the new price maps are loaded
+    for brand_id in BrandProduct.objects.values_list('brand_id', flat=True).distinct():
+        invalidate_price_map(brand_id)
@@ -1,3 +1,370 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import stat
+import tempfile
+from io import StringIO
+from subprocess import CalledProcessError
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+from PIL import Image
+
+from brands.models import Brand
+from . import buildcache, catalog, data, fonts, glb
+from .catalog import get_brand_catalog
+from .data import CatalogError, get_catalog, get_fonts, load_catalog, validate_catalog
+from .fonts import parse_unicode_ranges, pick_faces, subset_ranges
+from .glb import QUANTIZATION, model_stats, optimize_glb, read_accessor, read_glb
+from .models import BrandProduct, Product
+from .textures import height_channel, mip_sizes
+
+
+class BrandCatalogTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('sync_catalog', stdout=StringIO())
+        cls.brand = Brand.objects.create(name='Catalog Brand')
+        cls.record = next(record for record in get_catalog().products if record.can_order)
+        cls.product = Product.objects.get(name=cls.record.name)
+
+    def setUp(self):
+        cache.clear()
+        catalog._catalogs.clear()
+
+    def test_uncurated_brand_sells_everything(self):
+        orderable = [record for record in get_catalog().products if record.can_order]
+        self.assertEqual(len(get_brand_catalog(self.brand)), len(orderable))
+
+    def test_catalog_is_reused_until_rows_change(self):
+        BrandProduct.objects.create(brand=self.brand, product=self.product, custom_prices={'1': 99})
+        first = get_brand_catalog(self.brand)
+        self.assertIs(get_brand_catalog(self.brand), first)
+        self.assertEqual(first.get(self.record.id).price_tiers, ((1, 99.0),))
+
+        # As if another worker changed the row: no signal reaches this process
+        BrandProduct.objects.filter(brand=self.brand).update(custom_prices={'1': 50})
+        self.assertEqual(get_brand_catalog(self.brand).get(self.record.id).price_tiers, ((1, 50.0),))
+
+        BrandProduct.objects.filter(brand=self.brand).update(is_available=False)
+        self.assertIsNone(get_brand_catalog(self.brand).get(self.record.id))
+
+    @override_settings(BRAND_CATALOG_CACHE_SIZE=2)
+    def test_least_recently_used_brands_are_dropped(self):
+        brands = [Brand.objects.create(name=f'Brand {i}') for i in range(3)]
+        get_brand_catalog(brands[0])
+        get_brand_catalog(brands[1])
+        get_brand_catalog(brands[0])
+        get_brand_catalog(brands[2])
+        self.assertEqual(list(catalog._catalogs), [brands[0].pk, brands[2].pk])
+
+
+class CompiledCatalogTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_dir = Path(directory.name) / 'catalog'
+        override = override_settings(PRODUCT_CATALOG_CACHE_DIR=self.cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_cache_dir_is_private(self):
+        load_catalog()
+        self.assertEqual(stat.S_IMODE(self.cache_dir.stat().st_mode), 0o700)
+        (compiled,) = self.cache_dir.iterdir()
+        self.assertEqual(stat.S_IMODE(compiled.stat().st_mode), 0o600)
+
+    def test_writable_compiled_file_is_ignored(self):
+        load_catalog()
+        (compiled,) = self.cache_dir.iterdir()
+        compiled.chmod(0o666)
+        with mock.patch('products.data.pickle.load') as unpickle, self.assertLogs('products.data', 'WARNING'):
+            loaded = load_catalog()
+        unpickle.assert_not_called()
+        self.assertTrue(loaded.products)
+
+
+class CatalogReloadTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'catalog.json'
+        shutil.copy(Path(data.__file__).with_name('catalog.json'), self.path)
+        override = override_settings(PRODUCT_CATALOG_PATH=self.path, PRODUCT_CATALOG_CHECK_INTERVAL=0,
+                                     PRODUCT_CATALOG_CACHE_DIR=Path(directory.name) / 'compiled')
+        override.enable()
+        self.addCleanup(override.disable)
+        # get_catalog() keeps the loaded catalog per process; put the real one back afterwards
+        self.addCleanup(setattr, data, '_catalog', data._catalog)
+        data._catalog = None
+
+    def edit(self, change):
+        document = json.loads(self.path.read_text())
+        change(document)
+        stat_before = self.path.stat()
+        self.path.write_text(json.dumps(document))
+        # A new version even if the edit lands within the filesystem's mtime resolution
+        os.utime(self.path, ns=(stat_before.st_atime_ns, stat_before.st_mtime_ns + 1_000_000))
+
+    def test_edited_file_is_reloaded(self):
+        first = get_catalog()
+        self.assertIs(get_catalog(), first)
+
+        self.edit(lambda document: document['products'][0].update(name='Renamed Shirt'))
+        reloaded = get_catalog()
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(reloaded.products[0].name, 'Renamed Shirt')
+
+    def test_invalid_file_keeps_previous_catalog(self):
+        first = get_catalog()
+        self.edit(lambda document: document['products'][0].update(canOrder='yes'))
+        with self.assertLogs('products.data', 'ERROR') as logs:
+            self.assertIs(get_catalog(), first)
+        self.assertIn('products[0].canOrder: wrong type str', '\n'.join(logs.output))
+
+    def test_validate_catalog_lists_missing_fields(self):
+        document = json.loads(self.path.read_text())
+        del document['products'][0]['name']
+        del document['products'][1]['meshSettings']
+        with self.assertRaises(CatalogError) as raised:
+            validate_catalog(document)
+        self.assertIn('products[0].name: missing', str(raised.exception))
+        self.assertIn('products[1].meshSettings: missing', str(raised.exception))
+
+
+class BuildCacheTests(SimpleTestCase):
+
+    def test_manifest_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(buildcache.read_manifest(directory, 1, sources={}), {'version': 1, 'sources': {}})
+            self.assertIsNone(buildcache.manifest_mtime(directory))
+
+            buildcache.write_manifest({'version': 1, 'sources': {'a.png': 'abc'}}, directory)
+            self.assertEqual(buildcache.read_manifest(directory, 1, sources={})['sources'], {'a.png': 'abc'})
+            self.assertIsNotNone(buildcache.manifest_mtime(directory))
+            # Another version starts over
+            self.assertEqual(buildcache.read_manifest(directory, 2, sources={}), {'version': 2, 'sources': {}})
+            self.assertEqual([path.name for path in Path(directory).iterdir()], [buildcache.MANIFEST_NAME])
+
+    def test_file_hash_matches_content_hash(self):
+        with tempfile.NamedTemporaryFile() as handle:
+            handle.write(b'x' * (3 << 20))
+            handle.flush()
+            self.assertEqual(buildcache.file_hash(handle.name), buildcache.content_hash(b'x' * (3 << 20)))
+
+
+class TextureTests(SimpleTestCase):
+
+    def test_mip_sizes(self):
+        self.assertEqual(mip_sizes(2048, 2048, 2048, 256), [(2048, 2048), (1024, 1024), (512, 512), (256, 256)])
+        # Scaled into max_size and rounded down to powers of two
+        self.assertEqual(mip_sizes(2700, 1800, 1024, 256), [(1024, 512), (512, 256), (256, 128)])
+        # Never upscaled
+        self.assertEqual(mip_sizes(300, 300, 2048, 256), [(256, 256)])
+        self.assertEqual(mip_sizes(100, 40, 2048, 256), [(64, 32)])
+
+    def test_height_channel(self):
+        rgb = Image.new('RGB', (2, 2), (200, 10, 20))
+        self.assertEqual(height_channel(rgb).mode, 'L')
+        self.assertEqual(height_channel(rgb).getpixel((0, 0)), 200)
+
+        sixteen = Image.new('I;16', (2, 2))
+        sixteen.putpixel((0, 0), 51200)
+        heights = height_channel(sixteen)
+        self.assertEqual(heights.mode, 'L')
+        self.assertEqual(heights.getpixel((0, 0)), 200)
+
+        self.assertEqual(height_channel(Image.new('LA', (1, 1), (70, 255))).getpixel((0, 0)), 70)
+
+
+class OptimizeGlbTests(SimpleTestCase):
+
+    def attribute(self, data, semantic):
+        document, binary = read_glb(data)
+        return [read_accessor(document, binary, primitive['attributes'][semantic])
+                for mesh in document['meshes'] for primitive in mesh['primitives']]
+
+    def test_checked_in_models_round_trip(self):
+        models = sorted((Path(settings.BASE_DIR) / 'core' / 'static' / 'models').glob('*.glb'))
+        self.assertTrue(models)
+        for path in models:
+            with self.subTest(path.name):
+                data = path.read_bytes()
+                optimized = optimize_glb(data)
+                self.assertLess(len(optimized), len(data))
+                self.assertEqual(model_stats(optimized), model_stats(data))
+
+                before, _ = read_glb(data)
+                after, _ = read_glb(optimized)
+                for key in ('scenes', 'nodes', 'materials'):
+                    self.assertEqual(after.get(key), before.get(key))
+                self.assertEqual([mesh['name'] for mesh in after['meshes']],
+                                 [mesh['name'] for mesh in before['meshes']])
+                self.assertIn(QUANTIZATION, after['extensionsRequired'])
+
+                # Positions are kept exactly; normals within int8 precision
+                self.assertEqual(self.attribute(optimized, 'POSITION'), self.attribute(data, 'POSITION'))
+                for old, new in zip(self.attribute(data, 'NORMAL'), self.attribute(optimized, 'NORMAL')):
+                    error = max(abs(a - b / 127) for x, y in zip(old, new) for a, b in zip(x, y))
+                    self.assertLess(error, 1 / 127)
+
+                self.assertEqual(optimize_glb(optimized), optimized)
+
+
+class OptimizeModelsCommandTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output_dir = Path(directory.name) / 'optimized'
+        override = override_settings(STATICFILES_DIRS=[*settings.STATICFILES_DIRS, directory.name],
+                                     MODEL_VARIANTS_DIR=self.output_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_gltfpack_keeps_positions_float(self):
+        output = self.output_dir.parent / 'out.glb'
+        output.write_bytes(b'')
+        with mock.patch('products.glb.subprocess.run') as run:
+            glb.run_gltfpack('in.glb', output, simplify=0.5)
+        command = run.call_args.args[0]
+        self.assertIn('-noq', command)
+        self.assertNotIn('-cc', command)
+
+    def test_gltfpack_failures_still_write_the_manifest(self):
+        def gltfpack(source, output, simplify=None):
+            if simplify:
+                raise CalledProcessError(1, 'gltfpack', stderr=b'simplification failed')
+            return optimize_glb(Path(source).read_bytes())
+
+        out = StringIO()
+        with mock.patch('products.management.commands.optimize_models.gltfpack_available', return_value=True), \
+                mock.patch('products.management.commands.optimize_models.run_gltfpack', side_effect=gltfpack):
+            call_command('optimize_models', tool='gltfpack', lods='0.5', stdout=out)
+
+        manifest = glb.read_manifest(self.output_dir)
+        self.assertTrue(manifest['sources'])
+        self.assertTrue(all(entry['lods'] == [] for entry in manifest['models'].values()))
+        self.assertIn('LOD 0.5 failed (gltfpack: simplification failed)', out.getvalue())
+        self.assertFalse(list(self.output_dir.glob('*.tmp.glb')))
+
+        with mock.patch('products.management.commands.optimize_models.gltfpack_available', return_value=True), \
+                mock.patch('products.management.commands.optimize_models.run_gltfpack',
+                           side_effect=CalledProcessError(1, 'gltfpack', stderr=b'bad input')):
+            call_command('optimize_models', tool='gltfpack', force=True, stdout=out)
+        self.assertIn('gltfpack: bad input; kept as-is', out.getvalue())
+        manifest = glb.read_manifest(self.output_dir)
+        self.assertTrue(all(entry['bytes'] == entry['original_bytes'] for entry in manifest['models'].values()))
+
+
+def make_font(path, weight, italic=False, weight_axis=None):
+    """A one-glyph TrueType font with the given OS/2 weight and style"""
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(['.notdef', 'A'])
+    builder.setupCharacterMap({ord('A'): 'A'})
+    pen = TTGlyphPen(None)
+    pen.moveTo((100, 0))
+    pen.lineTo((100, 700))
+    pen.lineTo((400, 700))
+    pen.closePath()
+    builder.setupGlyf({'.notdef': TTGlyphPen(None).glyph(), 'A': pen.glyph()})
+    builder.setupHorizontalMetrics({'.notdef': (500, 0), 'A': (500, 100)})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({'familyName': 'Test Sans', 'styleName': 'Italic' if italic else 'Regular'})
+    builder.setupOS2(usWeightClass=weight, fsSelection=0x01 if italic else 0x40)
+    builder.updateHead(macStyle=0x02 if italic else 0)
+    builder.setupPost()
+    if weight_axis:
+        builder.setupFvar(axes=[('wght', weight_axis[0], weight, weight_axis[1], 'Weight')], instances=[])
+    builder.save(path)
+    return path
+
+
+class FontTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_parse_unicode_ranges(self):
+        self.assertEqual(parse_unicode_ranges('U+0041'), {0x41})
+        self.assertEqual(parse_unicode_ranges('u+0030-0032, U+20AC,'), {0x30, 0x31, 0x32, 0x20AC})
+        latin = parse_unicode_ranges(subset_ranges())
+        self.assertTrue(set(range(0x20, 0x7F)) <= latin)
+        self.assertIn(0x20AC, latin)
+
+    def test_pick_static_faces(self):
+        regular = make_font(self.directory / 'Regular.ttf', 400)
+        make_font(self.directory / 'Italic.ttf', 400, italic=True)
+        semibold = make_font(self.directory / 'SemiBold.ttf', 600)
+        black = make_font(self.directory / 'Black.ttf', 900)
+        picked = pick_faces(list(self.directory.iterdir()), (400, 700))
+        self.assertEqual([path for path, _ in picked], sorted([regular, semibold]))
+        self.assertEqual(dict(picked)[regular], {'weight': (400, 400), 'italic': False, 'variable': False})
+
+        picked = pick_faces(list(self.directory.iterdir()), (400, 800))
+        self.assertEqual([path for path, _ in picked], sorted([regular, black]))
+
+    def test_pick_variable_face(self):
+        make_font(self.directory / 'Regular.ttf', 400)
+        variable = make_font(self.directory / 'Variable.ttf', 400, weight_axis=(100, 900))
+        make_font(self.directory / 'Variable-Italic.ttf', 400, italic=True, weight_axis=(100, 900))
+        picked = pick_faces(list(self.directory.iterdir()), (400, 700))
+        self.assertEqual(picked, [(variable, {'weight': (100, 900), 'italic': False, 'variable': True})])
+
+        # A variable font that doesn't cover the weights isn't enough
+        narrow = self.directory / 'Narrow'
+        narrow.mkdir()
+        regular = make_font(narrow / 'Regular.ttf', 400)
+        make_font(narrow / 'Light.ttf', 300, weight_axis=(200, 500))
+        picked = pick_faces(list(narrow.iterdir()), (400, 700))
+        self.assertEqual([path for path, _ in picked], [regular])
+
+
+class BuildFontsCommandTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output_dir = Path(directory.name) / 'webfonts'
+        override = override_settings(STATICFILES_DIRS=[*settings.STATICFILES_DIRS, directory.name],
+                                     FONT_OUTPUT_DIR=self.output_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_build_committed_family(self):
+        call_command('build_fonts', stdout=StringIO())
+        manifest = fonts.read_manifest(self.output_dir)
+        (face,) = manifest['families']['Lato']
+        self.assertEqual((face['source'], face['weight'], face['italic']), ('Lato-Regular.ttf', [400, 400], False))
+        self.assertLess(face['bytes'], face['source_bytes'] / 2)
+
+        subset = TTFont(self.output_dir / face['file'])
+        self.assertEqual(subset.flavor, 'woff2')
+        self.assertTrue(set(subset.getBestCmap()) <= parse_unicode_ranges(subset_ranges()))
+        self.assertIn(ord('A'), subset.getBestCmap())
+        css = (self.output_dir / manifest['css']).read_text()
+        self.assertIn("font-family: 'Lato';", css)
+        self.assertIn(f"src: url('{face['file']}') format('woff2');", css)
+
+        web_fonts = fonts.font_stylesheet(get_fonts())
+        self.assertTrue(web_fonts['css'].endswith(manifest['css']))
+        self.assertNotIn('Lato', web_fonts['google'])
+        self.assertIn('Roboto', web_fonts['google'])
+
+        out = StringIO()
+        call_command('build_fonts', stdout=out)
+        self.assertIn('0 faces built', out.getvalue())
+        self.assertEqual(sorted(path.name for path in self.output_dir.iterdir()),
+                         sorted([buildcache.MANIFEST_NAME, manifest['css'], face['file']]))
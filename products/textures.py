@@ -0,0 +1,162 @@
+"""
+Compressed bumpmap variants
+
+The bumpmaps in core/static/bumpmaps are full-size PNG height maps (up to
+2.7MB each). `manage.py build_texture_variants` turns each one the catalog
+links to into GPU-friendly variants, offline:
+
+ - WebP at power-of-two sizes from BUMPMAP_VARIANT_MAX_SIZE down to
+   BUMPMAP_VARIANT_MIN_SIZE, each level half the previous one (a mip chain
+   the browser can pick a level from),
+ - KTX2 (UASTC, with a generated mip chain) when toktx or basisu is
+   installed. This is for a KTX2Loader, and the texture stays compressed
+   on the GPU.
+
+three.js reads a bump map's red channel. The variants keep only that
+channel (16-bit height maps are scaled to 8 bits, which is what the browser
+did to them anyway), so they look the same and weigh a fraction as much.
+
+Variants are written to BUMPMAP_VARIANTS_DIR and named by the source's
+content hash, so they are immutable and a changed source gets new files.
+manifest.json maps each source to its hash and each hash to its variants.
+Re-running the command only encodes new or changed sources.
+
+with_variants() adds a 'variants' entry to each catalog bumpmap whose
+source has been built. The designer picks a WebP level from it and falls
+back to the original 'link' otherwise.
+"""
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image
+
+from . import buildcache
+from .buildcache import manifest_mtime, static_name, static_url
+
+MANIFEST_VERSION = 1
+
+
+def variants_dir():
+    return Path(getattr(settings, 'BUMPMAP_VARIANTS_DIR',
+                        Path(settings.BASE_DIR) / 'core' / 'static' / 'bumpmaps' / 'variants'))
+
+
+def height_channel(image):
+    """The channel three.js samples for a bump map, as 8-bit greyscale"""
+    if image.mode in ('I;16', 'I;16B', 'I'):
+        return image.point(lambda value: value * (1 / 256)).convert('L')
+    if image.mode in ('RGB', 'RGBA'):
+        return image.getchannel('R')
+    return image.convert('L')
+
+
+def _floor_pow2(value):
+    return 1 << (max(int(value), 1).bit_length() - 1)
+
+
+def mip_sizes(width, height, max_size, min_size):
+    """[(width, height)] power-of-two levels, largest first"""
+    scale = min(1.0, max_size / max(width, height))
+    level = (_floor_pow2(width * scale), _floor_pow2(height * scale))
+    sizes = [level]
+    while max(level) > min_size:
+        level = (max(level[0] // 2, 1), max(level[1] // 2, 1))
+        sizes.append(level)
+    return sizes
+
+
+def ktx2_encoder():
+    """'toktx', 'basisu' or None, whichever is installed"""
+    for tool in ('toktx', 'basisu'):
+        if shutil.which(tool):
+            return tool
+    return None
+
+
+def encode_ktx2(tool, png_path, output_path):
+    if tool == 'toktx':
+        command = ['toktx', '--t2', '--encode', 'uastc', '--uastc_quality', '2', '--zcmp', '19',
+                   '--genmipmap', '--assign_oetf', 'linear', '--target_type', 'R',
+                   str(output_path), str(png_path)]
+    else:
+        command = ['basisu', '-ktx2', '-uastc', '-uastc_level', '2', '-mipmap', '-linear',
+                   '-file', str(png_path), '-output_file', str(output_path)]
+    subprocess.run(command, check=True, capture_output=True)
+
+
+def build_variants(path, digest, output_dir, max_size, min_size, quality, encoder=None):
+    """Encode one source; returns its manifest entry"""
+    with Image.open(path) as source:
+        source.load()
+        width, height = source.size
+        heights = height_channel(source)
+
+    entry = {'width': width, 'height': height, 'webp': [], 'ktx2': None}
+    levels = mip_sizes(width, height, max_size, min_size)
+    base = heights.resize(levels[0], Image.LANCZOS) if heights.size != levels[0] else heights
+    for level in levels:
+        image = base if level == levels[0] else base.resize(level, Image.LANCZOS)
+        name = f'{digest}-{level[0]}x{level[1]}.webp'
+        image.save(output_dir / name, 'WEBP', quality=quality, method=6)
+        entry['webp'].append({'width': level[0], 'height': level[1], 'file': name,
+                              'bytes': (output_dir / name).stat().st_size})
+
+    if encoder:
+        name = f'{digest}.ktx2'
+        with tempfile.TemporaryDirectory() as tmp:
+            png_path = Path(tmp) / 'base.png'
+            base.save(png_path)
+            encode_ktx2(encoder, png_path, output_dir / name)
+        entry['ktx2'] = {'file': name, 'bytes': (output_dir / name).stat().st_size}
+    return entry
+
+
+def read_manifest(directory=None):
+    return buildcache.read_manifest(directory or variants_dir(), MANIFEST_VERSION, sources={}, textures={})
+
+
+_cache = {'key': None, 'value': None}
+_cache_lock = threading.Lock()
+
+
+def with_variants(bumpmaps, catalog_version=None):
+    """
+    The catalog's bumpmap_textures with a 'variants' entry on every texture
+    that has been built: {'webp': [{'width', 'height', 'url'}, ...] largest
+    first, 'ktx2': url or None}. Cached per catalog version until the
+    manifest changes.
+    """
+    mtime = manifest_mtime(variants_dir())
+    if mtime is None:
+        return bumpmaps
+
+    key = (catalog_version, mtime)
+    if catalog_version is not None and _cache['key'] == key:
+        return _cache['value']
+
+    manifest = read_manifest()
+    prefix = static_name(variants_dir()) + '/'
+    result = {}
+    for texture_key, bumpmap in bumpmaps.items():
+        link = bumpmap.get('link')
+        digest = manifest['sources'].get(link[len(settings.STATIC_URL):]) if link else None
+        entry = manifest['textures'].get(digest) if digest else None
+        if entry is None:
+            result[texture_key] = bumpmap
+            continue
+        result[texture_key] = dict(bumpmap, variants={
+            'webp': [
+                {'width': level['width'], 'height': level['height'], 'url': static_url(prefix + level['file'])}
+                for level in entry['webp']
+            ],
+            'ktx2': static_url(prefix + entry['ktx2']['file']) if entry.get('ktx2') else None,
+        })
+
+    with _cache_lock:
+        _cache['key'] = key
+        _cache['value'] = result
+    return result